@@ -0,0 +1,34 @@
+import os
+
+# Command modules, loaded as discord.py extensions by the gateway bot (bot.py)
+# and by the HTTP interactions server (interactions_server.py). Nothing in here
+# is imported until the bot is about to start, and each one can be hot-reloaded
+# with /reload without dropping the gateway session.
+EXTENSIONS = (
+    'cogs.objectives',
+    'cogs.board',
+    'cogs.colonies',
+    'cogs.cmdr',
+    'cogs.buckets',
+    'cogs.tick',
+    'cogs.admin',
+)
+
+
+def enabled_extensions() -> list[str]:
+    """Return the extensions to load, optionally narrowed by BOT_EXTENSIONS.
+
+    BOT_EXTENSIONS is a comma separated list of short names, e.g. "objectives,tick".
+    """
+    selected = os.getenv('BOT_EXTENSIONS', '')
+    if not selected.strip():
+        return list(EXTENSIONS)
+    wanted = {f"cogs.{name.strip()}" for name in selected.split(',') if name.strip()}
+    return [ext for ext in EXTENSIONS if ext in wanted]
+
+
+def background_tasks_enabled() -> bool:
+    """False when BACKGROUND_TASKS=0: this process serves commands but leaves the
+    board refresh and tick-summary loops to another one (e.g. HTTP workers after the first).
+    """
+    return os.getenv('BACKGROUND_TASKS', '1') != '0'
@@ -0,0 +1,205 @@
+import math
+import logging
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from cogs import EXTENSIONS
+from core import metrics
+from core.outbound import outbound, send_followup
+from core.helpers import has_officer_role
+
+
+class Admin(commands.Cog):
+    """Help, command reference and bot maintenance commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="help", description="Show all available bot commands")
+    async def help_command(self, interaction: discord.Interaction):
+        """Show little helper for setup and how to work with Sinistra"""
+        await interaction.response.defer()
+
+        embed = discord.Embed(
+            title="⚒️ Welcome to Sinistra Bot!",
+            description="Your companion for CIU operations in Elite Dangerous",
+            color=discord.Color.red()
+        )
+
+        # Getting Started
+        embed.add_field(
+            name="⚒️ Getting Started",
+            value=(
+                "1. Follow the instructions in #work to set up EDMC and BGSTally!\n"
+                "2. **Visit the dashboard to automatically create a user**: [CIU Dashboard](https://dashboard.sinistra-ciu.space)"
+                "3. **Link your commander**: Use `/linkcmdr <your_cmdr_name>`\n"
+                "4. **Verify it works**: Use `/wheream` to check your location\n"
+                "5. **Explore commands**: Use `/list` to see all available commands\n"
+            ),
+            inline=False
+        )
+
+        # What you can do
+        embed.add_field(
+            name="⚒️ What Can You Do?",
+            value=(
+                "• View current objectives and colonies with distances\n"
+                "• Check your commander's location in-game\n"
+                "• Calculate distances between systems\n"
+                "• Filter objectives by activity type (fight, haul, explore)"
+            ),
+            inline=False
+        )
+
+        # Important Note
+        embed.add_field(
+            name="⚠️ Important",
+            value=(
+                "Make sure you're running EDMC and BGSTally! Follow the instructions pinned in #work"
+            ),
+            inline=False
+        )
+
+        embed.set_footer(text="From each according to their ability, to each according to their needs")
+        await send_followup(interaction, embed=embed)
+
+    @app_commands.command(name="list", description="Quick reference of all commands")
+    async def list_command(self, interaction: discord.Interaction):
+        """Show a concise list of all available commands"""
+        await interaction.response.defer()
+
+        commands_text = """
+**📋 Objectives**
+• `/goals` - Current CIU objectives
+• `/fight` - Combat objectives
+• `/haul` - Trade objectives
+• `/explore` - Exploration objectives
+• `/route [type]` - Shortest loop through objective systems
+• `/colonies` - Colonization goals
+• `/create_objective` - Create a new objective (Veterans only)
+• `/board <start|stop> [type]` - Pinned objectives board that updates itself (Veterans only)
+
+**🧑‍🚀 Commander**
+• `/linkcmdr <name>` - Link your commander
+• `/wheream` - Your current location
+• `/dist <sys1> [sys2]` - Distance calculator
+
+**📊 Reports**
+• `/ticksummary <period>` - BGS tick summary (ct/lt)
+• `/synccmdrs` - Force adding new commanders to the cmdr list
+• `/nexttick` - Show next BGS tick prediction
+• `/whatif <system> <faction>` - Influence simulator for this tick
+
+**🛠️ Maintenance**
+• `/reload <module>` - Hot-reload a command module (Veterans only)
+• `/status` - Shard latency and server counts
+
+**ℹ️ Help**
+• `/help` - Detailed help
+• `/list` - This list
+    """
+
+        embed = discord.Embed(
+            title="⚡ Quick Command Reference",
+            description=commands_text,
+            color=discord.Color.gold()
+        )
+
+        await send_followup(interaction, embed=embed)
+
+    @app_commands.command(name="reload", description="Hot-reload a command module without restarting (Veterans only)")
+    @app_commands.describe(
+        module="Command module to reload",
+        sync="Re-sync slash commands with Discord (only needed if command options changed)",
+    )
+    @app_commands.choices(module=[
+        app_commands.Choice(name="All", value="all"),
+        *[app_commands.Choice(name=ext.split('.')[-1], value=ext) for ext in EXTENSIONS],
+    ])
+    async def reload_command(
+        self,
+        interaction: discord.Interaction,
+        module: app_commands.Choice[str],
+        sync: bool = False,
+    ):
+        """Reload one or all extensions in place; the gateway session stays connected."""
+        if not has_officer_role(interaction.user):
+            await interaction.response.send_message("❌ Only Veterans can reload command modules.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        targets = list(self.bot.extensions) if module.value == "all" else [module.value]
+        results = []
+        for ext in targets:
+            try:
+                if ext in self.bot.extensions:
+                    await self.bot.reload_extension(ext)
+                else:
+                    await self.bot.load_extension(ext)
+                results.append(f"✅ `{ext}`")
+            except commands.ExtensionError as e:
+                logging.error("Failed to reload %s: %s", ext, e)
+                results.append(f"❌ `{ext}`: {e}")
+
+        if sync:
+            try:
+                synced = await self.bot.tree.sync()
+                results.append(f"🔄 Synced {len(synced)} slash command(s)")
+            except Exception as e:
+                results.append(f"❌ Failed to sync commands: {e}")
+
+        await send_followup(interaction, "\n".join(results), ephemeral=True)
+
+
+    @app_commands.command(name="status", description="Show gateway shard latency and server counts")
+    async def status_command(self, interaction: discord.Interaction):
+        """Show per-shard latency and guild counts for this bot process."""
+        await interaction.response.defer(ephemeral=True)
+
+        stats = self.bot.shard_stats() if hasattr(self.bot, "shard_stats") else []
+        embed = discord.Embed(
+            title="🛰️ Bot Status",
+            description=f"Connected to **{len(self.bot.guilds)}** server(s)",
+            color=discord.Color.blue()
+        )
+        for stat in stats[:25]:
+            latency = stat["latency"]
+            latency_str = f"{latency * 1000:.0f} ms" if math.isfinite(latency) else "connecting…"
+            embed.add_field(
+                name=f"Shard {stat['shard']}",
+                value=f"Latency: **{latency_str}**\nServers: **{stat['guilds']}**",
+                inline=True
+            )
+        throttled = {"admission_cached_total": 0, "admission_rejected_total": 0}
+        for series in metrics.snapshot()["counters"]:
+            if series["name"] in throttled:
+                throttled[series["name"]] += series["value"]
+        embed.add_field(
+            name="Admission",
+            value=f"Served from cache: **{throttled['admission_cached_total']:.0f}**\n"
+                  f"Rejected: **{throttled['admission_rejected_total']:.0f}**",
+            inline=False
+        )
+        sends = {"outbound_sends_total": 0, "outbound_wait_seconds_total": 0, "outbound_rate_limited_total": 0}
+        for series in metrics.snapshot()["counters"]:
+            if series["name"] in sends:
+                sends[series["name"]] += series["value"]
+        depth = outbound.depth()
+        mean_wait = sends["outbound_wait_seconds_total"] / sends["outbound_sends_total"] if sends["outbound_sends_total"] else 0.0
+        embed.add_field(
+            name="Outbound",
+            value=f"Queued: **{depth['interactive']}** interactive, **{depth['background']}** background\n"
+                  f"Mean queue wait: **{mean_wait * 1000:.0f} ms** · 429s: **{sends['outbound_rate_limited_total']:.0f}**",
+            inline=False
+        )
+        if self.bot.shard_count:
+            embed.set_footer(text=f"{len(stats)} of {self.bot.shard_count} shard(s) run in this process")
+
+        await send_followup(interaction, embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,318 @@
+"""Live objectives boards: one pinned message per channel, kept up to date by the bot.
+
+An officer starts a board with ``/board start``. From then on a single
+refresh loop re-renders every board when objectives change (an invalidation
+or an expiry) and at least every BOARD_INTERVAL seconds, which picks up
+this tick's progress and bucket data as their cache entries refill.
+
+A board's message is only edited when the rendered embeds differ from what
+was last sent, compared by digest, and never more often than once per
+BOARD_MIN_EDIT_INTERVAL. Bursts of triggers are debounced into one pass.
+Boards sharing a filter share one render per pass, so a board costs the same
+few cached backend reads however many members are watching it.
+
+Boards live in the shared cache (and its disk snapshot), so they survive
+restarts. With a shared cache backend only one process refreshes at a time.
+Processes started with BACKGROUND_TASKS=0 never run the refresh loop.
+"""
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import importlib
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import requests
+
+from core import metrics
+from core.api import get_objectives, get_objective_index
+from core.cache import cache
+from core.embeds import MESSAGE_TOTAL
+from core.expiry import objective_expiry
+from core.outbound import BACKGROUND, outbound, channel_route, send_followup
+from core.helpers import has_officer_role
+from cogs import background_tasks_enabled
+
+BOARD_PREFIX = 'board:'
+# Boards stay until stopped; the TTL only clears boards of channels nobody uses anymore
+BOARD_TTL = 365 * 24 * 3600
+# Every board is re-rendered at least this often (matches the objectives cache TTL)
+BOARD_INTERVAL = 60.0
+# After a trigger, wait this long for more before refreshing
+BOARD_DEBOUNCE = 5.0
+# Minimum seconds between two edits of the same message
+BOARD_MIN_EDIT_INTERVAL = 15.0
+# Cross-process lock held for one refresh pass
+BOARD_LOCK_KEY = 'board:refresh'
+BOARD_LOCK_TTL = 120.0
+
+# Invalidations under these prefixes change what a board shows
+WATCHED_PREFIXES = ('objectives:', 'buckets:')
+
+
+def board_key(channel_id: int) -> str:
+    # Trailing colon, so invalidating one board's key can't match a longer channel ID
+    return f"{BOARD_PREFIX}{channel_id}:"
+
+
+def _goals():
+    """cogs.objectives as loaded right now, so the board renders with its code after a /reload."""
+    return importlib.import_module('cogs.objectives')
+
+
+def embeds_digest(embeds: list[discord.Embed]) -> str:
+    return hashlib.sha1(json.dumps([e.to_dict() for e in embeds], sort_keys=True).encode()).hexdigest()
+
+
+async def render_board(filter_value: str) -> tuple[list[discord.Embed], str]:
+    """The board's embeds and their digest; the digest ignores the "updated" timestamp."""
+    index = await asyncio.to_thread(get_objective_index)
+    objectives_ct = await asyncio.to_thread(get_objectives, 'ct')
+    goals = _goals()
+    active = goals.active_objectives_for(index, filter_value)
+    if not active:
+        title = "⚒️ Current CIU Objectives"
+        if filter_value != "all":
+            title += f" - {filter_value.capitalize()}"
+        embeds = [discord.Embed(
+            title=title,
+            description="📭 No active objectives at the moment, Comrade!",
+            color=discord.Color.dark_grey(),
+        )]
+    else:
+        ranking = goals.GoalsRanking(
+            filter_value=filter_value,
+            ranked=[(obj, None) for obj in active],
+            ct_progress=goals.ct_progress_map(objectives_ct),
+        )
+        footer = "Live board · updates automatically"
+        if ranking.total_pages > 1:
+            footer += f" · {len(ranking.ranked)} objectives, run /goals for the rest"
+        # Leave room for the board's footer in place of the page footer
+        embeds = await goals.render_goals_page(ranking, 1, budget=MESSAGE_TOTAL - len(footer))
+        embeds[-1].set_footer(text=footer)
+
+    digest = embeds_digest(embeds)
+    embeds[-1].timestamp = discord.utils.utcnow()
+    return embeds, digest
+
+
+class Board(commands.Cog):
+    """Officer-managed live objectives boards."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    async def cog_load(self):
+        if not background_tasks_enabled():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        objective_expiry.subscribe(self._on_expired)
+        cache.subscribe(self._on_invalidation)
+        self._task = asyncio.create_task(self._run())
+
+    async def cog_unload(self):
+        objective_expiry.unsubscribe(self._on_expired)
+        cache.unsubscribe(self._on_invalidation)
+        if self._task is not None:
+            self._task.cancel()
+
+    # Both callbacks may run on any thread
+    def _on_expired(self, expired) -> None:
+        self._trigger()
+
+    def _on_invalidation(self, message: dict) -> None:
+        if message.get("prefix", "").startswith(WATCHED_PREFIXES):
+            self._trigger()
+
+    def _trigger(self) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self):
+        timeout = BOARD_INTERVAL
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                # Let the rest of a burst (e.g. several objectives edited in a row) arrive first
+                await asyncio.sleep(BOARD_DEBOUNCE)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                retry_in = await self.refresh_all()
+            except Exception:
+                logging.exception("Board refresh failed")
+                retry_in = None
+            # Come back early for boards held back by the edit interval
+            timeout = BOARD_INTERVAL if retry_in is None else min(BOARD_INTERVAL, max(retry_in, BOARD_DEBOUNCE))
+
+    async def refresh_all(self) -> float | None:
+        """Edit every board whose content changed; returns seconds until a held-back board may be edited."""
+        if cache.shared and not await asyncio.to_thread(cache.try_lock, BOARD_LOCK_KEY, BOARD_LOCK_TTL):
+            return None  # another process is refreshing
+        try:
+            boards = await asyncio.to_thread(cache.dump, (BOARD_PREFIX,))
+            metrics.set_gauge('boards', len(boards))
+            renders: dict[str, tuple[list[discord.Embed], str]] = {}
+            edits = []
+            retry_in = None
+            for item in boards:
+                board = item["v"]
+                filter_value = board["filter"]
+                if filter_value not in renders:
+                    try:
+                        renders[filter_value] = await render_board(filter_value)
+                    except requests.RequestException as e:
+                        logging.warning("Board render (%s) failed: %s", filter_value, e)
+                        continue
+                embeds, digest = renders[filter_value]
+                if digest == board.get("digest"):
+                    metrics.inc('board_updates_total', outcome='unchanged')
+                    continue
+                wait = board.get("edited_at", 0) + BOARD_MIN_EDIT_INTERVAL - time.time()
+                if wait > 0:
+                    metrics.inc('board_updates_total', outcome='deferred')
+                    retry_in = wait if retry_in is None else min(retry_in, wait)
+                    continue
+                edits.append(self._edit(item["k"], board, embeds, digest))
+            # Each channel has its own rate limit; the outbound queues pace them independently
+            await asyncio.gather(*edits)
+            return retry_in
+        finally:
+            if cache.shared:
+                await asyncio.to_thread(cache.unlock, BOARD_LOCK_KEY)
+
+    async def _edit(self, key: str, board: dict, embeds: list[discord.Embed], digest: str) -> None:
+        message = self.bot.get_partial_messageable(board["channel_id"]).get_partial_message(board["message_id"])
+        try:
+            await outbound.send(
+                channel_route(board["channel_id"]),
+                lambda: message.edit(embeds=embeds),
+                priority=BACKGROUND,
+                coalesce=f"edit:{board['message_id']}",
+            )
+        except discord.NotFound:
+            # The message or channel is gone: the board ends with it
+            metrics.inc('board_updates_total', outcome='removed')
+            logging.info("Board in channel %s removed: message not found", board["channel_id"])
+            if await self._still_current(key, board):
+                await asyncio.to_thread(cache.invalidate, key)
+            return
+        except discord.HTTPException as e:
+            metrics.inc('board_updates_total', outcome='error')
+            logging.error("Board edit in channel %s failed: %s", board["channel_id"], e)
+            return
+        metrics.inc('board_updates_total', outcome='edited')
+        # The edit may have waited in the queue while the board was stopped or restarted
+        current = await self._still_current(key, board)
+        if current is None:
+            return
+        await asyncio.to_thread(cache.set, key, {**current, "digest": digest, "edited_at": time.time()}, BOARD_TTL)
+
+    @staticmethod
+    async def _still_current(key: str, board: dict) -> dict | None:
+        """The stored board if it still points at board's message, else None."""
+        current = await asyncio.to_thread(cache.get, key)
+        if current is None or current["message_id"] != board["message_id"]:
+            return None
+        return current
+
+    @app_commands.command(name="board", description="Start or stop a live objectives board in this channel (Veterans only)")
+    @app_commands.describe(
+        action="Start (or move to the bottom) or stop this channel's board",
+        goal_type="Filter by activity type (fighting, hauling, exploring)",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="Start", value="start"),
+            app_commands.Choice(name="Stop", value="stop"),
+        ],
+        goal_type=[
+            app_commands.Choice(name="All", value="all"),
+            app_commands.Choice(name="Fight", value="fight"),
+            app_commands.Choice(name="Haul", value="haul"),
+            app_commands.Choice(name="Explore", value="explore"),
+        ],
+    )
+    async def board(
+        self,
+        interaction: discord.Interaction,
+        action: app_commands.Choice[str],
+        goal_type: app_commands.Choice[str] = None,
+    ):
+        """Post a pinned objectives message that the bot keeps up to date."""
+        if not has_officer_role(interaction.user):
+            await interaction.response.send_message("❌ Only Veterans can manage objective boards.", ephemeral=True)
+            return
+        if not cache.shared and not background_tasks_enabled():
+            # The board would be stored in this process only, where nothing refreshes it
+            await interaction.response.send_message(
+                "❌ Boards need a shared CACHE_URL when commands are served by several workers.", ephemeral=True
+            )
+            return
+        await interaction.response.defer(ephemeral=True)
+
+        channel_id = interaction.channel_id
+        key = board_key(channel_id)
+        existing = await asyncio.to_thread(cache.get, key)
+
+        if existing is not None:
+            # Starting again replaces the old board with a fresh message
+            await asyncio.to_thread(cache.invalidate, key)
+            old = interaction.channel.get_partial_message(existing["message_id"])
+            try:
+                await outbound.send(channel_route(channel_id), old.delete)
+            except discord.HTTPException:
+                pass
+
+        if action.value == "stop":
+            if existing is None:
+                await send_followup(interaction, "ℹ️ There is no board in this channel.", ephemeral=True)
+            else:
+                await send_followup(interaction, "🛑 Board stopped and removed.", ephemeral=True)
+            return
+
+        filter_value = goal_type.value if goal_type else "all"
+        try:
+            embeds, digest = await render_board(filter_value)
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to backend: {str(e)}", ephemeral=True)
+            return
+
+        try:
+            message = await outbound.send(channel_route(channel_id), lambda: interaction.channel.send(embeds=embeds))
+        except discord.HTTPException as e:
+            await send_followup(interaction, f"❌ Could not post the board here: {e}", ephemeral=True)
+            return
+
+        pinned = True
+        try:
+            await outbound.send(channel_route(channel_id), message.pin)
+        except discord.HTTPException:
+            pinned = False
+
+        board = {
+            "guild_id": interaction.guild_id,
+            "channel_id": channel_id,
+            "message_id": message.id,
+            "filter": filter_value,
+            "digest": digest,
+            "edited_at": time.time(),
+        }
+        await asyncio.to_thread(cache.set, key, board, BOARD_TTL)
+        logging.info("Board started in channel %s (%s)", channel_id, filter_value)
+
+        note = "" if pinned else "\n⚠️ I couldn't pin it; give me Manage Messages or pin it yourself."
+        await send_followup(interaction, f"📌 Board started. It updates itself when objectives change.{note}", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Board(bot))
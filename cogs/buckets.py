@@ -0,0 +1,410 @@
+import asyncio
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import requests
+
+from core import bgs, names
+from core.api import get_bucket_index
+from core.embeds import FIELD_VALUE_LIMIT, fit_text
+from core.models import Bucket, BucketEntry, BucketIndex
+from core.helpers import fmt_credits, parse_credits
+from core.outbound import send_followup
+
+# Positive buckets as /whatif shows them
+POSITIVE_BUCKET_LABELS = {
+    "missions":    ("📈", "Missions"),
+    "exploration": ("🔭", "Exploration"),
+    "trade":       ("🛒", "Trade"),
+    "bounty":      ("💰", "Bounty"),
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# /buckets — BGS activity bucket status
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _pips(pts: int, max_pts: int = 10, filled: str = "◆", empty: str = "◇") -> str:
+    """Return a pip string like ◆◆◆◇◇◇◇◇◇◇."""
+    n = max(0, min(pts, max_pts))
+    return filled * n + empty * (max_pts - n)
+
+
+def _bucket_line(emoji: str, label: str, bucket: Bucket, next_label: str) -> str:
+    """Single embed line for one BGS bucket."""
+    pts = bucket.pts
+    remaining = bucket.remaining
+    pip_str = _pips(pts)
+    line = f"{emoji} **{label}**  `{pip_str}`  **{pts}**"
+    if remaining > 0:
+        line += f"  ·  _{next_label} to next_"
+    elif pts >= 10:
+        line += "  ·  ✅ **CAPPED**"
+    return line
+
+
+def _neg_bucket_line(emoji: str, label: str, bucket: Bucket) -> str:
+    """Single embed line for a negative BGS bucket."""
+    pts = bucket.pts
+    remaining = bucket.remaining
+    pip_str = _pips(pts, filled="◈", empty="◇")
+    line = f"{emoji} **{label}**  `{pip_str}`  **{pts}**"
+    if pts > 0:
+        line += f"  ·  _{remaining} more = next point_"
+    return line
+
+
+def _buckets_embed(entry: BucketEntry, system: str, faction: str) -> discord.Embed:
+    """Build a Discord embed for a single buckets entry."""
+    capped_pts = entry.capped_pts
+    pct_cap = entry.pct_cap
+
+    # Colour: green if high cap, gold if mid, orange if low
+    if capped_pts >= 7:
+        color = discord.Color.green()
+    elif capped_pts >= 4:
+        color = discord.Color.gold()
+    else:
+        color = discord.Color.orange()
+
+    influence = entry.current_influence
+    period_label = entry.period
+    inf_str = f"  ·  Influence: **{influence:.1f}%**" if influence is not None else ""
+    description = f"📍 **{system}**  ·  {period_label}{inf_str}"
+
+    embed = discord.Embed(
+        title=f"🎯 BGS Prediction — {faction}",
+        description=description,
+        color=color,
+    )
+
+    # ── Positive buckets ──────────────────────────────────────────────────────
+    missions    = entry.bucket("missions")
+    exploration = entry.bucket("exploration")
+    trade       = entry.bucket("trade")
+    bounty      = entry.bucket("bounty")
+
+    positive_lines = [
+        _bucket_line("📈", "Missions",    missions,    f"+{missions.remaining} pluses"),
+        _bucket_line("🔭", "Exploration", exploration, f"{fmt_credits(exploration.remaining)} cr"),
+        _bucket_line("🛒", "Trade",       trade,       f"{fmt_credits(trade.remaining)} cr"),
+        _bucket_line("💰", "Bounty",      bounty,      f"{fmt_credits(bounty.remaining)} cr"),
+    ]
+    embed.add_field(name="⬆️ Positive Buckets", value="\n".join(positive_lines), inline=False)
+
+    # ── Negative buckets ──────────────────────────────────────────────────────
+    mission_fail = entry.bucket("missionFail")
+    murder       = entry.bucket("murder")
+
+    negative_lines = [
+        _neg_bucket_line("❌", "Mission Fails", mission_fail),
+        _neg_bucket_line("💀", "Murder",        murder),
+    ]
+    embed.add_field(name="⬇️ Negative Buckets", value="\n".join(negative_lines), inline=False)
+
+    # ── Net result ────────────────────────────────────────────────────────────
+    net_pts   = entry.net_pts
+    total_pos = entry.total_positive_pts
+    total_neg = entry.total_negative_pts
+
+    net_pip_str = _pips(capped_pts)
+    result_lines = [
+        f"`{net_pip_str}`  **{capped_pts}/10**  ({pct_cap:.0f}% cap)",
+        f"Raw: **+{total_pos}** pos  ·  **−{total_neg}** neg  =  **{net_pts}** net",
+    ]
+
+    predicted_change = entry.predicted_influence_change
+    predicted_inf    = entry.predicted_influence
+    if predicted_change is not None:
+        sign = "+" if predicted_change >= 0 else ""
+        change_str = f"{sign}{predicted_change:.2f}%"
+        if predicted_inf is not None:
+            result_lines.append(f"Predicted: **{change_str}** → {predicted_inf:.1f}%")
+        else:
+            result_lines.append(f"Predicted: **{change_str}**")
+
+    embed.add_field(name="📊 Net Result", value="\n".join(result_lines), inline=False)
+
+    # Footer: population + faction count
+    footer_parts = []
+    pop       = entry.population
+    fac_count = entry.faction_count
+    max_swing = entry.max_swing
+    if pop is not None:
+        footer_parts.append(f"Pop: {pop:,}")
+    if fac_count is not None:
+        footer_parts.append(f"Factions: {fac_count}")
+    if max_swing is not None:
+        footer_parts.append(f"Max swing: {max_swing:.2f}%")
+    if footer_parts:
+        embed.set_footer(text="  ·  ".join(footer_parts))
+
+    return embed
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# /whatif — influence simulator
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _fmt_amount(key: str, amount: float) -> str:
+    return f"{amount:.0f} pluses" if key == "missions" else f"{fmt_credits(amount)} cr"
+
+
+def _fmt_mix(contribution: dict[str, float]) -> str:
+    parts = [
+        f"{amount:.0f} mission pluses" if key == "missions"
+        else f"{fmt_credits(amount)} cr {POSITIVE_BUCKET_LABELS[key][1].lower()}"
+        for key, amount in contribution.items() if amount > 0
+    ]
+    return ", ".join(parts) or "nothing more"
+
+
+def _fmt_influence(value: float | None) -> str:
+    return f"{value:.1f}%" if value is not None else "n/a"
+
+
+def _whatif_embed(
+    entry: BucketEntry,
+    contribution: dict[str, float],
+    target: float | None,
+) -> discord.Embed:
+    """Build the /whatif embed: the user's scenario, the target and the cheapest path to the cap."""
+    predicted = bgs.predict_influence(entry)
+    embed = discord.Embed(
+        title=f"🔮 What If — {entry.faction}",
+        description=(
+            f"📍 **{entry.system}**  ·  Influence: **{_fmt_influence(entry.current_influence)}**"
+            f"  ·  On current activity: **{_fmt_influence(predicted)}**"
+        ),
+        color=discord.Color.purple(),
+    )
+
+    if any(contribution.values()):
+        after = bgs.with_contribution(entry, contribution)
+        lines = []
+        for key, amount in contribution.items():
+            if amount > 0:
+                emoji, label = POSITIVE_BUCKET_LABELS[key]
+                lines.append(
+                    f"{emoji} **{label}** +{_fmt_amount(key, amount)}: "
+                    f"{entry.bucket(key).pts} → **{after.bucket(key).pts}** pts"
+                )
+        lines.append(f"Capped: {entry.capped_pts} → **{after.capped_pts}/10**")
+        lines.append(f"Predicted influence: **{_fmt_influence(bgs.predict_influence(after))}**")
+        embed.add_field(name="🧮 Your Scenario", value="\n".join(lines), inline=False)
+
+    scenarios = bgs.sweep(entry)
+    has_influence = entry.current_influence is not None and bgs.swing_per_point(entry) is not None
+    if target is not None:
+        best = bgs.cheapest_for(scenarios, target)
+        if not has_influence:
+            value = "⚠️ Influence data is unavailable for this faction, so a target can't be priced"
+        elif best is None:
+            ceiling = scenarios[-1].influence
+            value = f"❌ Out of reach this tick; the cap lands at **{_fmt_influence(ceiling)}**"
+        elif best.effort == 0:
+            value = "✅ Already on track with current activity"
+        else:
+            value = f"**{best.capped_pts}/10** capped → {_fmt_influence(best.influence)}\nAdd: {_fmt_mix(best.contribution)}"
+        embed.add_field(name=f"🎯 Reaching {target:.1f}%", value=value, inline=False)
+
+    path_lines = [
+        f"`{s.capped_pts:>2}/10` → **{_fmt_influence(s.influence)}**  ·  {_fmt_mix(s.contribution)}"
+        if has_influence else f"`{s.capped_pts:>2}/10`  ·  {_fmt_mix(s.contribution)}"
+        for s in scenarios[1:]
+    ]
+    if path_lines:
+        embed.add_field(name="📈 Cheapest Path to the Cap", value=fit_text("\n".join(path_lines), FIELD_VALUE_LIMIT), inline=False)
+    else:
+        embed.add_field(name="📈 Cheapest Path to the Cap", value="✅ Already capped", inline=False)
+
+    per_point = bgs.swing_per_point(entry)
+    model = f"~{per_point:.2f}% per capped point" if per_point is not None else "no influence data"
+    embed.set_footer(text=f"Model: {model}  ·  bucket steps are a local estimate")
+    return embed
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# /buckets without a faction — every faction in the system side by side
+# ──────────────────────────────────────────────────────────────────────────────
+
+FACTIONS_PER_PAGE = 5
+
+_COMPARE_BUCKETS = (
+    ("missions", "📈"), ("exploration", "🔭"), ("trade", "🛒"), ("bounty", "💰"),
+    ("missionFail", "❌"), ("murder", "💀"),
+)
+
+
+def _compare_field(entry: BucketEntry) -> tuple[str, str]:
+    """Field name and value for one faction in the system-wide view."""
+    influence = f"  ·  {entry.current_influence:.1f}%" if entry.current_influence is not None else ""
+    buckets = "  ".join(f"{emoji}{entry.bucket(key).pts}" for key, emoji in _COMPARE_BUCKETS)
+    lines = [
+        f"`{_pips(entry.capped_pts)}`  **{entry.capped_pts}/10**  ·  net **{entry.net_pts}** "
+        f"(+{entry.total_positive_pts} / −{entry.total_negative_pts})",
+        buckets,
+    ]
+    change = entry.predicted_influence_change
+    if change is not None:
+        sign = "+" if change >= 0 else ""
+        predicted = f" → {entry.predicted_influence:.1f}%" if entry.predicted_influence is not None else ""
+        lines.append(f"Predicted: **{sign}{change:.2f}%**{predicted}")
+    return f"{entry.faction}{influence}", "\n".join(lines)
+
+
+def _compare_embed(index: BucketIndex, system: str, period: str, page: int, total_pages: int) -> discord.Embed:
+    """Build the system-wide comparison embed for one page of factions."""
+    embed = discord.Embed(
+        title=f"⚖️ BGS Comparison — {system}",
+        description=f"📍 **{system}**  ·  {period}  ·  {len(index.entries)} faction(s), highest influence first",
+        color=discord.Color.blue(),
+    )
+    start = (page - 1) * FACTIONS_PER_PAGE
+    for entry in index.entries[start:start + FACTIONS_PER_PAGE]:
+        name, value = _compare_field(entry)
+        embed.add_field(name=name, value=value, inline=False)
+    footer = "Pass faction: for the full breakdown"
+    if total_pages > 1:
+        footer = f"Page {page}/{total_pages} · use page: to see more · {footer}"
+    embed.set_footer(text=footer)
+    return embed
+
+
+async def _get_index(interaction: discord.Interaction, system: str, period: str) -> BucketIndex | None:
+    """Fetch (cached) bucket data for the system, or report the error and return None."""
+    try:
+        return await asyncio.to_thread(get_bucket_index, system, period)
+    except requests.HTTPError as e:
+        await send_followup(interaction, f"❌ API error: {e}")
+    except Exception as e:
+        await send_followup(interaction, f"❌ Error fetching buckets data: {e}")
+    return None
+
+
+async def _find_entry(interaction: discord.Interaction, system: str, faction: str, period: str) -> BucketEntry | None:
+    """Fetch (cached) bucket data and pick the faction, or report why not and return None."""
+    index = await _get_index(interaction, system, period)
+    if index is None:
+        return None
+
+    # Fuzzy faction match: exact, prefix, words, then close spellings
+    matches = index.match(faction)
+    if len(matches) == 1:
+        return matches[0]
+
+    if matches:
+        faction_names = ", ".join(f"**{m.faction}**" for m in matches)
+        await send_followup(interaction, f"❓ **{faction}** matches several factions in **{system}**: {faction_names}")
+        return None
+
+    available = [b.faction for b in index.entries]
+    hint = (
+        f"\nObjectives in **{system}** cover: {', '.join(available)}"
+        if available
+        else f"\nNo objective found for **{system}** — is it tracked?"
+    )
+    await send_followup(
+        interaction,
+        f"❌ No buckets data for **{faction}** in **{system}** "
+        f"(period: `{period}`).{hint}"
+    )
+    return None
+
+
+class Buckets(commands.Cog):
+    """BGS activity bucket commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="buckets", description="Show BGS activity bucket status for a faction in a system")
+    @app_commands.describe(
+        system="Star system name (e.g. Sol)",
+        faction="Faction name; leave empty to compare every faction in the system",
+        period="Tick period to check (default: current tick)",
+        page="Page of the faction comparison (default 1)",
+    )
+    @app_commands.autocomplete(system=names.system_autocomplete, faction=names.faction_autocomplete)
+    @app_commands.choices(period=[
+        app_commands.Choice(name="Current Tick", value="ct"),
+        app_commands.Choice(name="Last Tick",    value="lt"),
+    ])
+    async def buckets_command(
+        self,
+        interaction: discord.Interaction,
+        system: str,
+        faction: str = None,
+        period: app_commands.Choice[str] = None,
+        page: app_commands.Range[int, 1] = 1,
+    ):
+        """Show BGS bucket breakdown for a given faction/system, or all factions side by side."""
+        await interaction.response.defer()
+
+        period_value = period.value if period else "ct"
+
+        if faction:
+            entry = await _find_entry(interaction, system, faction, period_value)
+            if entry is None:
+                return
+            await send_followup(interaction, embed=_buckets_embed(entry, system, entry.faction))
+            return
+
+        index = await _get_index(interaction, system, period_value)
+        if index is None:
+            return
+        if not index.entries:
+            await send_followup(interaction, f"❌ No buckets data for **{system}** (period: `{period_value}`) — is it tracked?")
+            return
+        total_pages = (len(index.entries) + FACTIONS_PER_PAGE - 1) // FACTIONS_PER_PAGE
+        if page > total_pages:
+            await send_followup(interaction, f"❌ There are only {total_pages} page(s) of factions.")
+            return
+        await send_followup(interaction, embed=_compare_embed(index, system, period_value, page, total_pages))
+
+    @app_commands.command(name="whatif", description="Simulate where a faction's influence lands with more activity this tick")
+    @app_commands.describe(
+        system="Star system name (e.g. Sol)",
+        faction="Faction name",
+        missions="Extra mission pluses (INF+)",
+        trade="Extra trade profit, e.g. 50M",
+        exploration="Extra exploration data sold, e.g. 20M",
+        bounty="Extra bounty vouchers, e.g. 5M",
+        target="Influence to reach (%); shows the cheapest mix that gets there",
+    )
+    @app_commands.autocomplete(system=names.system_autocomplete, faction=names.faction_autocomplete)
+    async def whatif_command(
+        self,
+        interaction: discord.Interaction,
+        system: str,
+        faction: str,
+        missions: app_commands.Range[int, 0] = 0,
+        trade: str = None,
+        exploration: str = None,
+        bounty: str = None,
+        target: app_commands.Range[float, 0, 100] = None,
+    ):
+        """Rescore the current tick's buckets with a hypothetical contribution."""
+        await interaction.response.defer()
+
+        try:
+            contribution = {
+                "missions": missions,
+                "exploration": parse_credits(exploration) if exploration else 0,
+                "trade": parse_credits(trade) if trade else 0,
+                "bounty": parse_credits(bounty) if bounty else 0,
+            }
+        except ValueError:
+            await send_followup(interaction, "❌ Credit amounts look like `50M`, `1.5B`, `400K` or `250000`.")
+            return
+
+        entry = await _find_entry(interaction, system, faction, "ct")
+        if entry is None:
+            return
+
+        await send_followup(interaction, embed=_whatif_embed(entry, contribution, target))
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Buckets(bot))
@@ -0,0 +1,283 @@
+import asyncio
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import requests
+
+from core.api import (
+    API_BASE,
+    get_api_headers,
+    get_api_error,
+    fetch_cmdr_system,
+    fetch_system_coords,
+    trigger_cmdr_sync,
+)
+from core import names
+from core.cache import cache
+from core.helpers import calculate_distance
+from core.jobs import jobs
+from core.outbound import send_followup
+
+
+def run_cmdr_sync() -> str:
+    """Job body for /synccmdrs; returns the message to show the user."""
+    response = trigger_cmdr_sync()
+    if response.status_code == 200:
+        summary = response.json().get('summary', 'Sync completed')
+        return f"✅ **Cmdr Sync Complete**\n{summary}"
+    error_data = response.json() if response.headers.get('content-type') == 'application/json' else {}
+    error_msg = error_data.get('error', f'HTTP {response.status_code}')
+    return f"❌ Failed to sync commanders: {error_msg}"
+
+
+class Cmdr(commands.Cog):
+    """Commander linking, location and distance commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="linkcmdr", description="Link your Elite Dangerous commander name to your Discord account")
+    @app_commands.describe(cmdr_name="Your Elite Dangerous commander name")
+    @app_commands.autocomplete(cmdr_name=names.cmdr_autocomplete)
+    async def link_cmdr(self, interaction: discord.Interaction, cmdr_name: str):
+        """Link a commander name to the user's Discord account"""
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            headers = get_api_headers()
+            discord_id = str(interaction.user.id)
+
+            # Call the backend to link the cmdr
+            response = requests.post(
+                f'{API_BASE}link_cmdr',
+                headers=headers,
+                json={
+                    "discord_id": discord_id,
+                    "cmdr_name": cmdr_name
+                },
+                timeout=10
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                cache.invalidate(f"cmdr:system:{discord_id}")
+                names.cmdrs.add([cmdr_name])
+                await send_followup(
+                    interaction,
+                    f"✅ Successfully linked CMDR **{cmdr_name}** to your account!",
+                    ephemeral=True
+                )
+            elif response.status_code == 404:
+                error_data = response.json()
+                error_msg = get_api_error(error_data)
+
+                if 'User not found' in error_msg:
+                    await send_followup(
+                        interaction,
+                        f"❌ You don't have a user account yet. Please login into the dashboard at https://dashboard.sinistra-ciu.space",
+                        ephemeral=True
+                    )
+                elif 'Cmdr' in error_msg and 'not found' in error_msg:
+                    await send_followup(
+                        interaction,
+                        f"❌ Commander **{cmdr_name}** not found in the database. Run /synccmdrs to add them. If it is still not working, make sure the name is spelled correctly and that you've used BGSTally.",
+                        ephemeral=True
+                    )
+                else:
+                    await send_followup(interaction, f"❌ Error: {error_msg}", ephemeral=True)
+            else:
+                error_data = response.json()
+                await send_followup(
+                    interaction,
+                    f"❌ Error linking commander: {get_api_error(error_data)}",
+                    ephemeral=True
+                )
+
+        except requests.RequestException as e:
+            await send_followup(
+                interaction,
+                f"❌ Error connecting to backend: {str(e)}",
+                ephemeral=True
+            )
+        except Exception as e:
+            await send_followup(
+                interaction,
+                f"❌ Error: {str(e)}",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="wheream", description="Show your current Elite Dangerous location")
+    async def where_am_i(self, interaction: discord.Interaction):
+        """Show the user's current system based on their last FSDJump"""
+        await interaction.response.defer()
+
+        try:
+            headers = get_api_headers()
+            discord_id = str(interaction.user.id)
+
+            # Call the backend to get current system
+            response = requests.get(
+                f'{API_BASE}cmdr_system',
+                headers=headers,
+                params={"discord_id": discord_id},
+                timeout=10
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                cmdr_name = data.get('cmdr_name')
+                current_system = data.get('current_system')
+                timestamp = data.get('timestamp')
+
+                embed = discord.Embed(
+                    title="📍 Current Location",
+                    color=discord.Color.blue()
+                )
+
+                embed.add_field(name="Commander", value=cmdr_name, inline=False)
+
+                if current_system:
+                    embed.add_field(name="System", value=current_system, inline=False)
+                    if timestamp:
+                        embed.add_field(name="Last Jump", value=timestamp, inline=False)
+                else:
+                    embed.add_field(
+                        name="System", 
+                        value="No FSDJump data available", 
+                        inline=False
+                    )
+
+                await send_followup(interaction, embed=embed)
+            elif response.status_code == 404:
+                error_data = response.json()
+                error_msg = get_api_error(error_data)
+
+                if 'No cmdr linked' in error_msg:
+                    await send_followup(
+                        interaction,
+                        f"❌ You haven't linked a commander yet. Use `/linkcmdr <name>` to link your commander.",
+                        ephemeral=True
+                    )
+                else:
+                    await send_followup(
+                        interaction,
+                        f"❌ Error: {error_msg}",
+                        ephemeral=True
+                    )
+            else:
+                error_data = response.json()
+                await send_followup(
+                    interaction,
+                    f"❌ Error fetching location: {get_api_error(error_data)}",
+                    ephemeral=True
+                )
+
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to backend: {str(e)}")
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {str(e)}")
+
+    @app_commands.command(name="dist", description="Calculate distance between two systems")
+    @app_commands.describe(
+        system1="First system name",
+        system2="Second system name (leave empty to use your current location)"
+    )
+    @app_commands.autocomplete(system1=names.system_autocomplete, system2=names.system_autocomplete)
+    async def distance(self, interaction: discord.Interaction, system1: str, system2: str = None):
+        """Calculate the distance between two systems"""
+        await interaction.response.defer()
+
+        try:
+            # If system2 is not provided, try to get user's current system
+            if not system2:
+                discord_id = str(interaction.user.id)
+                try:
+                    location_data = await asyncio.to_thread(fetch_cmdr_system, discord_id)
+                    if location_data is not None:
+                        system2 = location_data.get('current_system')
+                        if not system2:
+                            await send_followup(
+                                interaction,
+                                "❌ No second system provided and you don't have a current location. "
+                                "Either provide two system names or link your commander with `/linkcmdr`.",
+                                ephemeral=True
+                            )
+                            return
+                    else:
+                        await send_followup(
+                            interaction,
+                            "❌ No second system provided and couldn't fetch your current location. "
+                            "Please provide both system names or link your commander with `/linkcmdr`.",
+                            ephemeral=True
+                        )
+                        return
+                except:
+                    await send_followup(
+                        interaction,
+                        "❌ No second system provided and couldn't fetch your current location.",
+                        ephemeral=True
+                    )
+                    return
+
+            # Coordinates for both systems (EDSM, cached)
+            try:
+                system_coords = await asyncio.to_thread(fetch_system_coords, [system1, system2])
+            except requests.RequestException:
+                await send_followup(interaction, "❌ Failed to fetch system data from EDSM.")
+                return
+
+            # Check if we have coordinates for both systems
+            coords1 = system_coords.get(system1)
+            coords2 = system_coords.get(system2)
+
+            if not coords1:
+                await send_followup(
+                    interaction,
+                    f"❌ System **{system1}** not found or has no coordinates in EDSM.",
+                    ephemeral=True
+                )
+                return
+
+            if not coords2:
+                await send_followup(
+                    interaction,
+                    f"❌ System **{system2}** not found or has no coordinates in EDSM.",
+                    ephemeral=True
+                )
+                return
+
+            # Calculate distance
+            distance = calculate_distance(coords1, coords2)
+
+            # Create embed with result
+            embed = discord.Embed(
+                title="📏 Distance Calculator",
+                color=discord.Color.green()
+            )
+
+            embed.add_field(name="From", value=f"**{system1}**", inline=True)
+            embed.add_field(name="To", value=f"**{system2}**", inline=True)
+            embed.add_field(name="Distance", value=f"**{distance:.2f} Ly**", inline=False)
+
+            # Add coordinates in footer for reference
+            embed.set_footer(text=f"{system1}: ({coords1['x']:.2f}, {coords1['y']:.2f}, {coords1['z']:.2f}) | "
+                                 f"{system2}: ({coords2['x']:.2f}, {coords2['y']:.2f}, {coords2['z']:.2f})")
+
+            await send_followup(interaction, embed=embed)
+
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to EDSM: {str(e)}")
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {str(e)}")
+
+    @app_commands.command(name="synccmdrs", description="Force add new commanders to the cmdr list")
+    async def sync_cmdrs(self, interaction: discord.Interaction):
+        """Manually trigger adding commanders from events only (no Inara lookups)"""
+        await interaction.response.defer()
+
+        await jobs.run_job(interaction, "synccmdrs", run_cmdr_sync, pending="⏳ Syncing commanders…")
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Cmdr(bot))
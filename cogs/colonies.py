@@ -0,0 +1,123 @@
+import asyncio
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import requests
+
+from core.api import get_colony_index, fetch_cmdr_system, fetch_system_coords
+from core.outbound import send_followup
+
+
+class Colonies(commands.Cog):
+    """Colonisation goal commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="colonies", description="Show priority colonization goals")
+    @app_commands.describe(
+        limit="Colonies per page (default 5)",
+        page="Page number (default 1)"
+    )
+    async def colonies(
+        self,
+        interaction: discord.Interaction,
+        limit: app_commands.Range[int, 1, 25] = 5,
+        page: app_commands.Range[int, 1] = 1,
+    ):
+        """Show priority colonization goals"""
+        await interaction.response.defer()
+
+        try:
+            try:
+                index = await asyncio.to_thread(get_colony_index)
+            except requests.HTTPError as e:
+                response = e.response
+                body = response.text if response is not None else ''
+                status = response.status_code if response is not None else '?'
+                await send_followup(interaction, f"❌ Backend returned HTTP {status}: {body}")
+                return
+
+            if not index.colonies:
+                await send_followup(interaction, "📭 No priority colonies at the moment!")
+                return
+
+            total_pages = (len(index.colonies) + limit - 1) // limit
+            if page > total_pages:
+                await send_followup(interaction, f"❌ There are only {total_pages} page(s) of colonies.")
+                return
+
+            # Try to get user's current system for distance calculation
+            current_system = None
+            user_coords = None
+            discord_id = str(interaction.user.id)
+
+            try:
+                location_data = await asyncio.to_thread(fetch_cmdr_system, discord_id)
+                if location_data:
+                    current_system = location_data.get('current_system')
+            except:
+                pass  # Silently fail if we can't get location
+
+            # Colony coordinates are already in the index; only the user's system may need a lookup
+            if current_system:
+                try:
+                    user_coords = (await asyncio.to_thread(fetch_system_coords, [current_system])).get(current_system)
+                except:
+                    pass  # Silently fail if EDSM is unavailable
+
+            # Nearest first when we know where the user is, otherwise by priority
+            ranked = index.ranked(user_coords, (page - 1) * limit, limit)
+
+            # Create embed
+            embed_title = "🌍 Colonisation Goals"
+            embed_desc = "Use SrvSurvey to track your help!"
+
+            if current_system and user_coords:
+                embed_desc += f"\n📍 Your location: **{current_system}**"
+            elif current_system:
+                embed_desc += f"\n⚠️ Could not fetch coordinates for distance calculation"
+            else:
+                embed_desc += f"\n💡 Use `/linkcmdr` to see distances from your location"
+
+            embed = discord.Embed(
+                title=embed_title,
+                description=embed_desc,
+                color=discord.Color.gold()
+            )
+
+            for colony, distance in ranked:
+                priority = "⭐" * min(colony.priority, 5)
+                system = colony.system
+                cmdr = colony.cmdr
+                raven_url = colony.raven_url
+
+                # Build field name with distance
+                field_name = f"{priority} {system}"
+                if distance is not None:
+                    field_name += f" [{distance:.2f} Ly]"
+
+                value = f"**Commander:** {cmdr}\n"
+                if raven_url:
+                    value += f"[🔗 View on Raven Colonial]({raven_url})"
+
+                embed.add_field(
+                    name=field_name,
+                    value=value,
+                    inline=False
+                )
+
+            if total_pages > 1:
+                embed.set_footer(text=f"Page {page}/{total_pages} · {len(index.colonies)} colonies · use page: to see more")
+
+            await send_followup(interaction, embed=embed)
+
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to backend: {str(e)}")
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {str(e)}")
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Colonies(bot))
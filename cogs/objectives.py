@@ -0,0 +1,842 @@
+import asyncio
+from dataclasses import dataclass
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import requests
+
+from core.api import (
+    get_api_headers,
+    objectives_base_url,
+    fetch_objective_targets,
+    get_objectives,
+    get_objective_index,
+    get_bucket_entries,
+    fetch_cmdr_system,
+    fetch_system_coords,
+)
+from core import bgs
+from core.cache import cache
+from core.expiry import objective_expiry
+from core.embeds import FIELD_NAME_LIMIT, FIELD_VALUE_LIMIT, MESSAGE_TOTAL, MIN_TRIMMED, fit_text, share_budget, shrink_embed
+from core.models import Objective, ObjectiveIndex, BucketEntry
+from core.outbound import BACKGROUND, outbound, interaction_route, send_followup
+from core.route import plan_route
+from core.helpers import (
+    BUCKET_TARGET_MAP,
+    TARGET_TYPES_LIST,
+    VALID_TARGET_TYPES,
+    TARGET_LABEL_MAP,
+    ACTIVITY_CATEGORIES,
+    BGS_BIN_TYPES,
+    calculate_distance,
+    get_objective_color,
+    get_target_icon,
+    truncate_field_value,
+    has_officer_role,
+    fmt_credits,
+)
+
+
+def best_bucket_targets(obj: Objective, bucket_entry: BucketEntry | None) -> set[str]:
+    """Return the set of target types tied at the lowest (uncapped) bucket pts.
+
+    Since thresholds are exponential, buckets at lower pts require the least absolute
+    effort for the next point — all tied at the minimum are equally worth prioritising.
+    Returns an empty set if no bucket data or all relevant buckets are capped.
+    """
+    if not bucket_entry:
+        return set()
+    min_pts = 999
+    candidates: list[tuple[int, str]] = []
+    for target in obj.targets:
+        bucket_key = BUCKET_TARGET_MAP.get(target.type)
+        if not bucket_key:
+            continue
+        pts = bucket_entry.bucket(bucket_key).pts
+        if pts >= bgs.MAX_BUCKET_PTS:
+            continue  # capped, skip
+        if pts < min_pts:
+            min_pts = pts
+        candidates.append((pts, target.type))
+    return {t for pts, t in candidates if pts == min_pts}
+
+
+# Objectives per /goals page; each one is its own embed, and a message holds at most 10
+GOALS_PER_PAGE = 7
+# Italics and the blank line around an objective description in its field
+DESCRIPTION_OVERHEAD = 4
+
+
+@dataclass(slots=True)
+class GoalsRanking:
+    """Everything /goals needs to render any page, computed once per command."""
+    filter_value: str
+    ranked: list[tuple[Objective, float | None]]  # objective and distance, best first
+    ct_progress: dict[tuple[int, str], float]  # (objective id, target type) -> this tick's progress
+    current_system: str | None = None
+    located: bool = False
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, (len(self.ranked) + GOALS_PER_PAGE - 1) // GOALS_PER_PAGE)
+
+    def page(self, page: int) -> list[tuple[Objective, float | None]]:
+        start = (page - 1) * GOALS_PER_PAGE
+        return self.ranked[start:start + GOALS_PER_PAGE]
+
+
+def ct_progress_map(objectives_ct: list[Objective]) -> dict[tuple[int, str], float]:
+    """This tick's progress by objective ID + target type."""
+    progress = {}
+    for obj_ct in objectives_ct:
+        for target_ct in obj_ct.targets:
+            progress[(obj_ct.id, target_ct.type)] = target_ct.progress.overall
+    return progress
+
+
+def active_objectives_for(index: ObjectiveIndex, filter_value: str) -> list[Objective]:
+    """Active objectives, highest priority first, narrowed to an activity category unless filter_value is 'all'."""
+    # Active set is maintained by the expiry scheduler, in the index's priority order
+    if filter_value in ACTIVITY_CATEGORIES:
+        # A direct lookup in the category index
+        return [obj for obj in index.in_category(filter_value) if objective_expiry.is_active(obj.id)]
+    return objective_expiry.active()
+
+
+async def build_goals_ranking(interaction: discord.Interaction, filter_value: str) -> GoalsRanking | None:
+    """Fetch objectives, location and coordinates and rank them; reports problems and returns None."""
+    # Fetch objectives with their date-based progress (uses startdate/enddate)
+    # The backend now calculates progress server-side based on objective dates
+    try:
+        index = await asyncio.to_thread(get_objective_index)
+    except requests.HTTPError as e:
+        # Include backend response body for easier debugging
+        response = e.response
+        body = response.text if response is not None else ''
+        status = response.status_code if response is not None else '?'
+        await send_followup(interaction, f"❌ Backend returned HTTP {status}: {body}")
+        return None
+
+    # Also fetch current tick progress for "This Tick" display
+    objectives_ct = await asyncio.to_thread(get_objectives, 'ct')
+
+    if not objective_expiry.active():
+        await send_followup(interaction, "📭 No active objectives at the moment, Comrade!")
+        return None
+
+    active_objectives = active_objectives_for(index, filter_value)
+    if not active_objectives:
+        await send_followup(interaction, f"❌ No {filter_value} objectives found!")
+        return None
+
+    # Try to get user's current system for distance calculation
+    current_system = None
+    user_coords = None
+    discord_id = str(interaction.user.id)
+
+    try:
+        location_data = await asyncio.to_thread(fetch_cmdr_system, discord_id)
+        if location_data:
+            current_system = location_data.get('current_system')
+    except:
+        pass  # Silently fail if we can't get location
+
+    # If we have a current system, look up coordinates (cached, EDSM on miss)
+    system_coords = {}
+    if current_system:
+        # Collect all system names (current + objectives)
+        system_names = [current_system] + [obj.system for obj in active_objectives]
+        try:
+            system_coords = await asyncio.to_thread(fetch_system_coords, system_names)
+            user_coords = system_coords.get(current_system)
+        except:
+            pass  # Silently fail if EDSM is unavailable
+
+    # Calculate distances
+    ranked = []
+    for obj in active_objectives:
+        distance = None
+        if user_coords and obj.system in system_coords:
+            distance = calculate_distance(user_coords, system_coords[obj.system])
+        ranked.append((obj, distance))
+
+    # Sort by distance if available; otherwise keep the index's priority order
+    if user_coords:
+        ranked.sort(key=lambda x: (x[1] is None, x[1] if x[1] is not None else float('inf')))
+
+    return GoalsRanking(
+        filter_value=filter_value,
+        ranked=ranked,
+        ct_progress=ct_progress_map(objectives_ct),
+        current_system=current_system,
+        located=user_coords is not None,
+    )
+
+
+def _goal_embed(
+    ranking: GoalsRanking,
+    obj: Objective,
+    distance: float | None,
+    bucket_entry_for_obj: BucketEntry | None,
+    is_first_embed: bool,
+    page: int,
+    description_budget: int | None = None,
+) -> discord.Embed:
+    """One objective's embed; its description takes at most description_budget characters."""
+    priority = "⭐" * min(obj.priority, 5)
+    title_text = obj.title
+    system = obj.system or 'N/A'
+    faction = obj.faction or 'N/A'
+    obj_desc = obj.description
+
+    # Build field name with distance
+    field_name = f"{priority} {title_text}"
+    if distance is not None:
+        field_name += f" [{distance:.2f} Ly]"
+
+    # Build target summary
+    target_summary = []
+
+    # Determine best bucket targets for boost-type objectives
+    best_target_types: set[str] = set()
+    if obj.type in BGS_BIN_TYPES:
+        best_target_types = best_bucket_targets(obj, bucket_entry_for_obj)
+
+    # Start date only matters for non-bucket progress lines
+    start_display = obj.startdate.strftime('%b %d') if obj.startdate else 'mission start'
+
+    for target in obj.targets:
+        t_type = target.code
+        icon = get_target_icon(t_type)
+        target_overall = target.target_overall
+        label = TARGET_LABEL_MAP.get(target.type, t_type)
+
+        # Check for bucket data (boost-type objectives with a mapped target type)
+        bucket_map_key = BUCKET_TARGET_MAP.get(target.type)
+        b_data = None
+        if bucket_entry_for_obj and bucket_map_key:
+            b_data = bucket_entry_for_obj.buckets.get(bucket_map_key)
+
+        is_best = best_target_types and target.type in best_target_types
+        if is_best:
+            target_summary.append(f"{icon} **{label}** - Best target to invest in for next point")
+        if b_data:
+            # Compact bucket format: [🎯] ICON Name pts/10 · X to next
+            pts = b_data.pts
+            remaining_val = b_data.remaining
+            if pts >= 10:
+                target_summary.append(f"{icon} **{label}** CAPPED")
+            else:
+                target_summary.append(f"{icon} **{label}** {pts}/10 · {fmt_credits(remaining_val)} to next BGS point")
+
+        elif target_overall > 0:
+            # Standard progress format for non-bucket targets
+            objective_total = target.progress.overall
+
+            current_total = ranking.ct_progress.get((obj.id, target.type), 0)
+            percent_ct = (current_total / target_overall * 100) if target_overall > 0 else 0
+
+            progress_str = f"This Tick: **{fmt_credits(current_total)} / {fmt_credits(target_overall)}** ({percent_ct:.1f}%)\n*{fmt_credits(objective_total)} completed since {start_display}*"
+            target_summary.append(f"{icon} {t_type}\n{progress_str}")
+
+
+    # Build the value content with proper formatting
+    # Build critical info first (system, faction, targets)
+    critical_info = f"**System:** {system}\n**Faction:** {faction}"
+    if target_summary:
+        critical_info += "\n**Targets:**\n" + "\n".join(target_summary)
+
+    # The objective's own description goes first, trimmed to what the field and the page budget leave over
+    value = fit_text(critical_info, FIELD_VALUE_LIMIT)
+    desc_room = FIELD_VALUE_LIMIT - len(value) - DESCRIPTION_OVERHEAD
+    if description_budget is not None:
+        desc_room = min(desc_room, description_budget)
+    desc_text = (obj_desc or '').strip()
+    if desc_text and desc_room >= MIN_TRIMMED:
+        value = f"_{fit_text(desc_text, desc_room)}_\n\n{value}"
+
+    # Get color based on objective type
+    obj_color = get_objective_color(obj)
+
+    # Create description for this embed
+    if is_first_embed:
+        description = "_From each according to their ability, to each according to their needs_"
+        if ranking.current_system and ranking.located:
+            description += f"\n📍 Your location: **{ranking.current_system}**"
+        elif ranking.current_system:
+            description += f"\n⚠️ Could not fetch coordinates for distance calculation"
+        else:
+            description += f"\n💡 Use `/linkcmdr` to see distances from your location"
+        description += "\n┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄"
+    else:
+        description = "┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄┄"
+
+    # Create embed for this objective
+    title = "⚒️ Current CIU Objectives"
+    if ranking.filter_value != "all":
+        title += f" - {ranking.filter_value.capitalize()}"
+
+    embed = discord.Embed(
+        title=title,
+        description=description,
+        color=obj_color
+    )
+
+    embed.add_field(
+        name=fit_text(field_name, FIELD_NAME_LIMIT),
+        value=value,
+        inline=False
+    )
+
+    footer = "Use /colonies for colonization goals"
+    if ranking.total_pages > 1:
+        footer = f"Page {page}/{ranking.total_pages} · {len(ranking.ranked)} objectives · {footer}"
+    embed.set_footer(text=footer)
+    return embed
+
+
+async def render_goals_page(ranking: GoalsRanking, page: int, budget: int = MESSAGE_TOTAL) -> list[discord.Embed]:
+    """Embeds for one page, at most budget characters in all, fetching bucket data only for that page's objectives."""
+    items = ranking.page(page)
+
+    # Fetch bucket data for boost-type objectives (to indicate best target to invest in)
+    # One API call per unique system among boost objectives
+    boost_bucket_map: dict[tuple[str, str], BucketEntry] = {}
+    boost_systems = set()
+    for obj, _ in items:
+        if obj.type in BGS_BIN_TYPES and obj.system and obj.faction:
+            boost_systems.add(obj.system)
+    bucket_results = await asyncio.gather(
+        *(asyncio.to_thread(get_bucket_entries, system_name, 'ct') for system_name in boost_systems),
+        return_exceptions=True,
+    )
+    for bucket_entries in bucket_results:
+        if isinstance(bucket_entries, Exception):
+            continue  # silently skip if bucket fetch fails
+        for entry in bucket_entries:
+            boost_bucket_map[(entry.system, entry.faction)] = entry
+
+    # Create embeds - one per objective with color-coding
+    items = [(obj, distance, boost_bucket_map.get((obj.system, obj.faction))) for obj, distance in items]
+
+    # Size the page without objective descriptions, then share what the message has left among them
+    bare = [
+        _goal_embed(ranking, obj, distance, entry, i == 0, page, description_budget=0)
+        for i, (obj, distance, entry) in enumerate(items)
+    ]
+    wanted = [
+        len(desc) + DESCRIPTION_OVERHEAD if (desc := (obj.description or '').strip()) else 0
+        for obj, _, _ in items
+    ]
+    shares = share_budget(wanted, budget - sum(len(embed) for embed in bare))
+    embeds = [
+        _goal_embed(ranking, obj, distance, entry, i == 0, page, description_budget=share - DESCRIPTION_OVERHEAD)
+        for i, ((obj, distance, entry), share) in enumerate(zip(items, shares))
+    ]
+
+    # Target lists alone can outgrow the budget; trim the biggest embeds to their share
+    if sum(len(embed) for embed in embeds) > budget:
+        for embed, cap in zip(embeds, share_budget([len(embed) for embed in embeds], budget)):
+            shrink_embed(embed, cap)
+    return embeds
+
+
+class GoalsView(discord.ui.View):
+    """Previous/next buttons for /goals; pages are rendered on first view and kept."""
+
+    def __init__(self, ranking: GoalsRanking, owner_id: int, first_page: list[discord.Embed]):
+        super().__init__(timeout=600)
+        self.ranking = ranking
+        self.owner_id = owner_id
+        self.page = 1
+        self.pages: dict[int, list[discord.Embed]] = {1: first_page}
+        self.message: discord.Message | None = None
+        self.route: str | None = None  # the message's webhook route, for outbound
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= self.ranking.total_pages
+        self.page_label.label = f"{self.page}/{self.ranking.total_pages}"
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message("Run `/goals` yourself to page through objectives.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        await interaction.response.defer()
+        if page not in self.pages:
+            self.pages[page] = await render_goals_page(self.ranking, page)
+        self.page = page
+        self._update_buttons()
+        await outbound.send(
+            interaction_route(interaction),
+            lambda: interaction.edit_original_response(embeds=self.pages[page], view=self),
+        )
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_label(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await outbound.send(self.route, lambda: self.message.edit(view=self), priority=BACKGROUND)
+            except discord.HTTPException:
+                pass
+
+
+# Helper function to fetch and display goals
+async def show_goals_helper(interaction: discord.Interaction, filter_value: str = "all"):
+    """Shared logic for displaying goals"""
+    try:
+        ranking = await build_goals_ranking(interaction, filter_value)
+        if ranking is None:
+            return
+
+        embeds = await render_goals_page(ranking, 1)
+        if ranking.total_pages == 1:
+            await send_followup(interaction, embeds=embeds)
+            return
+
+        view = GoalsView(ranking, interaction.user.id, embeds)
+        view.route = interaction_route(interaction)
+        view.message = await send_followup(interaction, embeds=embeds, view=view, wait=True)
+
+    except requests.RequestException as e:
+        await send_followup(interaction, f"❌ Error connecting to backend: {str(e)}")
+    except Exception as e:
+        await send_followup(interaction, f"❌ Error: {str(e)}")
+
+
+class AddTargetView(discord.ui.View):
+    """Persistent button shown after objective creation / target addition."""
+
+    def __init__(self, objective_id: int, objective_title: str):
+        super().__init__(timeout=600)
+        self.objective_id = objective_id
+        self.objective_title = objective_title
+
+    @discord.ui.button(label="Add Target", style=discord.ButtonStyle.primary, emoji="➕")
+    async def add_target(self, interaction: discord.Interaction, button: discord.ui.Button):
+        modal = CreateTargetModal(objective_id=self.objective_id)
+        await interaction.response.send_modal(modal)
+
+    @discord.ui.button(label="Done", style=discord.ButtonStyle.secondary)
+    async def done(self, interaction: discord.Interaction, button: discord.ui.Button):
+        for item in self.children:
+            item.disabled = True
+        await interaction.response.edit_message(
+            content=f"✅ Objective **{self.objective_title}** setup complete.",
+            view=self,
+        )
+        self.stop()
+
+
+class CreateTargetModal(discord.ui.Modal, title="Add Target"):
+    """Modal for adding a target to an existing objective."""
+
+    target_type = discord.ui.TextInput(
+        label="Type",
+        placeholder="visit | inf | bv | cb | expl | trade_prof | ground_cz | space_cz | murder | mission_fail",
+        required=True,
+        max_length=20,
+    )
+    target_overall = discord.ui.TextInput(
+        label="Target Overall (total for the whole group)",
+        placeholder="e.g. 5000000",
+        required=True,
+        max_length=20,
+    )
+    target_individual = discord.ui.TextInput(
+        label="Target Individual (per CMDR, 0 = none)",
+        placeholder="e.g. 500000",
+        required=False,
+        max_length=20,
+    )
+    system_override = discord.ui.TextInput(
+        label="System Override",
+        placeholder="Leave empty to use the objective's system",
+        required=False,
+        max_length=100,
+    )
+    faction_override = discord.ui.TextInput(
+        label="Faction Override",
+        placeholder="Leave empty to use the objective's faction",
+        required=False,
+        max_length=100,
+    )
+
+    def __init__(self, objective_id: int):
+        super().__init__()
+        self.objective_id = objective_id
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        type_value = self.target_type.value.strip().lower()
+        if type_value not in VALID_TARGET_TYPES:
+            valid_str = ", ".join(sorted(VALID_TARGET_TYPES))
+            await send_followup(
+                interaction,
+                f"❌ Invalid type `{type_value}`.\nValid types: {valid_str}",
+                ephemeral=True,
+            )
+            return
+
+        try:
+            overall = int(self.target_overall.value.strip().replace(",", "").replace(".", ""))
+        except ValueError:
+            await send_followup(interaction, "❌ Target Overall must be a whole number.", ephemeral=True)
+            return
+
+        individual = 0
+        if self.target_individual.value.strip():
+            try:
+                individual = int(self.target_individual.value.strip().replace(",", "").replace(".", ""))
+            except ValueError:
+                individual = 0
+
+        try:
+            headers = get_api_headers()
+            existing_targets = fetch_objective_targets(self.objective_id)
+
+            new_target = {
+                "type": type_value,
+                "station": "",
+                "system": self.system_override.value.strip(),
+                "faction": self.faction_override.value.strip(),
+                "progress": 0,
+                "targetindividual": individual,
+                "targetoverall": overall,
+                "settlements": [],
+            }
+            existing_targets.append(new_target)
+
+            update_url = f"{objectives_base_url()}/{self.objective_id}"
+            update_response = requests.post(
+                update_url,
+                headers=headers,
+                json={"targets": existing_targets},
+                timeout=10,
+            )
+
+            if update_response.status_code in (200, 201):
+                cache.invalidate("objectives:")
+                type_label = next(
+                    (t["label"] for t in TARGET_TYPES_LIST if t["value"] == type_value),
+                    type_value,
+                )
+                view = AddTargetView(objective_id=self.objective_id, objective_title=f"#{self.objective_id}")
+                await send_followup(
+                    interaction,
+                    f"✅ Target **{type_label}** added (overall: {overall:,}, individual: {individual:,}).\n"
+                    f"Add another target or click **Done** when finished.",
+                    view=view,
+                    ephemeral=True,
+                )
+            else:
+                try:
+                    error_msg = update_response.json().get('error', f'HTTP {update_response.status_code}')
+                except Exception:
+                    error_msg = f'HTTP {update_response.status_code}'
+                await send_followup(interaction, f"❌ Failed to add target: {error_msg}", ephemeral=True)
+
+        except ValueError as e:
+            await send_followup(interaction, f"❌ {e}", ephemeral=True)
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to backend: {e}", ephemeral=True)
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {e}", ephemeral=True)
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        if not interaction.response.is_done():
+            await interaction.response.send_message(f"❌ An error occurred: {error}", ephemeral=True)
+        else:
+            await send_followup(interaction, f"❌ An error occurred: {error}", ephemeral=True)
+
+
+class CreateObjectiveModal(discord.ui.Modal, title="Create New Objective"):
+    """Modal for creating a new BGS objective."""
+
+    obj_title = discord.ui.TextInput(
+        label="Title",
+        placeholder="Enter objective title",
+        required=True,
+        max_length=200,
+    )
+    system = discord.ui.TextInput(
+        label="System",
+        placeholder="Star system (optional)",
+        required=False,
+        max_length=100,
+    )
+    faction = discord.ui.TextInput(
+        label="Faction",
+        placeholder="Faction name (optional)",
+        required=False,
+        max_length=100,
+    )
+    description = discord.ui.TextInput(
+        label="Description",
+        placeholder="Objective description (optional)",
+        style=discord.TextStyle.paragraph,
+        required=False,
+        max_length=500,
+    )
+    end_date = discord.ui.TextInput(
+        label="End Date (YYYY-MM-DD, optional)",
+        placeholder="e.g. 2026-03-01",
+        required=False,
+        max_length=10,
+    )
+
+    def __init__(self, obj_type: str = "recon", priority: int = 1):
+        super().__init__()
+        self.obj_type = obj_type
+        self.priority = priority
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            headers = get_api_headers()
+            objectives_url = objectives_base_url()
+
+            payload = {
+                "title": self.obj_title.value,
+                "type": self.obj_type,
+                "priority": self.priority,
+                "targets": [],
+            }
+            if self.system.value:
+                payload["system"] = self.system.value
+            if self.faction.value:
+                payload["faction"] = self.faction.value
+            if self.description.value:
+                payload["description"] = self.description.value
+            if self.end_date.value:
+                payload["enddate"] = self.end_date.value
+
+            response = requests.post(objectives_url, headers=headers, json=payload, timeout=10)
+
+            if response.status_code in (200, 201):
+                cache.invalidate("objectives:")
+                data = response.json()
+                obj_id = data.get('id', '?')
+                view = AddTargetView(objective_id=obj_id, objective_title=self.obj_title.value)
+                await send_followup(
+                    interaction,
+                    f"✅ Objective **{self.obj_title.value}** created! (ID: {obj_id})\n"
+                    f"Add targets using the button below, or visit the dashboard.",
+                    view=view,
+                    ephemeral=True,
+                )
+            else:
+                try:
+                    error_msg = response.json().get('error', f'HTTP {response.status_code}')
+                except Exception:
+                    error_msg = f'HTTP {response.status_code}: {response.text}'
+                await send_followup(interaction, f"❌ Failed to create objective: {error_msg}", ephemeral=True)
+
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to backend: {e}", ephemeral=True)
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {e}", ephemeral=True)
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        if not interaction.response.is_done():
+            await interaction.response.send_message(f"❌ An error occurred: {error}", ephemeral=True)
+        else:
+            await send_followup(interaction, f"❌ An error occurred: {error}", ephemeral=True)
+
+
+class Objectives(commands.Cog):
+    """Objective listing and creation commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._expiry_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        self._expiry_task = asyncio.create_task(objective_expiry.run())
+
+    async def cog_unload(self):
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+
+    @app_commands.command(name="goals", description="Show current objectives")
+    @app_commands.describe(
+        goal_type="Filter by activity type (fighting, hauling, colonizing)"
+    )
+    @app_commands.choices(goal_type=[
+        app_commands.Choice(name="All", value="all"),
+        app_commands.Choice(name="Fight", value="fight"),
+        app_commands.Choice(name="Haul", value="haul"),
+        app_commands.Choice(name="Explore", value="explore")
+    ])
+    async def goals(self, interaction: discord.Interaction, goal_type: app_commands.Choice[str] = None):
+        """Show current objectives"""
+        await interaction.response.defer()
+        filter_value = goal_type.value if goal_type else "all"
+        await show_goals_helper(interaction, filter_value)
+
+    @app_commands.command(name="fight", description="Show combat objectives")
+    async def fighting(self, interaction: discord.Interaction):
+        """Show combat-related objectives"""
+        await interaction.response.defer()
+        await show_goals_helper(interaction, "fight")
+
+    @app_commands.command(name="haul", description="Show trade/hauling objectives")
+    async def hauling(self, interaction: discord.Interaction):
+        """Show trade/hauling objectives"""
+        await interaction.response.defer()
+        await show_goals_helper(interaction, "haul")
+
+    @app_commands.command(name="explore", description="Show exploration/travelling objectives")
+    async def exploring(self, interaction: discord.Interaction):
+        """Show exploration objectives"""
+        await interaction.response.defer()
+        await show_goals_helper(interaction, "explore")
+
+    @app_commands.command(name="route", description="Plan the shortest loop through active objective systems")
+    @app_commands.describe(goal_type="Only visit objectives of this activity type")
+    @app_commands.choices(goal_type=[
+        app_commands.Choice(name="All", value="all"),
+        app_commands.Choice(name="Fight", value="fight"),
+        app_commands.Choice(name="Haul", value="haul"),
+        app_commands.Choice(name="Explore", value="explore")
+    ])
+    async def route(self, interaction: discord.Interaction, goal_type: app_commands.Choice[str] = None):
+        """Order the active objective systems into a short tour from the user's location"""
+        await interaction.response.defer()
+        filter_value = goal_type.value if goal_type else "all"
+
+        try:
+            index = await asyncio.to_thread(get_objective_index)
+            if filter_value in ACTIVITY_CATEGORIES:
+                objectives = [obj for obj in index.in_category(filter_value) if objective_expiry.is_active(obj.id)]
+            else:
+                objectives = objective_expiry.active()
+
+            # One stop per system, keeping the objectives there for display
+            by_system: dict[str, list[Objective]] = {}
+            for obj in objectives:
+                if obj.system:
+                    by_system.setdefault(obj.system, []).append(obj)
+            if not by_system:
+                await send_followup(interaction, "📭 No active objectives with a system to visit, Comrade!")
+                return
+
+            current_system = None
+            try:
+                location_data = await asyncio.to_thread(fetch_cmdr_system, str(interaction.user.id))
+                if location_data:
+                    current_system = location_data.get('current_system')
+            except requests.RequestException:
+                pass  # plan from the top objective instead
+
+            system_coords = await asyncio.to_thread(fetch_system_coords, [current_system, *by_system])
+            stops = {name: (c['x'], c['y'], c['z']) for name, c in system_coords.items() if name in by_system}
+            unplaced = [name for name in by_system if name not in stops]
+            if not stops:
+                await send_followup(interaction, "❌ None of the objective systems have known coordinates.")
+                return
+
+            start_coords = system_coords.get(current_system)
+            if start_coords:
+                start = current_system
+            else:
+                # Unknown location: start at the highest-priority system we can place
+                start = next(name for name in by_system if name in stops)
+                start_coords = system_coords[start]
+            route = plan_route((start_coords['x'], start_coords['y'], start_coords['z']), stops)
+
+            lines = []
+            for n, (system, leg) in enumerate(zip(route.stops, route.legs), start=1):
+                titles = ", ".join(obj.title or obj.type for obj in by_system[system])
+                lines.append(f"**{n}. {system}** · {leg:,.1f} ly\n↳ {titles}")
+            if unplaced:
+                lines.append(f"\n⚠️ No coordinates for: {', '.join(unplaced)}")
+            description, _ = truncate_field_value("\n".join(lines), 4096)
+
+            embed = discord.Embed(
+                title=f"🧭 Route from {start}",
+                description=description,
+                color=discord.Color.dark_red()
+            )
+            embed.add_field(name="Total distance", value=f"**{route.total:,.1f} ly** over {len(route.stops)} system(s)", inline=False)
+            if not current_system:
+                embed.set_footer(text="Location unknown; link your commander with /linkcmdr to start from where you are")
+            elif current_system != start:
+                embed.set_footer(text=f"No coordinates for {current_system}; starting at the top objective instead")
+            await send_followup(interaction, embed=embed)
+
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error connecting to backend: {str(e)}")
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {str(e)}")
+
+    @app_commands.command(name="create_objective", description="Create a new BGS objective (Veterans only)")
+    @app_commands.describe(
+        obj_type="Type of objective",
+        priority="Priority level (1 = lowest, 5 = highest)",
+    )
+    @app_commands.choices(
+        obj_type=[
+            app_commands.Choice(name="Recon", value="recon"),
+            app_commands.Choice(name="Win War", value="win_war"),
+            app_commands.Choice(name="Draw War", value="draw_war"),
+            app_commands.Choice(name="Win Election", value="win_election"),
+            app_commands.Choice(name="Draw Election", value="draw_election"),
+            app_commands.Choice(name="Boost Influence", value="boost"),
+            app_commands.Choice(name="Expand", value="expand"),
+            app_commands.Choice(name="Reduce Influence", value="reduce"),
+            app_commands.Choice(name="Retreat", value="retreat"),
+            app_commands.Choice(name="Equalise", value="equalise"),
+        ],
+        priority=[
+            app_commands.Choice(name="1 - Lowest", value="1"),
+            app_commands.Choice(name="2", value="2"),
+            app_commands.Choice(name="3", value="3"),
+            app_commands.Choice(name="4", value="4"),
+            app_commands.Choice(name="5 - Highest", value="5"),
+        ],
+    )
+    async def create_objective(
+        self,
+        interaction: discord.Interaction,
+        obj_type: app_commands.Choice[str] = None,
+        priority: app_commands.Choice[str] = None,
+    ):
+        """Create a new BGS objective via a modal form."""
+        if not has_officer_role(interaction.user):
+            await interaction.response.send_message(
+                "❌ Only Veterans can create objectives. Ask an officer if you'd like to suggest one!",
+                ephemeral=True,
+            )
+            return
+
+        type_value = obj_type.value if obj_type else "recon"
+        priority_value = int(priority.value) if priority else 1
+
+        modal = CreateObjectiveModal(obj_type=type_value, priority=priority_value)
+        await interaction.response.send_modal(modal)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Objectives(bot))
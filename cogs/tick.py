@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import requests
+
+from core.api import fetch_galaxy_tick, trigger_tick_summary
+from core.jobs import jobs
+from core.ticksummary import AUTO_TICK_SUMMARY, tick_summaries, history, should_run
+from core.outbound import send_followup
+from cogs import background_tasks_enabled
+
+
+def run_tick_summary(period: str, period_label: str) -> str:
+    """Job body for /ticksummary; returns the message to show the user."""
+    response = trigger_tick_summary(period)
+    if response.status_code == 200:
+        return f"✅ Successfully triggered **{period_label}** summary! Check the BGS channel."
+    error_data = response.json() if response.headers.get('content-type') == 'application/json' else {}
+    error_msg = error_data.get('error', f'HTTP {response.status_code}')
+    return f"❌ Failed to trigger summary: {error_msg}"
+
+
+class Tick(commands.Cog):
+    """BGS tick summary and prediction commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._summary_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        if AUTO_TICK_SUMMARY and background_tasks_enabled() and should_run():
+            self._summary_task = asyncio.create_task(tick_summaries.run())
+
+    async def cog_unload(self):
+        if self._summary_task is not None:
+            self._summary_task.cancel()
+
+    @app_commands.command(name="ticksummary", description="Generate a BGS tick summary report")
+    @app_commands.describe(
+        period="Time period for the summary (ct = current tick, lt = last tick)"
+    )
+    @app_commands.choices(period=[
+        app_commands.Choice(name="Current Tick", value="ct"),
+        app_commands.Choice(name="Last Tick", value="lt")
+    ])
+    async def tick_summary(self, interaction: discord.Interaction, period: app_commands.Choice[str]):
+        """Trigger a daily tick summary to be posted in Discord"""
+        await interaction.response.defer()
+
+        period_label = "Current Tick" if period.value == "ct" else "Last Tick"
+        await jobs.run_job(
+            interaction,
+            f"ticksummary:{period.value}",
+            run_tick_summary, period.value, period_label,
+            pending=f"⏳ Generating **{period_label}** summary…",
+        )
+
+    @app_commands.command(name="nexttick", description="Show when the next BGS tick is expected")
+    async def next_tick(self, interaction: discord.Interaction):
+        """Show the last BGS tick time and predict when the next one will occur"""
+        await interaction.response.defer()
+
+        try:
+            # Tick data from Zoy's service (cached)
+            data = await asyncio.to_thread(fetch_galaxy_tick)
+            last_tick_str = data.get("lastGalaxyTick")
+
+            if not last_tick_str:
+                await send_followup(interaction, "❌ Unable to fetch tick data from the service.")
+                return
+
+            # Parse the last tick time
+            from datetime import timedelta
+            last_tick_time = datetime.fromisoformat(last_tick_str.replace('Z', '+00:00'))
+
+            # Calculate time since last tick
+            now = datetime.now(last_tick_time.tzinfo)
+            time_since_tick = now - last_tick_time
+
+            # BGS ticks occur approximately every 24 hours (can vary slightly)
+            # Predict next tick (24 hours from last tick)
+            expected_next_tick = last_tick_time + timedelta(hours=24)
+            time_until_next = expected_next_tick - now
+
+            # Format times
+            hours_since = int(time_since_tick.total_seconds() // 3600)
+            minutes_since = int((time_since_tick.total_seconds() % 3600) // 60)
+
+            hours_until = int(time_until_next.total_seconds() // 3600)
+            minutes_until = int((time_until_next.total_seconds() % 3600) // 60)
+
+            # Create embed
+            embed = discord.Embed(
+                title="⏰ When is the next tick?",
+                color=discord.Color.blue()
+            )
+
+            # Last tick info
+            last_tick_formatted = last_tick_time.strftime("%Y-%m-%d %H:%M:%S UTC")
+            embed.add_field(
+                name="🕐 Last Tick",
+                value=f"**{last_tick_formatted}**\n_{hours_since}h {minutes_since}m ago_",
+                inline=False
+            )
+
+            # Next tick prediction
+            next_tick_formatted = expected_next_tick.strftime("%Y-%m-%d %H:%M:%S UTC")
+            if time_until_next.total_seconds() > 0:
+                embed.add_field(
+                    name="🔮 Expected Next Tick",
+                    value=f"**{next_tick_formatted}**\n_in approximately {hours_until}h {minutes_until}m_",
+                    inline=False
+                )
+            else:
+                # Tick is overdue
+                embed.add_field(
+                    name="🔮 Expected Next Tick",
+                    value=f"**Overdue!**\n_Expected around {next_tick_formatted}_\n_({abs(hours_until)}h {abs(minutes_until)}m overdue)_",
+                    inline=False
+                )
+
+            runs = await asyncio.to_thread(history)
+            if runs:
+                last_run = runs[0]
+                status = {"ok": "✅ Posted", "retry": "⏳ Retrying", "failed": "❌ Failed"}.get(last_run["outcome"], last_run["outcome"])
+                embed.add_field(
+                    name="📰 Automatic Tick Summary",
+                    value=f"{status} <t:{int(last_run['at'])}:R> (attempt {last_run['attempt']})",
+                    inline=False
+                )
+
+            embed.set_footer(text="⚠️ Tick times can vary by ±30 minutes | Data from tick.infomancer.uk")
+
+            await send_followup(interaction, embed=embed)
+
+        except requests.RequestException as e:
+            await send_followup(interaction, f"❌ Error fetching tick data: {str(e)}")
+        except Exception as e:
+            await send_followup(interaction, f"❌ Error: {str(e)}")
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Tick(bot))
@@ -0,0 +1,164 @@
+"""Admission control for expensive slash commands.
+
+Each command in COMMAND_COSTS spends tokens from three token buckets: the
+user's, the guild's and a global one. A call is admitted when all three can
+pay its cost. Nothing is deducted when any of them can't, so one noisy user
+does not drain their guild's budget with rejected calls.
+
+Over-budget calls to read-only commands (CACHE_SERVABLE) still run, but with
+upstream fetching disabled. They are answered from whatever the cache or the
+last snapshot holds. The rest get an ephemeral "slow down" reply.
+
+Buckets are process-local: each shard cluster or interactions worker
+enforces its own budgets.
+"""
+import os
+import time
+import threading
+import contextvars
+from dataclasses import dataclass
+
+import requests
+
+from core import metrics
+
+# Tokens per second and burst size for each scope
+USER_RATE, USER_BURST = 0.2, 6.0
+GUILD_RATE, GUILD_BURST = 1.0, 20.0
+GLOBAL_RATE = float(os.getenv('ADMISSION_GLOBAL_RATE', '5'))
+GLOBAL_BURST = float(os.getenv('ADMISSION_GLOBAL_BURST', '40'))
+
+# Tokens per call, roughly the number of upstream requests a cold call makes.
+# Commands not listed here are not rate limited.
+COMMAND_COSTS = {
+    'goals': 3,
+    'fight': 3,
+    'haul': 3,
+    'explore': 3,
+    'ticksummary': 3,
+    'colonies': 2,
+    'route': 2,
+    'synccmdrs': 2,
+    'buckets': 1,
+    'whatif': 1,
+    'dist': 1,
+    'wheream': 1,
+    'nexttick': 1,
+}
+
+# Read-only commands that can still be answered from cache when over budget
+CACHE_SERVABLE = frozenset({'goals', 'fight', 'haul', 'explore', 'route', 'colonies', 'buckets', 'whatif', 'dist', 'wheream', 'nexttick'})
+
+# Idle buckets are dropped once there are this many; an idle bucket is full anyway
+MAX_BUCKETS = 10_000
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until cost tokens are available (after refill)."""
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def is_full(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+@dataclass(slots=True)
+class Decision:
+    admitted: bool
+    scope: str | None = None  # 'user', 'guild' or 'global' when over budget
+    retry_after: float = 0.0
+
+
+ADMITTED = Decision(admitted=True)
+
+# Set for the rest of an over-budget call; upstream calls then raise ThrottledError
+throttled: contextvars.ContextVar[Decision | None] = contextvars.ContextVar('throttled', default=None)
+
+
+class ThrottledError(requests.ConnectionError):
+    """Raised instead of calling an upstream while serving an over-budget call from cache."""
+
+
+class Admission:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, int | None], TokenBucket] = {}
+        self._limits = {
+            'user': (USER_RATE, USER_BURST),
+            'guild': (GUILD_RATE, GUILD_BURST),
+            'global': (GLOBAL_RATE, GLOBAL_BURST),
+        }
+
+    def _bucket(self, scope: str, key: int | None, now: float) -> TokenBucket:
+        bucket = self._buckets.get((scope, key))
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune(now)
+            rate, burst = self._limits[scope]
+            bucket = self._buckets[(scope, key)] = TokenBucket(rate, burst, now)
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, b in self._buckets.items() if b.is_full(now)]:
+            del self._buckets[key]
+
+    def admit(self, command: str, user_id: int | None, guild_id: int | None) -> Decision:
+        """Spend the command's cost from every scope, or from none of them."""
+        cost = COMMAND_COSTS.get(command)
+        if cost is None:
+            return ADMITTED
+        now = time.monotonic()
+        scopes = [('user', user_id), ('global', None)]
+        if guild_id is not None:
+            scopes.insert(1, ('guild', guild_id))
+        with self._lock:
+            buckets = [(scope, self._bucket(scope, key, now)) for scope, key in scopes]
+            for scope, bucket in buckets:
+                if bucket.refill(now) < cost:
+                    return Decision(admitted=False, scope=scope, retry_after=bucket.wait_time(cost))
+            for _, bucket in buckets:
+                bucket.tokens -= cost
+        return ADMITTED
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+admission = Admission()
+
+
+def check(command: str, user_id: int | None, guild_id: int | None) -> Decision:
+    """Admit a call or record why it was refused (exported as admission_* counters)."""
+    decision = admission.admit(command, user_id, guild_id)
+    if decision.admitted:
+        return decision
+    if command in CACHE_SERVABLE:
+        metrics.inc('admission_cached_total', command=command, scope=decision.scope)
+    else:
+        metrics.inc('admission_rejected_total', command=command, scope=decision.scope)
+    return decision
+
+
+def slow_down_message(decision: Decision) -> str:
+    seconds = max(1, round(decision.retry_after))
+    if decision.scope == 'user':
+        reason = "You're sending commands too quickly"
+    elif decision.scope == 'guild':
+        reason = "This server is sending commands too quickly"
+    else:
+        reason = "The bot is very busy right now"
+    return f"⏳ {reason}. Please try again in {seconds}s."
@@ -0,0 +1,423 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from core import metrics, names
+from core.breaker import get_breaker
+from core.cache import cache, CacheEntry, STALE_KEEP
+from core.expiry import objective_expiry
+from core.helpers import TARGET_CATEGORY_MAP
+from core.models import (
+    Objective,
+    ObjectiveIndex,
+    ColonyIndex,
+    BucketEntry,
+    BucketIndex,
+    Colony,
+    merge_objectives_delta,
+    parse_objectives,
+    parse_bucket_entries,
+    parse_colonies,
+)
+
+API_BASE = os.getenv('API_BASE', '')
+API_KEY = os.getenv('API_KEY', '')
+API_VERSION = os.getenv('API_VERSION', '1.6.0')
+
+EDSM_SYSTEMS_URL = 'https://www.edsm.net/api-v1/systems'
+GALTICK_URL = 'http://tick.infomancer.uk/galtick.json'
+
+backend_breaker = get_breaker('backend')
+edsm_breaker = get_breaker('edsm')
+galtick_breaker = get_breaker('galtick')
+
+# Cache lifetimes (seconds) for upstream data
+OBJECTIVES_TTL = 60
+BUCKETS_TTL = 60
+COLONIES_TTL = 300
+CMDR_SYSTEM_TTL = 30
+TICK_TTL = 60
+COORDS_TTL = 7 * 24 * 3600       # system coordinates never change
+COORDS_MISSING_TTL = 3600        # unknown to EDSM; may be added later
+
+# Ask /objectives for changes since the last sync; only for backends that support since=
+OBJECTIVES_DELTA = os.getenv('OBJECTIVES_DELTA', '0') == '1'
+
+
+def get_api_headers():
+    """Return headers required by the Flask API (apikey + apiversion).
+
+    The backend expects headers named 'apikey' and 'apiversion' (lowercase).
+    """
+    headers = {}
+    if API_KEY:
+        headers["apikey"] = str(API_KEY)
+    # Always include a sane apiversion to satisfy the backend validator
+    headers["apiversion"] = str(API_VERSION)
+    return headers
+
+
+def get_api_error(response_data: dict, default: str = 'Unknown error') -> str:
+    """Extract error message from API response. Handles both Flask format
+    {'error': '...'} and Effect format {'message': '...', '_tag': '...'}."""
+    return response_data.get('error') or response_data.get('message') or default
+
+
+def mask_key(k: str) -> str:
+    if not k:
+        return "(none)"
+    if len(k) <= 8:
+        return k
+    return f"{k[:4]}...{k[-4:]}"
+
+
+def get_json(path, params=None):
+    # Strip trailing slash from API_BASE to avoid double slashes
+    base = API_BASE.rstrip('/') if API_BASE else ''
+    url = f"{base}/{path}"
+    headers = get_api_headers()
+    r = backend_breaker.call(requests.get, url, headers=headers, params=params)
+    r.raise_for_status()
+    return r.json()
+
+
+def revalidating_get(key: str, ttl: float, url: str, params: dict | None = None, delta: bool = False, timeout: float = 10) -> CacheEntry:
+    """GET url as a cache fetch for key, revalidating the expired entry instead of downloading it again.
+
+    The ETag and Last-Modified of the response that produced the entry are
+    kept under validators:<key> and sent as If-None-Match and
+    If-Modified-Since, as long as the expired entry is still readable (see
+    cache.STALE_KEEP). A 304 gives that entry a new TTL with cache.touch; the
+    payload is not rewritten and keeps its stored_at, so parsed models
+    memoised for it are reused as they are.
+
+    With delta, since=<time of the last sync> is sent too. A backend that
+    supports it answers {"changed": [...], "removed": [ids]}, which is merged
+    into the expired payload; a plain list is taken as a full payload.
+
+    Returns the stored entry, as get_or_fetch_entry expects from fetch.
+    """
+    validators_key = f"validators:{key}"
+    last = cache.get(validators_key)
+    previous = cache.get_stale_entry(key) if last is not None else None
+    if previous is not None and previous.stored_at != last["t"]:
+        previous = None  # the validators describe a payload that has since been replaced
+    headers = get_api_headers()
+    params = dict(params or {})
+    if previous is not None:
+        if last.get("etag"):
+            headers["If-None-Match"] = last["etag"]
+        if last.get("last_modified"):
+            headers["If-Modified-Since"] = last["last_modified"]
+        if delta and last.get("synced_at"):
+            params["since"] = last["synced_at"]
+
+    requested_at = time.time()
+    response = backend_breaker.call(requests.get, url, headers=headers, params=params, timeout=timeout)
+    namespace = key.split(':', 1)[0]
+    if response.status_code == 304 and previous is not None:
+        metrics.inc('upstream_conditional_total', namespace=namespace, outcome='not_modified')
+        if not cache.touch(key, ttl):
+            # Dropped since we read it (e.g. invalidated): store it again under its own stored_at
+            cache.set(key, previous.value, ttl, stored_at=previous.stored_at)
+        cache.touch(validators_key, ttl + STALE_KEEP)
+        return previous
+    response.raise_for_status()
+    payload = response.json()
+
+    if delta and previous is not None and isinstance(payload, dict) and "changed" in payload:
+        payload = merge_objectives_delta(previous.value, payload)
+        metrics.inc('upstream_conditional_total', namespace=namespace, outcome='delta')
+    else:
+        metrics.inc('upstream_conditional_total', namespace=namespace, outcome='full')
+
+    entry = cache.set(key, payload, ttl)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified or delta:
+        try:
+            # The server's clock decides what "since" means
+            synced_at = parsedate_to_datetime(response.headers['Date']).isoformat()
+        except (KeyError, TypeError, ValueError):
+            synced_at = time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(requested_at))
+        # Only as long as the entry they describe stays readable
+        cache.set(validators_key, {
+            "etag": etag,
+            "last_modified": last_modified,
+            "synced_at": synced_at,
+            "t": entry.stored_at,
+        }, ttl + STALE_KEEP)
+    return entry
+
+
+def objectives_base_url() -> str:
+    """The /objectives endpoint (not /api/objectives): it includes progressDetail and takes objective writes.
+
+    The same URL whether or not API_BASE ends with a slash, so validator keys don't depend on it.
+    """
+    return (API_BASE.rstrip('/') + '/').replace('/api/', '/').rstrip('/') + '/objectives'
+
+
+def fetch_objective_targets(objective_id: int) -> list:
+    """Return the current targets list for an objective, ready for the update payload.
+
+    Always asks the backend, since the list is about to be written back, but
+    conditionally: an unchanged list costs a 304 and is read from the cache.
+    """
+    all_objectives = revalidating_get("objectives:all", OBJECTIVES_TTL, objectives_base_url()).value
+    obj = next((o for o in all_objectives if o.get('id') == objective_id), None)
+    if obj is None:
+        raise ValueError(f"Objective {objective_id} not found")
+    return [
+        {
+            "type": t.get("type", ""),
+            "station": t.get("station", ""),
+            "system": t.get("system", ""),
+            "faction": t.get("faction", ""),
+            "progress": 0,
+            "targetindividual": t.get("targetindividual", 0),
+            "targetoverall": t.get("targetoverall", 0),
+            "settlements": [],
+        }
+        for t in obj.get("targets", [])
+    ]
+
+
+def _objectives_request(period: str | None) -> tuple[str, Callable[[], Any]]:
+    params = {'active': 'true'}
+    if period:
+        params['period'] = period
+
+    key = f"objectives:active:{period or 'objective'}"
+
+    def fetch():
+        headers = get_api_headers()
+        logging.info("Requesting %s period=%s headers=%s apiversion=%s", objectives_base_url(), period or 'objective', mask_key(headers.get('apikey','')), headers.get('apiversion'))
+        # Unchanged objectives cost a 304; with OBJECTIVES_DELTA only the changes are sent
+        return revalidating_get(key, OBJECTIVES_TTL, objectives_base_url(), params, delta=OBJECTIVES_DELTA)
+
+    return key, fetch
+
+
+def fetch_active_objectives(period: str | None = None) -> list:
+    """Active objectives with backend-computed progress, optionally for a tick period ('ct')."""
+    key, fetch = _objectives_request(period)
+    return cache.get_or_fetch(key, OBJECTIVES_TTL, fetch)
+
+
+def _colonies_request() -> tuple[str, Callable[[], Any]]:
+    def fetch():
+        headers = get_api_headers()
+        logging.info("Requesting %scolonies/priority headers=%s apiversion=%s", API_BASE, mask_key(headers.get('apikey','')), headers.get('apiversion'))
+        response = backend_breaker.call(requests.get, f'{API_BASE}colonies/priority', headers=headers, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    return "colonies:priority", fetch
+
+
+def fetch_priority_colonies() -> list:
+    key, fetch = _colonies_request()
+    return cache.get_or_fetch(key, COLONIES_TTL, fetch)
+
+
+def _buckets_request(system: str, period: str) -> tuple[str, Callable[[], Any]]:
+    return (
+        f"buckets:{period}:{system.lower()}",
+        lambda: get_json('buckets', params={'period': period, 'system': system}),
+    )
+
+
+def fetch_buckets(system: str, period: str = 'ct') -> dict:
+    key, fetch = _buckets_request(system, period)
+    return cache.get_or_fetch(key, BUCKETS_TTL, fetch)
+
+
+# Parsed models per cache key, rebuilt only when the cached payload changes
+PARSED_MEMO_SIZE = 256
+_parsed: dict[str, tuple[float, Any]] = {}
+_parsed_lock = threading.Lock()
+
+
+def _get_parsed(key: str, ttl: float, fetch: Callable[[], Any], parse: Callable[[Any], Any]) -> Any:
+    entry = cache.get_or_fetch_entry(key, ttl, fetch)
+    with _parsed_lock:
+        memo = _parsed.get(key)
+    if memo is not None and memo[0] == entry.stored_at:
+        return memo[1]
+    models = parse(entry.value)
+    with _parsed_lock:
+        _parsed.pop(key, None)
+        if len(_parsed) >= PARSED_MEMO_SIZE:
+            _parsed.pop(next(iter(_parsed)))  # oldest insertion
+        _parsed[key] = (entry.stored_at, models)
+    return models
+
+
+def get_objective_index(period: str | None = None) -> ObjectiveIndex:
+    """Active objectives as models, indexed by activity category; see fetch_active_objectives.
+
+    Each refill of the objective-period list also reloads objective_expiry.
+    """
+    key, fetch = _objectives_request(period)
+
+    def parse(payload):
+        index = ObjectiveIndex.build(parse_objectives(payload), TARGET_CATEGORY_MAP)
+        if period is None:
+            objective_expiry.load(index.objectives)
+        names.systems.add(o.system for o in index.objectives)
+        for obj in index.objectives:
+            if obj.system and obj.faction:
+                names.add_factions(obj.system, [obj.faction])
+        return index
+
+    return _get_parsed(key, OBJECTIVES_TTL, fetch, parse)
+
+
+def get_objectives(period: str | None = None) -> list[Objective]:
+    """Active objectives as models, highest priority first."""
+    return get_objective_index(period).objectives
+
+
+def get_priority_colonies() -> list[Colony]:
+    return get_colony_index().colonies
+
+
+def get_colony_index() -> ColonyIndex:
+    """Priority colonies with coordinates looked up once per colonies-cache fill."""
+    key, fetch = _colonies_request()
+
+    def parse(payload):
+        colonies = parse_colonies(payload)
+        names.systems.add(c.system for c in colonies)
+        names.cmdrs.add(c.cmdr for c in colonies if c.cmdr != 'N/A')
+        try:
+            coords = fetch_system_coords([c.system for c in colonies])
+        except requests.RequestException as e:
+            # Distances are unavailable until the next refill; the list itself still works
+            logging.error("Colony coordinate lookup failed: %s", e)
+            coords = {}
+        return ColonyIndex.build(colonies, coords)
+
+    return _get_parsed(key, COLONIES_TTL, fetch, parse)
+
+
+def get_bucket_index(system: str, period: str = 'ct') -> BucketIndex:
+    """Every tracked faction's bucket entry for the system, indexed by faction name."""
+    key, fetch = _buckets_request(system, period)
+
+    def parse(payload):
+        index = BucketIndex.build(parse_bucket_entries(payload))
+        if index.entries:
+            names.systems.add([index.entries[0].system or system])
+            names.add_factions(index.entries[0].system or system, [e.faction for e in index.entries])
+        return index
+
+    return _get_parsed(key, BUCKETS_TTL, fetch, parse)
+
+
+def get_bucket_entries(system: str, period: str = 'ct') -> list[BucketEntry]:
+    """One BucketEntry per tracked faction in the system, highest influence first."""
+    return get_bucket_index(system, period).entries
+
+
+def fetch_cmdr_system(discord_id: str) -> dict | None:
+    """Return the cmdr_system payload for a Discord user, or None if the backend has no location.
+
+    Only successful lookups are cached, so a freshly linked commander shows up immediately.
+    """
+    key = f"cmdr:system:{discord_id}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = backend_breaker.call(
+            requests.get,
+            f'{API_BASE}cmdr_system',
+            headers=get_api_headers(),
+            params={"discord_id": discord_id},
+            timeout=10
+        )
+    except requests.RequestException:
+        # Backend unreachable: fall back to the last known location, if any
+        entry = cache.fallback(key) if cache.fallback is not None else None
+        if entry is None:
+            raise
+        return entry.value
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    cache.set(key, data, CMDR_SYSTEM_TTL)
+    names.cmdrs.add([data.get('cmdr_name')])
+    names.systems.add([data.get('current_system')])
+    return data
+
+
+def fetch_system_coords(system_names: list[str]) -> dict[str, dict]:
+    """Return {name: {'x', 'y', 'z'}} for the systems EDSM knows, fetching only uncached ones.
+
+    Lookups are case-insensitive; the result is keyed by the names as given.
+    """
+    coords: dict[str, dict] = {}
+    missing: list[str] = []
+    for name in dict.fromkeys(n for n in system_names if n):
+        entry = cache.get_entry(f"coords:{name.lower()}")
+        if entry is None:
+            missing.append(name)
+        elif entry.value is not None:
+            coords[name] = entry.value
+
+    if missing:
+        edsm_params = [('systemName[]', name) for name in missing]
+        edsm_params.append(('showCoordinates', '1'))
+        response = edsm_breaker.call(requests.get, EDSM_SYSTEMS_URL, params=edsm_params, timeout=10)
+        response.raise_for_status()
+        found_systems = [s for s in response.json() or [] if s.get('name') and s.get('coords')]
+        found = {system['name'].lower(): system['coords'] for system in found_systems}
+        # EDSM's spelling, not the user's
+        names.systems.add(system['name'] for system in found_systems)
+        for name in missing:
+            system_coords = found.get(name.lower())
+            if system_coords is not None:
+                coords[name] = system_coords
+                cache.set(f"coords:{name.lower()}", system_coords, COORDS_TTL)
+            else:
+                cache.set(f"coords:{name.lower()}", None, COORDS_MISSING_TTL)
+
+    return coords
+
+
+def trigger_tick_summary(period: str) -> requests.Response:
+    """Ask the backend to post a tick summary to Discord; slow, run it as a job."""
+    return backend_breaker.call(
+        requests.post,
+        f'{API_BASE}summary/discord/tick',
+        headers=get_api_headers(),
+        params={"period": period},
+        timeout=30
+    )
+
+
+def trigger_cmdr_sync() -> requests.Response:
+    """Ask the backend to add new commanders from events (no Inara lookups); slow, run it as a job."""
+    return backend_breaker.call(
+        requests.post,
+        f'{API_BASE}sync/cmdrs?inara=false',
+        headers=get_api_headers(),
+        timeout=60
+    )
+
+
+def fetch_galaxy_tick() -> dict:
+    def fetch():
+        response = galtick_breaker.call(requests.get, GALTICK_URL, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    return cache.get_or_fetch("tick:galaxy", TICK_TTL, fetch)
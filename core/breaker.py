@@ -0,0 +1,144 @@
+"""Circuit breakers for upstream services.
+
+Each upstream (the Sinistra backend, EDSM, the galaxy tick service) has one
+breaker. After FAILURE_THRESHOLD consecutive connection errors or 5xx
+responses, the breaker opens. While it is open, calls fail immediately with
+CircuitOpenError instead of waiting on timeouts. The cache then serves its
+degraded-mode copy where it has one.
+
+After RESET_TIMEOUT seconds, one trial call is let through (half-open). If it
+succeeds the breaker closes; if it fails the breaker opens again.
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable
+
+import requests
+
+from core import metrics
+from core.admission import throttled, ThrottledError, slow_down_message
+from core.logs import record_upstream
+
+log = logging.getLogger('sinistra.upstream')
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._last_error = ''
+        metrics.set_gauge('circuit_state', 0, upstream=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            log.warning("Circuit %s: %s -> %s", self.name, self._state, state, extra={"upstream": self.name})
+        self._state = state
+        metrics.set_gauge('circuit_state', _STATE_VALUES[state], upstream=self.name)
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                metrics.inc('circuit_rejections_total', upstream=self.name)
+                raise CircuitOpenError(f"{self.name} is unavailable (circuit open: {self._last_error})")
+            self._set_state(HALF_OPEN)
+            self._trial_running = True
+
+    def _record(self, error: Exception | None) -> None:
+        with self._lock:
+            self._trial_running = False
+            if error is None:
+                self._failures = 0
+                self._set_state(CLOSED)
+                return
+            self._failures += 1
+            self._last_error = str(error)[:200]
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func through the breaker; connection errors and 5xx responses count as failures."""
+        decision = throttled.get()
+        if decision is not None:
+            # Not the upstream's fault, so the breaker's state is left alone
+            raise ThrottledError(slow_down_message(decision))
+        self._before_call()
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            if isinstance(result, requests.Response) and result.status_code >= 500:
+                self._record(requests.HTTPError(f"HTTP {result.status_code}", response=result))
+                return result
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 500
+            self._record(e if status >= 500 else None)
+            raise
+        except requests.RequestException as e:
+            self._record(e)
+            log.warning("%s request failed: %s", self.name, e, extra={"upstream": self.name, "elapsed_ms": self._elapsed_ms(started)})
+            raise
+        except Exception:
+            self._record(None)  # a bug on our side says nothing about the upstream
+            raise
+        finally:
+            record_upstream(self.name, self._elapsed_ms(started))
+        self._record(None)
+        if log.isEnabledFor(logging.DEBUG):
+            elapsed_ms = self._elapsed_ms(started)
+            log.debug("%s request took %.1f ms", self.name, elapsed_ms, extra={"upstream": self.name, "elapsed_ms": elapsed_ms})
+        return result
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {"state": state, "failures": self._failures, "last_error": self._last_error if state != CLOSED else ''}
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def all_breakers() -> dict[str, dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
@@ -0,0 +1,610 @@
+"""Upstream data cache with pluggable, optionally shared, storage.
+
+CACHE_URL picks the backend:
+
+- ``memory://`` (default): a dict in this process.
+- ``sqlite:///path/to/cache.db``: one file shared by every process on the host.
+- ``redis://host:6379/0``: anything that speaks the Redis protocol (Redis,
+  Valkey, KeyDB, ...), shared across hosts.
+
+Expired entries are kept for another STALE_KEEP seconds. They are not
+served, but ``get_stale_entry`` can still read them and ``touch`` can
+give them a new TTL. A refresh that finds the upstream unchanged (an
+HTTP 304) then keeps the stored payload instead of writing it again.
+
+The memory backend keeps values as the Python objects it was given, so a
+hit costs a dict lookup; callers must not mutate what they get back. The
+shared backends store entries as JSON.
+
+With a shared backend, the first process to miss a key takes a short fetch
+lock. The others wait for its result instead of calling the backend too, so
+N shards or workers cost about as much upstream traffic as one.
+
+Invalidations are published as messages ``{"id", "prefix", "origin", "at"}``.
+Every process reads them in id order and passes each one exactly once to the
+callbacks registered with ``cache.subscribe``. Processes that build in-memory
+views over cached data can rebuild them this way.
+"""
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+from core import metrics
+
+CACHE_URL = os.getenv('CACHE_URL', 'memory://')
+
+# How long a process may hold a key's fetch lock, and how long others wait for it
+FETCH_LOCK_TTL = 15.0
+FETCH_WAIT_INTERVAL = 0.1
+# Minimum delay between two reads of the invalidation log
+INVALIDATION_POLL_INTERVAL = 2.0
+# Number of invalidation messages kept in a shared backend
+INVALIDATION_LOG_SIZE = 1000
+# How long an expired entry stays readable by get_stale_entry and touch
+STALE_KEEP = 15 * 60.0
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float  # when the value was downloaded; a revalidated (304) value keeps its original time
+
+
+def _encode(entry: CacheEntry) -> str:
+    return json.dumps({"v": entry.value, "t": entry.stored_at})
+
+
+def _decode(raw: str) -> CacheEntry:
+    data = json.loads(raw)
+    return CacheEntry(value=data["v"], stored_at=data["t"])
+
+
+class MemoryBackend:
+    """Process-local storage of entries as they are; invalidation messages never leave the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict[str, tuple[CacheEntry, float]] = {}
+        self._locks: dict[str, float] = {}
+        self._messages: list[tuple[int, str]] = []
+
+    def _item(self, key: str, now: float) -> tuple[CacheEntry, float] | None:
+        item = self._data.get(key)
+        if item is not None and item[1] + STALE_KEEP < now:
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key: str) -> CacheEntry | None:
+        now = time.time()
+        with self._lock:
+            item = self._item(key, now)
+            return item[0] if item is not None and item[1] >= now else None
+
+    def get_stale(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            item = self._item(key, time.time())
+            return item[0] if item is not None else None
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (entry, time.time() + ttl)
+
+    def touch(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            item = self._item(key, now)
+            if item is None:
+                return False
+            self._data[key] = (item[0], now + ttl)
+            return True
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def scan(self, prefix: str) -> list[tuple[str, CacheEntry, float]]:
+        now = time.time()
+        with self._lock:
+            return [
+                (key, entry, expires_at)
+                for key, (entry, expires_at) in self._data.items()
+                if key.startswith(prefix) and expires_at >= now
+            ]
+
+    def acquire_lock(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._locks.get(key, 0) > now:
+                return False
+            self._locks[key] = now + ttl
+            return True
+
+    def release_lock(self, key: str) -> None:
+        with self._lock:
+            self._locks.pop(key, None)
+
+    def publish(self, message: dict) -> None:
+        with self._lock:
+            message_id = self._messages[-1][0] + 1 if self._messages else 1
+            message["id"] = message_id
+            self._messages.append((message_id, json.dumps(message)))
+            del self._messages[:-INVALIDATION_LOG_SIZE]
+
+    def read_messages(self, after_id: int) -> list[dict]:
+        with self._lock:
+            return [json.loads(raw) for message_id, raw in self._messages if message_id > after_id]
+
+
+class SQLiteBackend:
+    """A cache file shared by every process on the host (WAL mode, one connection per thread)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS invalidations (id INTEGER PRIMARY KEY AUTOINCREMENT, message TEXT NOT NULL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> CacheEntry | None:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def get_stale(self, key: str) -> CacheEntry | None:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time() - STALE_KEEP)
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", (key, _encode(entry), time.time() + ttl)
+        )
+
+    def touch(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE cache SET expires_at = ? WHERE key = ? AND expires_at >= ?", (now + ttl, key, now - STALE_KEEP)
+        )
+        return cursor.rowcount > 0
+
+    def delete_prefix(self, prefix: str) -> None:
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',))
+        conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time() - STALE_KEEP,))
+
+    def scan(self, prefix: str) -> list[tuple[str, CacheEntry, float]]:
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        rows = self._conn().execute(
+            "SELECT key, value, expires_at FROM cache WHERE key LIKE ? ESCAPE '\\' AND expires_at >= ?",
+            (escaped + '%', time.time()),
+        ).fetchall()
+        return [(key, _decode(raw), expires_at) for key, raw, expires_at in rows]
+
+    def acquire_lock(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT expires_at FROM locks WHERE key = ?", (key,)).fetchone()
+            if row and row[0] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO locks (key, expires_at) VALUES (?, ?)", (key, now + ttl))
+            return True
+        finally:
+            conn.execute("COMMIT")
+
+    def release_lock(self, key: str) -> None:
+        self._conn().execute("DELETE FROM locks WHERE key = ?", (key,))
+
+    def publish(self, message: dict) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute("INSERT INTO invalidations (message) VALUES ('')")
+            message["id"] = cursor.lastrowid
+            conn.execute("UPDATE invalidations SET message = ? WHERE id = ?", (json.dumps(message), cursor.lastrowid))
+            conn.execute("DELETE FROM invalidations WHERE id <= ?", (cursor.lastrowid - INVALIDATION_LOG_SIZE,))
+        finally:
+            conn.execute("COMMIT")
+
+    def read_messages(self, after_id: int) -> list[dict]:
+        rows = self._conn().execute(
+            "SELECT message FROM invalidations WHERE id > ? ORDER BY id", (after_id,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+class RedisBackend:
+    """Minimal RESP client: just the handful of commands the cache needs, over one socket.
+
+    Keys get STALE_KEEP seconds more than their TTL from Redis; the remaining
+    PTTL minus STALE_KEEP is the cache's own expiry.
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: str | None = None, namespace: str = 'sinistra:'):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._reader = None
+
+    def _close(self):
+        for closable in (self._reader, self._sock):
+            if closable is not None:
+                try:
+                    closable.close()
+                except OSError:
+                    pass
+        self._sock, self._reader = None, None
+
+    def _connect(self):
+        sock = socket.create_connection(self.address, timeout=5)
+        self._sock, self._reader = sock, sock.makefile('rb')
+        if self.password:
+            self._roundtrip('AUTH', self.password)
+        if self.db:
+            self._roundtrip('SELECT', self.db)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode()
+        if kind == b'-':
+            raise RuntimeError(rest.decode())
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2].decode()
+        if kind == b'*':
+            length = int(rest)
+            return None if length == -1 else [self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Unexpected Redis reply: {line!r}")
+
+    @staticmethod
+    def _encode_command(args) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    def _roundtrip(self, *args):
+        self._sock.sendall(self._encode_command(args))
+        return self._read_reply()
+
+    def _pipeline(self, commands):
+        self._sock.sendall(b"".join(self._encode_command(args) for args in commands))
+        return [self._read_reply() for _ in commands]
+
+    def _with_connection(self, call):
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                return call()
+            except (OSError, ConnectionError):
+                # Reconnect once; a second failure propagates to the caller
+                self._close()
+                self._connect()
+                return call()
+
+    def command(self, *args):
+        return self._with_connection(lambda: self._roundtrip(*args))
+
+    def pipeline(self, *commands):
+        """Send several commands in one write and return their replies in order."""
+        return self._with_connection(lambda: self._pipeline(commands))
+
+    def _get(self, key: str, stale: bool) -> CacheEntry | None:
+        full_key = self.namespace + key
+        raw, pttl = self.pipeline(('GET', full_key), ('PTTL', full_key))
+        if raw is None or (not stale and pttl < STALE_KEEP * 1000):
+            return None
+        return _decode(raw)
+
+    def get(self, key: str) -> CacheEntry | None:
+        return self._get(key, stale=False)
+
+    def get_stale(self, key: str) -> CacheEntry | None:
+        return self._get(key, stale=True)
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        self.command('SET', self.namespace + key, _encode(entry), 'PX', int((ttl + STALE_KEEP) * 1000))
+
+    def touch(self, key: str, ttl: float) -> bool:
+        return self.command('PEXPIRE', self.namespace + key, int((ttl + STALE_KEEP) * 1000)) == 1
+
+    def delete_prefix(self, prefix: str) -> None:
+        cursor = '0'
+        pattern = self.namespace + prefix.replace('*', '\\*').replace('?', '\\?') + '*'
+        while True:
+            cursor, keys = self.command('SCAN', cursor, 'MATCH', pattern, 'COUNT', 500)
+            if keys:
+                self.command('DEL', *keys)
+            if cursor == '0':
+                break
+
+    def scan(self, prefix: str) -> list[tuple[str, CacheEntry, float]]:
+        entries = []
+        cursor = '0'
+        pattern = self.namespace + prefix.replace('*', '\\*').replace('?', '\\?') + '*'
+        while True:
+            cursor, keys = self.command('SCAN', cursor, 'MATCH', pattern, 'COUNT', 500)
+            for full_key in keys:
+                raw, pttl = self.pipeline(('GET', full_key), ('PTTL', full_key))
+                if raw is not None and pttl > STALE_KEEP * 1000:
+                    entries.append((full_key[len(self.namespace):], _decode(raw), time.time() + pttl / 1000 - STALE_KEEP))
+            if cursor == '0':
+                break
+        return entries
+
+    def acquire_lock(self, key: str, ttl: float) -> bool:
+        return self.command('SET', f"{self.namespace}lock:{key}", os.getpid(), 'NX', 'PX', int(ttl * 1000)) == 'OK'
+
+    def release_lock(self, key: str) -> None:
+        self.command('DEL', f"{self.namespace}lock:{key}")
+
+    # Invalidation log: a sorted set scored by message id, so a reader fetches only what is new
+    def publish(self, message: dict) -> None:
+        message["id"] = self.command('INCR', f"{self.namespace}invalidations:seq")
+        log_key = f"{self.namespace}invalidations:log"
+        self.pipeline(
+            ('ZADD', log_key, message["id"], json.dumps(message)),
+            ('ZREMRANGEBYRANK', log_key, 0, -INVALIDATION_LOG_SIZE - 1),
+        )
+
+    def read_messages(self, after_id: int) -> list[dict]:
+        raws = self.command('ZRANGEBYSCORE', f"{self.namespace}invalidations:log", f"({after_id}", '+inf')
+        return [json.loads(raw) for raw in raws or []]
+
+
+class Cache:
+    """Value cache over a backend, with fetch coalescing and invalidation messages."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._subscribers: list[Callable[[dict], None]] = []
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self._fetch_locks_guard = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._last_message_id = self._latest_message_id()
+        self._last_poll = 0.0
+        # Called with the key when a fetch fails; may return a stale entry to serve instead
+        self.fallback: Callable[[str], CacheEntry | None] | None = None
+
+    @property
+    def shared(self) -> bool:
+        return not isinstance(self.backend, MemoryBackend)
+
+    def _latest_message_id(self) -> int:
+        try:
+            messages = self.backend.read_messages(0)
+        except Exception as e:
+            logging.error("Cache: could not read invalidation log: %s", e)
+            return 0
+        return messages[-1]["id"] if messages else 0
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        self.poll_invalidations()
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logging.error("Cache get %s failed: %s", key, e)
+            return None
+        if entry is None:
+            metrics.inc('cache_misses_total', namespace=key.split(':', 1)[0])
+            return None
+        metrics.inc('cache_hits_total', namespace=key.split(':', 1)[0])
+        return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry.value
+
+    def get_stale_entry(self, key: str) -> CacheEntry | None:
+        """The entry for key even if its TTL ran out, as long as that was under STALE_KEEP seconds ago."""
+        try:
+            return self.backend.get_stale(key)
+        except Exception as e:
+            logging.error("Cache get %s failed: %s", key, e)
+            return None
+
+    def set(self, key: str, value: Any, ttl: float, stored_at: float | None = None) -> CacheEntry:
+        entry = CacheEntry(value=value, stored_at=time.time() if stored_at is None else stored_at)
+        try:
+            self.backend.set(key, entry, ttl)
+        except Exception as e:
+            logging.error("Cache set %s failed: %s", key, e)
+        return entry
+
+    def touch(self, key: str, ttl: float) -> bool:
+        """Give key's entry, live or stale, a new TTL without rewriting it; False if there is none."""
+        try:
+            return self.backend.touch(key, ttl)
+        except Exception as e:
+            logging.error("Cache touch %s failed: %s", key, e)
+            return False
+
+    def get_or_fetch(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling fetch() at most once across processes on a miss.
+
+        Exceptions from fetch propagate and nothing is cached.
+        """
+        return self.get_or_fetch_entry(key, ttl, fetch).value
+
+    def get_or_fetch_entry(self, key: str, ttl: float, fetch: Callable[[], Any]) -> CacheEntry:
+        """Like get_or_fetch, but also returns when the value was stored.
+
+        fetch may store the entry itself (e.g. with touch, for a payload the
+        upstream confirmed unchanged) and return that CacheEntry; it is then
+        returned as it is.
+        """
+        entry = self.get_entry(key)
+        if entry is not None:
+            return entry
+
+        with self._fetch_locks_guard:
+            local_lock = self._fetch_locks.setdefault(key, threading.Lock())
+        # Threads of this process queue up here; only the first one reaches the backend
+        with local_lock:
+            entry = self.get_entry(key)
+            if entry is not None:
+                return entry
+
+            deadline = time.monotonic() + FETCH_LOCK_TTL
+            locked = self.shared and self.try_lock(key)
+            while self.shared and not locked:
+                # Another process is fetching: wait for its result rather than fetching twice
+                time.sleep(FETCH_WAIT_INTERVAL)
+                entry = self.get_entry(key)
+                if entry is not None:
+                    metrics.inc('cache_coalesced_total', namespace=key.split(':', 1)[0])
+                    return entry
+                if time.monotonic() > deadline:
+                    break  # fetch without the lock; it still belongs to the other process
+                locked = self.try_lock(key)
+
+            try:
+                try:
+                    value = fetch()
+                except Exception:
+                    entry = self.fallback(key) if self.fallback is not None else None
+                    if entry is None:
+                        raise
+                    metrics.inc('cache_degraded_total', namespace=key.split(':', 1)[0])
+                    logging.warning("Cache: fetch for %s failed, serving data stored at %.0f", key, entry.stored_at)
+                    return entry
+                metrics.inc('cache_fetches_total', namespace=key.split(':', 1)[0])
+                if isinstance(value, CacheEntry):
+                    return value
+                return self.set(key, value, ttl)
+            finally:
+                if locked:
+                    self.unlock(key)
+
+    def try_lock(self, key: str, ttl: float = FETCH_LOCK_TTL) -> bool:
+        """Take a lock shared by every process using the backend; True if we got it."""
+        try:
+            return self.backend.acquire_lock(key, ttl)
+        except Exception as e:
+            logging.error("Cache lock %s failed: %s", key, e)
+            return True  # fall back to fetching ourselves
+
+    def unlock(self, key: str) -> None:
+        try:
+            self.backend.release_lock(key)
+        except Exception as e:
+            logging.error("Cache unlock %s failed: %s", key, e)
+
+    def dump(self, prefixes: tuple[str, ...]) -> list[dict]:
+        """Every live entry under the given prefixes as {"k", "v", "t", "e"} (key, value, stored_at, expires_at)."""
+        entries = []
+        for prefix in prefixes:
+            for key, entry, expires_at in self.backend.scan(prefix):
+                entries.append({"k": key, "v": entry.value, "t": entry.stored_at, "e": expires_at})
+        return entries
+
+    def restore(self, key: str, value: Any, stored_at: float, ttl: float) -> bool:
+        """Store a previously dumped value unless the key already holds something newer."""
+        try:
+            if self.backend.get(key) is not None:
+                return False
+            self.backend.set(key, CacheEntry(value=value, stored_at=stored_at), ttl)
+            return True
+        except Exception as e:
+            logging.error("Cache restore %s failed: %s", key, e)
+            return False
+
+    def invalidate(self, prefix: str) -> None:
+        """Drop every key starting with prefix in all processes and publish an invalidation message."""
+        try:
+            self.backend.delete_prefix(prefix)
+            self.backend.publish({"prefix": prefix, "origin": f"{socket.gethostname()}:{os.getpid()}", "at": time.time()})
+        except Exception as e:
+            logging.error("Cache invalidate %s failed: %s", prefix, e)
+        self.poll_invalidations(force=True)
+
+    def subscribe(self, callback: Callable[[dict], None]) -> None:
+        """Call callback(message) for every invalidation message, from any process."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def poll_invalidations(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_poll < INVALIDATION_POLL_INTERVAL:
+            return
+        if not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_poll = now
+            try:
+                messages = self.backend.read_messages(self._last_message_id)
+            except Exception as e:
+                logging.error("Cache: could not read invalidation log: %s", e)
+                return
+            for message in messages:
+                self._last_message_id = message["id"]
+                for callback in list(self._subscribers):
+                    try:
+                        callback(message)
+                    except Exception as e:
+                        logging.error("Cache invalidation subscriber failed: %s", e)
+        finally:
+            self._poll_lock.release()
+
+
+def create_backend(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme in ('', 'memory'):
+        return MemoryBackend()
+    if parsed.scheme == 'sqlite':
+        # sqlite:///relative.db and sqlite:////absolute/path.db, like SQLAlchemy
+        path = parsed.path[1:] if parsed.path.startswith('/') else parsed.path
+        return SQLiteBackend(path or 'cache.db')
+    if parsed.scheme == 'redis':
+        db = int(parsed.path.lstrip('/') or 0)
+        return RedisBackend(parsed.hostname or 'localhost', parsed.port or 6379, db=db, password=parsed.password)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {parsed.scheme}")
+
+
+cache = Cache(create_backend(CACHE_URL))
@@ -0,0 +1,81 @@
+"""Discord embed size limits: measuring and trimming embeds to fit a message.
+
+Discord rejects a message with HTTP 400 when any embed part is over its
+limit or when all its embeds together hold more than MESSAGE_TOTAL
+characters. The total counts the title, description, field names and
+values, footer text and author name, exactly as ``len(embed)`` does.
+
+- ``fit_text`` trims text at a line or word boundary.
+- ``share_budget`` splits a character budget fairly among texts that
+  compete for it. Short texts keep all they have; long ones share the rest
+  equally.
+- ``shrink_embed`` trims one embed's longest parts until it fits a size.
+"""
+import discord
+
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FOOTER_LIMIT = 2048
+MESSAGE_TOTAL = 6000
+
+ELLIPSIS = "…"
+# Trimming below this many characters leaves nothing worth reading
+MIN_TRIMMED = 40
+
+
+def fit_text(text: str, limit: int, suffix: str = ELLIPSIS) -> str:
+    """text if it fits in limit characters, else cut at the last line or word break and suffixed."""
+    if len(text) <= limit:
+        return text
+    if limit <= len(suffix):
+        return text[:max(0, limit)]
+    cut = text[:limit - len(suffix)]
+    # Prefer a line break, then a space, as long as that keeps most of the text
+    for sep in ("\n", " "):
+        at = cut.rfind(sep)
+        if at >= len(cut) * 2 // 3:
+            cut = cut[:at]
+            break
+    return cut.rstrip() + suffix
+
+
+def share_budget(lengths: list[int], budget: int) -> list[int]:
+    """How many characters each text may keep so the total stays within budget.
+
+    Texts that fit under the common cap keep their full length; the cap is
+    the largest one that spends no more than budget.
+    """
+    budget = max(0, budget)
+    if sum(lengths) <= budget:
+        return list(lengths)
+    remaining, left = budget, len(lengths)
+    cap = 0
+    for length in sorted(lengths):
+        share = remaining // left
+        if length > share:
+            cap = share
+            break
+        remaining -= length
+        left -= 1
+    return [min(length, cap) for length in lengths]
+
+
+def shrink_embed(embed: discord.Embed, max_size: int = MESSAGE_TOTAL) -> discord.Embed:
+    """Trim the embed's description and field values, longest first, until len(embed) <= max_size."""
+    excess = len(embed) - max_size
+    while excess > 0:
+        parts = [(len(embed.description or ''), None)]
+        parts += [(len(field.value), i) for i, field in enumerate(embed.fields)]
+        length, index = max(parts, key=lambda part: part[0])
+        if length <= MIN_TRIMMED:
+            break  # nothing left worth trimming; titles and names are already short
+        target = max(MIN_TRIMMED, length - excess)
+        if index is None:
+            embed.description = fit_text(embed.description, target)
+        else:
+            field = embed.fields[index]
+            embed.set_field_at(index, name=field.name, value=fit_text(field.value, target), inline=field.inline)
+        excess = len(embed) - max_size
+    return embed
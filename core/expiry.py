@@ -0,0 +1,114 @@
+"""Active-objective set maintained by a min-heap of end dates.
+
+The schedule is reloaded whenever the objectives cache is refilled. Between
+refills, ``run()`` sleeps until the earliest end date, drops whatever has
+ended from the active set, and passes the expired objectives to the callbacks
+registered with ``subscribe``. Readers just call ``active()``.
+"""
+import time
+import heapq
+import asyncio
+import logging
+import threading
+from typing import Callable
+
+from core import metrics
+from core.models import Objective
+
+# Upper bound on one sleep, so a suspended host or clock jump is caught up quickly
+MAX_SLEEP = 300.0
+
+
+class ExpirySchedule:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap: list[tuple[float, int]] = []
+        self._active: list[Objective] = []
+        self._active_ids: set[int] = set()
+        self._subscribers: list[Callable[[list[Objective]], None]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def load(self, objectives: list[Objective], now: float | None = None) -> None:
+        """Replace the schedule with a freshly fetched list (kept in the given order)."""
+        now = time.time() if now is None else now
+        active = [o for o in objectives if o.enddate is None or o.enddate.timestamp() > now]
+        heap = [(o.enddate.timestamp(), o.id) for o in active if o.enddate is not None and o.id is not None]
+        heapq.heapify(heap)
+        with self._lock:
+            self._active = active
+            self._active_ids = {o.id for o in active if o.id is not None}
+            self._heap = heap
+        self._wake()
+
+    def active(self) -> list[Objective]:
+        """Objectives that have not ended, in load order."""
+        return self._active
+
+    def is_active(self, objective_id: int) -> bool:
+        return objective_id in self._active_ids
+
+    def next_expiry(self) -> float | None:
+        """Unix time of the earliest scheduled end date."""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def expire_due(self, now: float | None = None) -> list[Objective]:
+        """Drop every objective whose end date has passed and notify subscribers."""
+        now = time.time() if now is None else now
+        expired_ids: set[int] = set()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, objective_id = heapq.heappop(self._heap)
+                if objective_id in self._active_ids:
+                    expired_ids.add(objective_id)
+            if not expired_ids:
+                return []
+            expired = [o for o in self._active if o.id in expired_ids]
+            # Swap in new containers so readers iterating the old ones are unaffected
+            self._active = [o for o in self._active if o.id not in expired_ids]
+            self._active_ids = self._active_ids - expired_ids
+
+        metrics.inc('objectives_expired_total', len(expired))
+        logging.info("Objectives expired: %s", ', '.join(str(o.id) for o in expired))
+        for callback in list(self._subscribers):
+            try:
+                callback(expired)
+            except Exception as e:
+                logging.error("Objective expiry subscriber failed: %s", e)
+        return expired
+
+    def subscribe(self, callback: Callable[[list[Objective]], None]) -> None:
+        """Call callback(expired_objectives) from the event loop when objectives end."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[list[Objective]], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _wake(self) -> None:
+        # load() runs in fetch threads; the timer task lives on the event loop
+        if self._loop is not None and self._wakeup is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self) -> None:
+        """Expire objectives as their end dates pass; run as a task for the life of the bot."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                self._wakeup.clear()
+                self.expire_due()
+                next_at = self.next_expiry()
+                timeout = MAX_SLEEP if next_at is None else min(MAX_SLEEP, max(0.0, next_at - time.time()))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+            self._wakeup = None
+
+
+objective_expiry = ExpirySchedule()
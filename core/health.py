@@ -0,0 +1,136 @@
+"""Liveness and readiness reporting for container orchestration.
+
+``LoopMonitor`` runs on the bot's event loop. Every LOOP_BEAT_INTERVAL
+seconds it measures how late its own wake-up was (the loop lag) and records
+a snapshot of the gateway state.
+
+``start_health_server`` answers HTTP from a separate thread. A wedged or
+starved loop therefore still gets a response: non-200, rather than a
+timeout.
+
+- ``GET /healthz``: liveness. Returns 503 when the loop has missed its beats
+  or lags beyond LOOP_LAG_UNHEALTHY.
+- ``GET /readyz``: readiness. Also requires the gateway to be connected and
+  the warm-up to be finished.
+- ``GET /metrics``: the metrics registry in Prometheus text format.
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable
+
+from core import metrics
+from core.breaker import all_breakers
+from core.cache import cache
+from core.warmup import is_ready as warmup_ready, status as warmup_status
+
+HEALTH_HOST = os.getenv('HEALTH_HOST', '0.0.0.0')
+HEALTH_PORT = int(os.getenv('HEALTH_PORT', '8081'))  # '0' disables the server
+
+LOOP_BEAT_INTERVAL = 1.0
+# Loop lag (seconds) above which the process reports itself unhealthy
+LOOP_LAG_UNHEALTHY = 5.0
+# No beat for this long means the loop is blocked outright
+LOOP_STALL_TIMEOUT = 10.0
+
+
+class LoopMonitor:
+    """Measures event-loop lag and snapshots gateway state from inside the loop."""
+
+    def __init__(self, gateway_state: Callable[[], dict] | None = None):
+        self.gateway_state = gateway_state
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.last_beat: float | None = None
+        self.gateway: dict | None = None
+
+    async def run(self) -> None:
+        """Beat forever; run as a task for the life of the process."""
+        while True:
+            expected = time.monotonic() + LOOP_BEAT_INTERVAL
+            await asyncio.sleep(LOOP_BEAT_INTERVAL)
+            now = time.monotonic()
+            self.lag = max(0.0, now - expected)
+            self.max_lag = max(self.max_lag, self.lag)
+            self.last_beat = now
+            metrics.set_gauge('event_loop_lag_seconds', round(self.lag, 4))
+            if self.gateway_state is not None:
+                try:
+                    self.gateway = self.gateway_state()
+                except Exception as e:
+                    logging.error("Health: could not read gateway state: %s", e)
+
+    def loop_report(self) -> dict:
+        since_beat = None if self.last_beat is None else time.monotonic() - self.last_beat
+        # A blocked loop can't update self.lag, so the time since its last beat counts too
+        lag = max(self.lag, (since_beat or 0.0) - LOOP_BEAT_INTERVAL)
+        starved = lag > LOOP_LAG_UNHEALTHY or (since_beat is not None and since_beat > LOOP_STALL_TIMEOUT)
+        return {
+            "lag_seconds": round(lag, 4),
+            "max_lag_seconds": round(self.max_lag, 4),
+            "seconds_since_beat": None if since_beat is None else round(since_beat, 3),
+            "starved": starved,
+        }
+
+
+def report(monitor: LoopMonitor) -> tuple[bool, bool, dict]:
+    """(healthy, ready, body) for the current process."""
+    loop = monitor.loop_report()
+    gateway = monitor.gateway
+    upstreams = all_breakers()
+    body = {
+        "pid": os.getpid(),
+        "uptime_seconds": metrics.snapshot()["uptime_seconds"],
+        "loop": loop,
+        "gateway": gateway,
+        "cache": {
+            "backend": type(cache.backend).__name__,
+            "warm": warmup_ready(),
+            "warmup": warmup_status(),
+        },
+        "upstreams": upstreams,
+    }
+    healthy = not loop["starved"]
+    gateway_ok = gateway is None or gateway.get("connected", False)
+    ready = healthy and warmup_ready() and gateway_ok and monitor.last_beat is not None
+    body["status"] = "ok" if ready else ("starting" if healthy else "unhealthy")
+    return healthy, ready, body
+
+
+def start_health_server(monitor: LoopMonitor, host: str = HEALTH_HOST, port: int = HEALTH_PORT) -> ThreadingHTTPServer | None:
+    """Serve /healthz, /readyz and /metrics from a daemon thread."""
+    if not port:
+        return None
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._send(200, metrics.render_text().encode(), 'text/plain; version=0.0.4')
+                return
+            if self.path not in ('/healthz', '/readyz'):
+                self._send(404, b'not found', 'text/plain')
+                return
+            healthy, ready, body = report(monitor)
+            ok = healthy if self.path == '/healthz' else ready
+            self._send(200 if ok else 503, json.dumps(body).encode(), 'application/json')
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # probes hit this every few seconds
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='health-server', daemon=True).start()
+    logging.info("Health server listening on %s:%s", host, port)
+    return server
+
@@ -0,0 +1,99 @@
+import math
+import os
+
+import discord
+
+from core.models import Objective
+
+OFFICER_ROLE = os.getenv('OFFICER_ROLE', 'Comrade [Veteran]')
+
+# Target type registry. category feeds /fight, /haul and /explore; bucket is
+# the matching key in the /buckets response; color/icon style the embeds.
+TARGET_TYPES_LIST = [
+    {"value": "visit",       "label": "Visit",           "category": "explore", "color": discord.Color.blurple(),  "icon": "🛸", "bucket": None},
+    {"value": "inf",         "label": "Influence",       "category": "explore", "color": discord.Color.red(),      "icon": "📈", "bucket": "missions"},
+    {"value": "bv",          "label": "Bounty Vouchers", "category": "fight",   "color": discord.Color.gold(),     "icon": "💰", "bucket": "bounty"},
+    {"value": "cb",          "label": "Combat Bonds",    "category": "fight",   "color": discord.Color.orange(),   "icon": "🎯", "bucket": None},
+    {"value": "expl",        "label": "Exploration",     "category": "explore", "color": discord.Color.purple(),   "icon": "🔭", "bucket": "exploration"},
+    {"value": "trade_prof",  "label": "Trade Profit",    "category": "haul",    "color": discord.Color.green(),    "icon": "📦", "bucket": "trade"},
+    {"value": "ground_cz",   "label": "Ground CZ",       "category": "fight",   "color": discord.Color.blue(),     "icon": "⚔️", "bucket": None},
+    {"value": "space_cz",    "label": "Space CZ",        "category": "fight",   "color": discord.Color.blue(),     "icon": "🚀", "bucket": None},
+    {"value": "murder",      "label": "Murder",          "category": "fight",   "color": discord.Color.dark_red(), "icon": "💀", "bucket": None},
+    {"value": "mission_fail","label": "Mission Fail",    "category": None,      "color": discord.Color.greyple(),  "icon": "❌", "bucket": None},
+]
+# Reported by the backend but not offered when creating targets
+EXTRA_TARGET_TYPES = [
+    {"value": "bm_prof",     "label": "Black Market Profit", "category": "haul", "color": discord.Color.greyple(), "icon": "🎯", "bucket": None},
+]
+TARGET_TYPES = {t["value"]: t for t in TARGET_TYPES_LIST + EXTRA_TARGET_TYPES}
+VALID_TARGET_TYPES = {t["value"] for t in TARGET_TYPES_LIST}
+TARGET_LABEL_MAP = {t["value"]: t["label"] for t in TARGET_TYPES_LIST}
+TARGET_CATEGORY_MAP = {value: t["category"] for value, t in TARGET_TYPES.items() if t["category"]}
+ACTIVITY_CATEGORIES = ("fight", "haul", "explore")
+
+# Objective types scored by the BGS activity buckets (see /buckets)
+BGS_BIN_TYPES = {'boost', 'expand', 'reduce', 'equalise', 'retreat'}
+
+# Maps objective target type -> bucket key in the /buckets response
+BUCKET_TARGET_MAP = {value: t["bucket"] for value, t in TARGET_TYPES.items() if t["bucket"]}
+
+
+def calculate_distance(coords1, coords2):
+    """Calculate Euclidean distance between two coordinate sets in 3D space"""
+    dx = coords2['x'] - coords1['x']
+    dy = coords2['y'] - coords1['y']
+    dz = coords2['z'] - coords1['z']
+    return math.sqrt(dx*dx + dy*dy + dz*dz)
+
+
+def get_objective_color(obj: Objective) -> discord.Color:
+    """Get embed color based on the objective's primary target type"""
+    target_type = TARGET_TYPES.get(obj.primary_type)
+    return target_type["color"] if target_type else discord.Color.greyple()
+
+
+def get_target_icon(target_type: str) -> str:
+    """Return emoji for target type"""
+    entry = TARGET_TYPES.get(target_type.lower())
+    return entry["icon"] if entry else '🎯'
+
+
+def truncate_field_value(value: str, max_length: int = 1024) -> tuple[str, bool]:
+    """Truncate a field value to Discord's character limit.
+
+    Returns: (truncated_value, was_truncated)
+    """
+    if len(value) <= max_length:
+        return value, False
+
+    # Truncate and add ellipsis
+    truncated = value[:max_length - 4] + "..."
+    return truncated, True
+
+
+def has_officer_role(member: discord.Member) -> bool:
+    """Check if the member has the required role to create/manage objectives."""
+    return any(role.name == OFFICER_ROLE for role in member.roles)
+
+
+def parse_credits(text: str) -> float:
+    """Parse a credit amount such as "50M", "1.5b", "400k" or "250000"."""
+    text = text.strip().lower().replace(',', '').replace('cr', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    value = float(text) * multiplier
+    if value < 0:
+        raise ValueError(f"negative amount: {text}")
+    return value
+
+
+def fmt_credits(value: float) -> str:
+    """Format a credit value as a human-readable string (1.5M, 400K …)."""
+    if value >= 1_000_000_000:
+        return f"{value / 1_000_000_000:.1f}B"
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 1_000:
+        return f"{value / 1_000:.0f}K"
+    return str(int(value))
@@ -0,0 +1,106 @@
+"""Background jobs for slow backend operations.
+
+``run_job`` is the cog-facing entry point. It sends an immediate "working
+on it" followup and starts the job on a worker thread. The command callback
+then returns. When the job finishes, the followup is edited to show the
+result.
+
+Jobs are deduplicated by key. A second submission of a job that is still
+running does not start another one: its followup is edited with the result
+of the job already in flight. With a shared cache backend, a key lock also
+keeps two processes from running the same job at once.
+"""
+import time
+import asyncio
+import logging
+from typing import Callable
+
+import discord
+import requests
+
+from core import metrics
+from core.cache import cache
+from core.outbound import outbound, interaction_route, send_followup
+
+# How long a job may hold its cross-process lock
+JOB_LOCK_TTL = 120.0
+
+
+class JobQueue:
+    def __init__(self):
+        self._jobs: dict[str, asyncio.Task] = {}
+        self._followups: set[asyncio.Task] = set()
+
+    def running(self) -> list[str]:
+        return [key for key, task in self._jobs.items() if not task.done()]
+
+    def submit(self, key: str, func: Callable[..., str], *args) -> tuple[asyncio.Task, bool]:
+        """Start func(*args) on a thread unless a job with this key is in flight.
+
+        Returns the job's task, which resolves to func's result text, and whether it was newly started.
+        """
+        task = self._jobs.get(key)
+        if task is not None and not task.done():
+            metrics.inc('jobs_deduplicated_total', job=key.split(':', 1)[0])
+            return task, False
+        task = asyncio.create_task(self._run(key, func, args))
+        self._jobs[key] = task
+        return task, True
+
+    async def _run(self, key: str, func: Callable[..., str], args: tuple) -> str:
+        job = key.split(':', 1)[0]
+        metrics.set_gauge('jobs_running', len(self.running()))
+        started = time.perf_counter()
+        locked = False
+        try:
+            if cache.shared:
+                locked = await asyncio.to_thread(cache.try_lock, f"job:{key}", JOB_LOCK_TTL)
+                if not locked:
+                    metrics.inc('jobs_deduplicated_total', job=job)
+                    return "⏳ This is already running on another shard. Try again in a minute if you don't see the result."
+            result = await asyncio.to_thread(func, *args)
+            metrics.inc('jobs_total', job=job, outcome='ok')
+            return result
+        except requests.RequestException as e:
+            metrics.inc('jobs_total', job=job, outcome='error')
+            return f"❌ Error connecting to backend: {e}"
+        except Exception as e:
+            metrics.inc('jobs_total', job=job, outcome='error')
+            logging.exception("Job %s failed", key)
+            return f"❌ Error: {e}"
+        finally:
+            if locked:
+                await asyncio.to_thread(cache.unlock, f"job:{key}")
+            if self._jobs.get(key) is asyncio.current_task():
+                del self._jobs[key]
+            metrics.set_gauge('jobs_running', len(self.running()))
+            logging.info("Job %s finished in %.1f s", key, time.perf_counter() - started)
+
+    async def run_job(
+        self,
+        interaction: discord.Interaction,
+        key: str,
+        func: Callable[..., str],
+        *args,
+        pending: str,
+        ephemeral: bool = True,
+    ) -> None:
+        """Acknowledge the (deferred) interaction now and edit the acknowledgment with the job's result."""
+        task, started = self.submit(key, func, *args)
+        if not started:
+            pending = f"{pending}\n_Already in progress; this message will update when it finishes._"
+        message = await send_followup(interaction, content=pending, ephemeral=ephemeral, wait=True)
+        followup = asyncio.create_task(self._edit_when_done(interaction_route(interaction), message, task))
+        self._followups.add(followup)
+        followup.add_done_callback(self._followups.discard)
+
+    @staticmethod
+    async def _edit_when_done(route: str, message: discord.WebhookMessage, task: asyncio.Task) -> None:
+        result = await asyncio.shield(task)
+        try:
+            await outbound.send(route, lambda: message.edit(content=result))
+        except discord.HTTPException as e:
+            logging.error("Could not post job result: %s", e)
+
+
+jobs = JobQueue()
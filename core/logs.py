@@ -0,0 +1,175 @@
+"""Non-blocking, structured logging.
+
+``setup_logging()`` sends every record through a queue. A background
+listener thread formats and writes it, so a log call on the event loop
+costs one ``queue.put``. By default the output is one JSON object per line
+(LOG_FORMAT=json). LOG_FORMAT=text gives plain lines for local runs.
+
+Records pick up the current interaction context (``bind_interaction``):
+command name, interaction, guild and user ids. Calls through a circuit
+breaker add ``upstream`` and ``elapsed_ms``. Any keyword passed in
+``extra=`` becomes a JSON field.
+
+Repeated warnings and errors are rate limited per call site. At most
+LOG_BURST of them pass per LOG_RATE_WINDOW seconds. The next record that
+passes reports how many were suppressed.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+import logging.handlers
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_RATE_WINDOW = 60.0
+LOG_BURST = 5
+
+# Per-interaction context, copied into every record logged while handling it
+log_context: contextvars.ContextVar[dict | None] = contextvars.ContextVar('log_context', default=None)
+
+# Context keys copied onto each record
+CONTEXT_FIELDS = ("command", "interaction_id", "guild_id", "user_id")
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def bind_interaction(interaction) -> dict:
+    """Attach an interaction's identifiers to all logging in the current task."""
+    command = getattr(interaction, 'command', None)
+    context = {
+        "command": getattr(command, 'qualified_name', None),
+        "interaction_id": str(interaction.id),
+        "guild_id": str(interaction.guild_id) if interaction.guild_id else None,
+        "user_id": str(interaction.user.id) if interaction.user else None,
+        "upstream_ms": {},
+    }
+    log_context.set(context)
+    return context
+
+
+def record_upstream(upstream: str, elapsed_ms: float) -> None:
+    """Add an upstream call's duration to the current interaction's totals."""
+    context = log_context.get()
+    if context is not None:
+        # Shared dict: asyncio.to_thread copies the context, not its contents
+        timings = context["upstream_ms"]
+        timings[upstream] = round(timings.get(upstream, 0) + elapsed_ms, 1)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = log_context.get()
+        if context is not None:
+            for key in CONTEXT_FIELDS:
+                value = context.get(key)
+                if value is not None and not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most `burst` WARNING+ records per call site per `window` seconds."""
+
+    def __init__(self, window: float = LOG_RATE_WINDOW, burst: int = LOG_BURST):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._sites: dict[tuple, list] = {}  # site -> [window_start, passed, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        site = (record.name, record.pathname, record.lineno, record.levelno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._sites[site] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS and not k.startswith('_')}
+        if extras:
+            line += '  ' + ' '.join(f"{k}={v}" for k, v in extras.items())
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may change after we return) but leave formatting to the writer
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Route the root logger through a queue to a background writer thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    # Filters run in the caller's thread (they need its context) and drop records before they are queued
+    queue_handler.addFilter(RateLimitFilter())
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,73 @@
+"""In-process metrics registry.
+
+Counters and gauges are keyed by name plus a sorted tuple of label pairs, so
+``set_gauge('shard_latency_seconds', 0.1, shard=0)`` and the same call with
+``shard=1`` are separate series. Everything here is process-local; each shard
+cluster or worker process reports its own series.
+"""
+import threading
+import time
+
+_lock = threading.Lock()
+_counters: dict[tuple[str, tuple], float] = {}
+_gauges: dict[tuple[str, tuple], float] = {}
+_started_at = time.time()
+
+
+def _key(name: str, labels: dict) -> tuple[str, tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    """Increment a counter series."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    """Set a gauge series to an absolute value."""
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def clear_gauge(name: str) -> None:
+    """Drop every series of a gauge, e.g. before re-reporting the current shard set."""
+    with _lock:
+        for key in [k for k in _gauges if k[0] == name]:
+            del _gauges[key]
+
+
+def get(name: str, **labels) -> float | None:
+    """Return the current value of a counter or gauge series, if any."""
+    key = _key(name, labels)
+    with _lock:
+        if key in _gauges:
+            return _gauges[key]
+        return _counters.get(key)
+
+
+def snapshot() -> dict:
+    """Return ``{'counters': [...], 'gauges': [...]}`` with one dict per series."""
+    with _lock:
+        counters = list(_counters.items())
+        gauges = list(_gauges.items())
+    return {
+        "uptime_seconds": round(time.time() - _started_at, 1),
+        "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in counters],
+        "gauges": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in gauges],
+    }
+
+
+def render_text() -> str:
+    """Render all series in the Prometheus text exposition format."""
+    lines = []
+    snap = snapshot()
+    for kind in ("counters", "gauges"):
+        for series in sorted(snap[kind], key=lambda s: (s["name"], sorted(s["labels"].items()))):
+            labels = ",".join(f'{k}="{v}"' for k, v in sorted(series["labels"].items()))
+            name = f"sinistra_{series['name']}"
+            lines.append(f"{name}{{{labels}}} {series['value']}" if labels else f"{name} {series['value']}")
+    lines.append(f"sinistra_uptime_seconds {snap['uptime_seconds']}")
+    return "\n".join(lines) + "\n"
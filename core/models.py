@@ -0,0 +1,400 @@
+"""Typed views over backend payloads.
+
+Objectives, colonies and buckets are parsed once per cache fill into slotted
+dataclasses, so commands read attributes instead of chaining ``.get()`` calls
+and re-parsing dates for every render.
+
+The backend is mid-migration from Flask to Effect: Flask sends lowercase keys
+(``targetoverall``, ``startdate``) and Effect sends camelCase
+(``targetOverall``, ``startDate``). ``_field`` accepts either, so the rest of
+the bot never sees the difference.
+"""
+import re
+import sys
+import math
+import heapq
+import difflib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+
+def _field(data: dict, *names: str, default: Any = None) -> Any:
+    """First non-None value among the given key spellings."""
+    for name in names:
+        value = data.get(name)
+        if value is not None:
+            return value
+    return default
+
+
+def _text(data: dict, *names: str, default: str = '') -> str:
+    value = _field(data, *names, default=default)
+    return sys.intern(str(value).strip()) if value else default
+
+
+def _kind(data: dict, *names: str) -> str:
+    """Lowercased, interned type code ('space_cz', 'boost', ...)."""
+    return sys.intern(str(_field(data, *names, default='')).strip().lower())
+
+
+def _number(data: dict, *names: str, default: float = 0) -> float:
+    value = _field(data, *names, default=default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _int(data: dict, *names: str, default: int = 0) -> int:
+    return int(_number(data, *names, default=default))
+
+
+def _optional_number(data: dict, *names: str) -> float | None:
+    value = _field(data, *names)
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    """Parse an ISO timestamp ('...Z' or offset) as an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _items(payload: Any, *keys: str) -> list:
+    """The list of records in a payload, whether bare or wrapped ({'data': [...]})."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in keys + ('data', 'items'):
+            value = payload.get(key)
+            if isinstance(value, list):
+                return value
+    return []
+
+
+@dataclass(slots=True)
+class ProgressDetail:
+    overall: float = 0
+    percentage: float = 0
+    cmdr_count: int = 0
+
+    @classmethod
+    def from_api(cls, target: dict) -> 'ProgressDetail':
+        detail = _field(target, 'progressDetail', 'progress_detail') or {}
+        if not isinstance(detail, dict) or not detail:
+            # Older backends only send a flat progress number
+            return cls(overall=_number(target, 'progress'))
+        return cls(
+            overall=_number(detail, 'overallProgress', 'overallprogress'),
+            percentage=_number(detail, 'overallPercentage', 'overallpercentage'),
+            cmdr_count=len(_field(detail, 'cmdrProgress', 'cmdrprogress', default=[])),
+        )
+
+
+@dataclass(slots=True)
+class Target:
+    type: str  # lowercase code, matches TARGET_TYPES_LIST values
+    system: str = ''
+    station: str = ''
+    faction: str = ''
+    target_overall: float = 0
+    target_individual: float = 0
+    progress: ProgressDetail = field(default_factory=ProgressDetail)
+
+    @property
+    def code(self) -> str:
+        """Uppercase type code as shown in embeds ('SPACE_CZ')."""
+        return self.type.upper()
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Target':
+        return cls(
+            type=_kind(data, 'type'),
+            system=_text(data, 'system'),
+            station=_text(data, 'station'),
+            faction=_text(data, 'faction'),
+            target_overall=_number(data, 'targetoverall', 'targetOverall'),
+            target_individual=_number(data, 'targetindividual', 'targetIndividual'),
+            progress=ProgressDetail.from_api(data),
+        )
+
+
+@dataclass(slots=True)
+class Objective:
+    id: int | None
+    title: str = 'Unnamed'
+    type: str = ''  # lowercase objective kind ('boost', 'expand', ...)
+    system: str = ''
+    faction: str = ''
+    description: str = ''
+    priority: int = 0
+    startdate: datetime | None = None
+    enddate: datetime | None = None
+    targets: tuple[Target, ...] = ()
+
+    @property
+    def primary_type(self) -> str:
+        return self.targets[0].type if self.targets else ''
+
+    def is_active(self, now: datetime | None = None) -> bool:
+        if self.enddate is None:
+            return True
+        return self.enddate > (now or datetime.now(timezone.utc))
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Objective':
+        obj_id = _field(data, 'id')
+        return cls(
+            id=int(obj_id) if obj_id is not None else None,
+            title=_text(data, 'title', default='Unnamed'),
+            type=_kind(data, 'type'),
+            system=_text(data, 'system'),
+            faction=_text(data, 'faction'),
+            description=str(_field(data, 'description', default='')),
+            priority=_int(data, 'priority'),
+            startdate=parse_datetime(_field(data, 'startdate', 'startDate')),
+            enddate=parse_datetime(_field(data, 'enddate', 'endDate')),
+            targets=tuple(Target.from_api(t) for t in _field(data, 'targets', default=[])),
+        )
+
+
+@dataclass(slots=True)
+class Bucket:
+    pts: int = 0
+    remaining: float = 0
+
+    @classmethod
+    def from_api(cls, data: dict | None) -> 'Bucket':
+        data = data or {}
+        remaining = _number(data, 'remaining')
+        # Mission pluses are counted, not credits: keep whole numbers as ints for display
+        return cls(pts=_int(data, 'pts'), remaining=int(remaining) if remaining.is_integer() else remaining)
+
+
+@dataclass(slots=True)
+class BucketEntry:
+    system: str
+    faction: str
+    period: str = '—'
+    buckets: dict[str, Bucket] = field(default_factory=dict)
+    capped_pts: int = 0
+    pct_cap: float = 0
+    net_pts: int = 0
+    total_positive_pts: int = 0
+    total_negative_pts: int = 0
+    current_influence: float | None = None
+    predicted_influence_change: float | None = None
+    predicted_influence: float | None = None
+    population: int | None = None
+    faction_count: int | None = None
+    max_swing: float | None = None
+
+    def bucket(self, key: str) -> Bucket:
+        """The named bucket ('missions', 'trade', ...), empty if the backend omitted it."""
+        return self.buckets.get(key) or Bucket()
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'BucketEntry':
+        population = _optional_number(data, 'population')
+        faction_count = _optional_number(data, 'factionCount', 'factioncount')
+        return cls(
+            system=_text(data, 'system'),
+            faction=_text(data, 'faction'),
+            period=_text(data, 'period', default='—'),
+            buckets={sys.intern(k): Bucket.from_api(v) for k, v in (data.get('buckets') or {}).items()},
+            capped_pts=_int(data, 'cappedPts', 'cappedpts'),
+            pct_cap=_number(data, 'pctCap', 'pctcap'),
+            net_pts=_int(data, 'netPts', 'netpts'),
+            total_positive_pts=_int(data, 'totalPositivePts', 'totalpositivepts'),
+            total_negative_pts=_int(data, 'totalNegativePts', 'totalnegativepts'),
+            current_influence=_optional_number(data, 'currentInfluence', 'currentinfluence'),
+            predicted_influence_change=_optional_number(data, 'predictedInfluenceChange', 'predictedinfluencechange'),
+            predicted_influence=_optional_number(data, 'predictedInfluence', 'predictedinfluence'),
+            population=int(population) if population is not None else None,
+            faction_count=int(faction_count) if faction_count is not None else None,
+            max_swing=_optional_number(data, 'maxSwing', 'maxswing'),
+        )
+
+
+@dataclass(slots=True)
+class Colony:
+    system: str
+    cmdr: str = 'N/A'
+    priority: int = 0
+    raven_url: str = ''
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Colony':
+        return cls(
+            system=_text(data, 'starsystem', 'starSystem', 'system', default='Unknown'),
+            cmdr=_text(data, 'cmdr', default='N/A'),
+            priority=_int(data, 'priority'),
+            raven_url=_text(data, 'ravenurl', 'ravenUrl'),
+        )
+
+
+@dataclass(slots=True)
+class ObjectiveIndex:
+    """Objectives sorted by priority, with per-category id lists built once per cache fill."""
+    objectives: list[Objective] = field(default_factory=list)
+    by_id: dict[int, Objective] = field(default_factory=dict)
+    by_category: dict[str, tuple[int, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, objectives: list[Objective], categories: dict[str, str]) -> 'ObjectiveIndex':
+        """categories maps a target type to its activity category ('fight', 'haul', ...)."""
+        ordered = sorted(objectives, key=lambda o: o.priority, reverse=True)
+        by_category: dict[str, list[int]] = {}
+        for obj in ordered:
+            if obj.id is None:
+                continue
+            for category in dict.fromkeys(categories.get(t.type) for t in obj.targets):
+                if category:
+                    by_category.setdefault(category, []).append(obj.id)
+        return cls(
+            objectives=ordered,
+            by_id={obj.id: obj for obj in ordered if obj.id is not None},
+            by_category={category: tuple(ids) for category, ids in by_category.items()},
+        )
+
+    def in_category(self, category: str) -> list[Objective]:
+        """Objectives with at least one target in category, highest priority first."""
+        return [self.by_id[obj_id] for obj_id in self.by_category.get(category, ())]
+
+
+@dataclass(slots=True)
+class ColonyIndex:
+    """Priority colonies with their coordinates, resolved once per cache fill."""
+    colonies: list[Colony] = field(default_factory=list)  # highest priority first
+    coords: dict[str, tuple[float, float, float]] = field(default_factory=dict)  # by colony.system
+
+    @classmethod
+    def build(cls, colonies: list[Colony], coords: dict[str, dict]) -> 'ColonyIndex':
+        return cls(
+            colonies=sorted(colonies, key=lambda c: c.priority, reverse=True),
+            coords={name: (c['x'], c['y'], c['z']) for name, c in coords.items()},
+        )
+
+    def ranked(self, origin: dict | None, offset: int, limit: int) -> list[tuple[Colony, float | None]]:
+        """Colonies [offset, offset + limit) by distance from origin, or by priority without one.
+
+        Colonies with unknown coordinates rank after every located one.
+        """
+        if origin is None:
+            return [(c, None) for c in self.colonies[offset:offset + limit]]
+
+        point = (origin['x'], origin['y'], origin['z'])
+        located = [(math.dist(point, self.coords[c.system]), i) for i, c in enumerate(self.colonies) if c.system in self.coords]
+        nearest = heapq.nsmallest(offset + limit, located)
+        ranked = [(self.colonies[i], distance) for distance, i in nearest]
+        if len(ranked) < offset + limit:
+            ranked += [(c, None) for c in self.colonies if c.system not in self.coords]
+        return ranked[offset:offset + limit]
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, punctuation-free, single-spaced form used for name lookups."""
+    return ' '.join(re.sub(r'[^\w]+', ' ', name.lower()).split())
+
+
+@dataclass(slots=True)
+class BucketIndex:
+    """Every faction's bucket entry for one system and period, with a name index built once per cache fill."""
+    entries: list[BucketEntry] = field(default_factory=list)  # highest influence first
+    by_name: dict[str, int] = field(default_factory=dict)  # normalized faction name -> position
+    by_token: dict[str, tuple[int, ...]] = field(default_factory=dict)  # name word -> positions
+
+    @classmethod
+    def build(cls, entries: list[BucketEntry]) -> 'BucketIndex':
+        ordered = sorted(entries, key=lambda e: e.current_influence or 0, reverse=True)
+        by_name: dict[str, int] = {}
+        by_token: dict[str, list[int]] = {}
+        for i, entry in enumerate(ordered):
+            name = normalize_name(entry.faction)
+            by_name.setdefault(name, i)
+            for token in dict.fromkeys(name.split()):
+                by_token.setdefault(token, []).append(i)
+        return cls(
+            entries=ordered,
+            by_name=by_name,
+            by_token={token: tuple(positions) for token, positions in by_token.items()},
+        )
+
+    def match(self, faction: str) -> list[BucketEntry]:
+        """Entries matching a typed faction name, best tier only; more than one means it was ambiguous.
+
+        Tried in order: exact name, name prefix, every typed word starting a word
+        of the name (in any order), then close spellings.
+        """
+        query = normalize_name(faction)
+        if not query:
+            return []
+        if query in self.by_name:
+            return [self.entries[self.by_name[query]]]
+
+        prefixed = [i for name, i in self.by_name.items() if name.startswith(query)]
+        if prefixed:
+            return [self.entries[i] for i in sorted(prefixed)]
+
+        positions: set[int] | None = None
+        for word in query.split():
+            hits = {i for token, found in self.by_token.items() if token.startswith(word) for i in found}
+            positions = hits if positions is None else positions & hits
+            if not positions:
+                break
+        if positions:
+            return [self.entries[i] for i in sorted(positions)]
+
+        close = difflib.get_close_matches(query, self.by_name, n=3, cutoff=0.6)
+        return [self.entries[self.by_name[name]] for name in close]
+
+
+def _parse_all(model, records: list) -> list:
+    parsed = []
+    for record in records:
+        try:
+            parsed.append(model.from_api(record))
+        except Exception as e:
+            logging.error("Skipping malformed %s record: %s", model.__name__, e)
+    return parsed
+
+
+def parse_objectives(payload: Any) -> list[Objective]:
+    return _parse_all(Objective, _items(payload, 'objectives'))
+
+
+def merge_objectives_delta(previous: Any, delta: dict) -> list[dict]:
+    """Apply a since= delta ({'changed': [...], 'removed': [ids]}) to a full objectives payload.
+
+    Changed objectives replace the record with the same id in place; new ones are appended.
+    """
+    changed = {_field(o, 'id'): o for o in _items(delta, 'changed')}
+    removed = set(delta.get('removed') or ())
+    merged = []
+    for record in _items(previous, 'objectives'):
+        obj_id = _field(record, 'id')
+        if obj_id in removed:
+            continue
+        merged.append(changed.pop(obj_id, record))
+    merged.extend(o for obj_id, o in changed.items() if obj_id not in removed)
+    return merged
+
+
+def parse_bucket_entries(payload: Any) -> list[BucketEntry]:
+    return _parse_all(BucketEntry, _items(payload, 'buckets'))
+
+
+def parse_colonies(payload: Any) -> list[Colony]:
+    return _parse_all(Colony, _items(payload, 'colonies'))
@@ -0,0 +1,126 @@
+"""Known system, faction and commander names for slash-command autocomplete.
+
+Names are collected as data passes through core.api: objectives, colonies,
+bucket entries, resolved coordinates and commander lookups. Nothing is
+fetched for autocomplete itself, so a suggestion costs a couple of binary
+searches and stays far inside Discord's 3-second autocomplete window.
+
+Each ``NameIndex`` keeps a sorted list of (key, name) pairs. A name is
+keyed by its full normalised form and again from each later word, so
+"party" finds "Sol Workers' Party".
+"""
+import heapq
+import bisect
+import threading
+from typing import Iterable
+
+import discord
+from discord import app_commands
+
+from core.models import normalize_name
+
+# Discord shows at most 25 choices, each at most 100 characters
+MAX_CHOICES = 25
+MAX_CHOICE_LENGTH = 100
+
+
+class NameIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: list[tuple[str, str]] = []  # (key, display name), sorted
+        self._names: dict[str, str] = {}  # normalized name -> display name
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, names: Iterable[str | None]) -> int:
+        """Index names not seen before; returns how many were new."""
+        new = {}
+        for name in names:
+            if not name or len(name) > MAX_CHOICE_LENGTH:
+                continue
+            normalized = normalize_name(name)
+            if normalized and normalized not in self._names and normalized not in new:
+                new[normalized] = name
+        if not new:
+            return 0
+        with self._lock:
+            added = [(n, name) for n, name in new.items() if n not in self._names]
+            keys = [
+                (' '.join(words[i:]), name)
+                for normalized, name in added
+                for words in (normalized.split(),)
+                for i in range(len(words))
+            ]
+            if len(keys) > len(self._keys) // 8:
+                # A big batch (e.g. the first objectives fill): one merge beats many insorts
+                self._keys = sorted(self._keys + keys)
+            else:
+                for key in keys:
+                    bisect.insort(self._keys, key)
+            self._names.update(added)
+        return len(added)
+
+    def complete(self, prefix: str, limit: int = MAX_CHOICES) -> list[str]:
+        """Up to limit names with a word starting with prefix; names that start with it come first."""
+        query = normalize_name(prefix)
+        if not query:
+            with self._lock:
+                return heapq.nsmallest(limit, self._names.values(), key=str.lower)
+        starts, inner = [], []
+        seen = set()
+        with self._lock:
+            keys = self._keys
+            lo = bisect.bisect_left(keys, (query, ''))
+            # U+FFFF sorts after any character a name can contain
+            hi = bisect.bisect_right(keys, (query + '\uffff', ''))
+            for key, name in keys[lo:hi]:
+                if name in seen:
+                    continue
+                seen.add(name)
+                (starts if normalize_name(name) == key else inner).append(name)
+                if len(starts) >= limit:
+                    break
+        return (starts + inner)[:limit]
+
+
+systems = NameIndex()
+factions = NameIndex()
+cmdrs = NameIndex()
+
+# normalized system -> factions seen there, to narrow faction suggestions
+_system_factions: dict[str, set[str]] = {}
+_system_factions_lock = threading.Lock()
+
+
+def add_factions(system: str, names: Iterable[str]) -> None:
+    names = [n for n in names if n]
+    factions.add(names)
+    with _system_factions_lock:
+        _system_factions.setdefault(normalize_name(system), set()).update(names)
+
+
+def _choices(names: list[str]) -> list[app_commands.Choice[str]]:
+    return [app_commands.Choice(name=name, value=name) for name in names]
+
+
+async def system_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    return _choices(systems.complete(current))
+
+
+async def cmdr_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    return _choices(cmdrs.complete(current))
+
+
+async def faction_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    """Factions matching what was typed, those seen in the chosen system first."""
+    matches = factions.complete(current, limit=MAX_CHOICES * 4)
+    system = getattr(interaction.namespace, 'system', None)
+    if system:
+        with _system_factions_lock:
+            local = set(_system_factions.get(normalize_name(system), ()))
+        if not current.strip():
+            matches = sorted(local, key=str.lower) + [name for name in matches if name not in local]
+        else:
+            matches.sort(key=lambda name: name not in local)
+    return _choices(matches[:MAX_CHOICES])
@@ -0,0 +1,234 @@
+"""Outbound Discord send scheduler.
+
+Every send we care about pacing goes through ``outbound.send(route, func)``.
+A route is the rate-limit scope Discord applies to the call:
+
+- ``channel:<id>`` for channel messages, including board edits;
+- ``webhook:<application id>/<token>`` for an interaction's followups.
+
+Each route has its own queue and a worker that runs one send at a time,
+interactive sends before background ones. Before a send the worker waits
+out the route's window if Discord said it has no requests left.
+
+All routes also draw on one process-wide budget, sized under Discord's
+global limit of 50 requests per second. Interactive sends may spend all of
+it. Background sends (board edits) only go out while more than
+BACKGROUND_RESERVE tokens are left and no interactive send is queued, so
+a burst of board edits can never delay a command's reply. That comes
+from the X-RateLimit-Remaining / -Reset-After headers, read through an
+aiohttp trace hook on discord.py's HTTP session (``trace_config``).
+Bursts therefore queue here instead of turning into 429s and retries.
+
+Sends given a coalesce key replace a queued send with the same
+key, so only the latest edit of a message is made.
+
+Queue depth, sends and the total time sends spent queued are reported
+through core.metrics (outbound_*).
+"""
+import re
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+
+from core import metrics
+from core.admission import TokenBucket
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background'}
+
+# Process-wide budget shared by every route (Discord allows 50 requests/s per bot)
+GLOBAL_RATE, GLOBAL_BURST = 45.0, 45.0
+# Tokens background sends leave untouched for interactive ones
+BACKGROUND_RESERVE = 20.0
+# How often a background send waiting for the budget looks again
+BACKGROUND_POLL = 0.05
+
+# Route limits are forgotten once there are this many; an expired window holds nothing
+MAX_ROUTES = 10_000
+
+_ROUTE_RE = re.compile(r"/(channels|webhooks)/(\d+)(?:/([^/?]+))?")
+
+
+def route_from_url(url: str) -> str | None:
+    match = _ROUTE_RE.search(url)
+    if match is None:
+        return None
+    kind, first, second = match.groups()
+    if kind == 'channels':
+        return f"channel:{first}"
+    return f"webhook:{first}/{second}" if second else None
+
+
+def channel_route(channel_id: int) -> str:
+    return f"channel:{channel_id}"
+
+
+def interaction_route(interaction) -> str:
+    return f"webhook:{interaction.application_id}/{interaction.token}"
+
+
+async def send_followup(interaction, *args, **kwargs) -> Any:
+    """interaction.followup.send(*args, **kwargs), queued as an interactive send on the interaction's webhook."""
+    return await outbound.send(interaction_route(interaction), lambda: interaction.followup.send(*args, **kwargs))
+
+
+class _Send:
+    __slots__ = ('func', 'priority', 'coalesce', 'futures', 'queued_at')
+
+    def __init__(self, func: Callable[[], Awaitable[Any]], priority: int, coalesce: str | None):
+        self.func = func
+        self.priority = priority
+        self.coalesce = coalesce
+        self.futures: list[asyncio.Future] = []
+        self.queued_at = time.monotonic()
+
+
+class OutboundScheduler:
+    def __init__(self):
+        self._limits: dict[str, tuple[int, float]] = {}  # route -> (remaining, window reset, monotonic)
+        self._queues: dict[str, list[tuple[int, int, _Send]]] = {}
+        self._coalescing: dict[tuple[str, str], _Send] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._seq = itertools.count()
+        self._budget = TokenBucket(GLOBAL_RATE, GLOBAL_BURST, time.monotonic())
+        self._interactive_queued = 0
+
+    def observe(self, url: str, status: int, headers) -> None:
+        """Record the rate-limit state a Discord response reported for its route."""
+        route = route_from_url(url)
+        if route is None:
+            return
+        now = time.monotonic()
+        if status == 429:
+            metrics.inc('outbound_rate_limited_total', route=route.split(':', 1)[0])
+            retry_after = float(headers.get('Retry-After') or headers.get('X-RateLimit-Reset-After') or 1)
+            self._limits[route] = (0, now + retry_after)
+        elif 'X-RateLimit-Remaining' in headers:
+            try:
+                remaining = int(headers['X-RateLimit-Remaining'])
+                reset_after = float(headers.get('X-RateLimit-Reset-After', 0))
+            except ValueError:
+                return
+            self._limits[route] = (remaining, now + reset_after)
+        if len(self._limits) > MAX_ROUTES:
+            self._limits = {r: limit for r, limit in self._limits.items() if limit[1] > now}
+
+    def delay(self, route: str) -> float:
+        """Seconds before the route's next send may go out."""
+        remaining, reset_at = self._limits.get(route, (1, 0.0))
+        return max(0.0, reset_at - time.monotonic()) if remaining <= 0 else 0.0
+
+    def _budget_wait(self, priority: int) -> float:
+        """Seconds to wait before a send of this priority may spend a global token; 0 spends it."""
+        self._budget.refill(time.monotonic())
+        if priority == BACKGROUND:
+            if self._interactive_queued:
+                return BACKGROUND_POLL
+            floor = BACKGROUND_RESERVE + 1
+        else:
+            floor = 1.0
+        if self._budget.tokens < floor:
+            return max(self._budget.wait_time(floor), BACKGROUND_POLL if priority == BACKGROUND else 0.001)
+        self._budget.tokens -= 1
+        return 0.0
+
+    def depth(self) -> dict[str, int]:
+        """Queued sends by priority name."""
+        counts = {name: 0 for name in PRIORITY_NAMES.values()}
+        for queue in self._queues.values():
+            for priority, _, _ in queue:
+                counts[PRIORITY_NAMES[priority]] += 1
+        return counts
+
+    def _report_depth(self) -> None:
+        for name, count in self.depth().items():
+            metrics.set_gauge('outbound_queue_depth', count, priority=name)
+
+    async def send(
+        self,
+        route: str,
+        func: Callable[[], Awaitable[Any]],
+        priority: int = INTERACTIVE,
+        coalesce: str | None = None,
+    ) -> Any:
+        """Queue func() on route and return its result once it has run."""
+        future = asyncio.get_running_loop().create_future()
+        item = self._coalescing.get((route, coalesce)) if coalesce else None
+        if item is not None:
+            # A send with the same key is still queued: run only the newest one
+            item.func = func
+            metrics.inc('outbound_coalesced_total', priority=PRIORITY_NAMES[priority])
+        else:
+            item = _Send(func, priority, coalesce)
+            if priority == INTERACTIVE:
+                self._interactive_queued += 1
+            heapq.heappush(self._queues.setdefault(route, []), (priority, next(self._seq), item))
+            if coalesce:
+                self._coalescing[(route, coalesce)] = item
+            if route not in self._workers:
+                self._workers[route] = asyncio.create_task(self._drain(route))
+            self._report_depth()
+        item.futures.append(future)
+        return await future
+
+    async def _drain(self, route: str) -> None:
+        queue = self._queues[route]
+        try:
+            while queue:
+                wait = self.delay(route)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                # The head may change while waiting: an interactive send can arrive behind a background one
+                while (wait := self._budget_wait(queue[0][0])) > 0:
+                    await asyncio.sleep(wait)
+                _, _, item = heapq.heappop(queue)
+                if item.priority == INTERACTIVE:
+                    self._interactive_queued -= 1
+                if item.coalesce:
+                    self._coalescing.pop((route, item.coalesce), None)
+                self._report_depth()
+
+                name = PRIORITY_NAMES[item.priority]
+                metrics.inc('outbound_sends_total', priority=name)
+                metrics.inc('outbound_wait_seconds_total', time.monotonic() - item.queued_at, priority=name)
+                try:
+                    result = await item.func()
+                except Exception as e:
+                    for future in item.futures:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for future in item.futures:
+                        if not future.done():
+                            future.set_result(result)
+        finally:
+            # Only reached early on cancellation: nothing queued will run now
+            for _, _, item in queue:
+                if item.priority == INTERACTIVE:
+                    self._interactive_queued -= 1
+                if item.coalesce:
+                    self._coalescing.pop((route, item.coalesce), None)
+                for future in item.futures:
+                    future.cancel()
+            del self._queues[route]
+            del self._workers[route]
+            self._report_depth()
+
+
+outbound = OutboundScheduler()
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """An aiohttp trace hook that feeds Discord's rate-limit headers to ``outbound``; pass as http_trace."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_end(session, context, params: aiohttp.TraceRequestEndParams):
+        outbound.observe(str(params.url), params.response.status, params.response.headers)
+
+    trace.on_request_end.append(on_request_end)
+    return trace
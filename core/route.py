@@ -0,0 +1,79 @@
+"""Visiting order for a set of systems: nearest neighbour, then 2-opt.
+
+The route is an open path from a fixed start; there is no return leg. For
+the few dozen systems an objective list has, plain Python lists are fast
+enough: 50 stops plan in a few milliseconds, so there is no numpy dependency.
+"""
+import math
+from dataclasses import dataclass
+
+Coords = tuple[float, float, float]
+
+# Stop improving once a pass gains less than this many light-years
+MIN_GAIN = 1e-6
+MAX_PASSES = 50
+
+
+@dataclass(slots=True)
+class Route:
+    stops: list[str]      # systems in visiting order, start excluded
+    legs: list[float]     # light-years to each stop from the one before
+    total: float
+
+
+def _distance_matrix(points: list[Coords]) -> list[list[float]]:
+    n = len(points)
+    matrix = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        row_i, p = matrix[i], points[i]
+        for j in range(i + 1, n):
+            row_i[j] = matrix[j][i] = math.dist(p, points[j])
+    return matrix
+
+
+def _nearest_neighbour(dist: list[list[float]]) -> list[int]:
+    path = [0]
+    unvisited = set(range(1, len(dist)))
+    while unvisited:
+        row = dist[path[-1]]
+        nearest = min(unvisited, key=row.__getitem__)
+        unvisited.remove(nearest)
+        path.append(nearest)
+    return path
+
+
+def _two_opt(path: list[int], dist: list[list[float]]) -> list[int]:
+    """Reverse segments while that shortens the path; path[0] stays put."""
+    n = len(path)
+    for _ in range(MAX_PASSES):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = path[i - 1], path[i]
+            d_ab = dist[a][b]
+            for k in range(i + 1, n):
+                c = path[k]
+                if k + 1 < n:
+                    e = path[k + 1]
+                    gain = d_ab + dist[c][e] - dist[a][c] - dist[b][e]
+                else:
+                    # Last stop: an open path has no edge after it
+                    gain = d_ab - dist[a][c]
+                if gain > MIN_GAIN:
+                    path[i:k + 1] = reversed(path[i:k + 1])
+                    b = path[i]
+                    d_ab = dist[a][b]
+                    improved = True
+        if not improved:
+            break
+    return path
+
+
+def plan_route(start: Coords, stops: dict[str, Coords]) -> Route:
+    """Order stops into a short path beginning at start."""
+    names = list(stops)
+    if not names:
+        return Route(stops=[], legs=[], total=0.0)
+    dist = _distance_matrix([start] + [stops[name] for name in names])
+    path = _two_opt(_nearest_neighbour(dist), dist)
+    legs = [dist[a][b] for a, b in zip(path, path[1:])]
+    return Route(stops=[names[i - 1] for i in path[1:]], legs=legs, total=sum(legs))
@@ -0,0 +1,148 @@
+"""Disk snapshots of the hot cache.
+
+Every SNAPSHOT_INTERVAL seconds the cached objectives, colonies, buckets,
+tick, coordinates, commander locations, live boards and tick-summary state are
+written to SNAPSHOT_PATH as gzipped JSON. The file is replaced atomically.
+
+On startup ``load()`` reads the file back into the cache before any network
+call. Entries that are still within their TTL keep it. Expired ones are
+restored for SNAPSHOT_STALE_TTL seconds, so the first commands after a
+restart are answered from disk while warm-up refreshes them.
+
+The last snapshot also backs ``cache.fallback``. If the backend is
+unreachable and a key has expired, the snapshot copy is served instead of
+an error.
+
+Every process holds different data in a ``memory://`` cache, so each one
+gets its own file (``process_path``): gateway cluster 1 writes
+snapshot-c1.json.gz and interactions worker 2 writes snapshot-w2.json.gz.
+Cluster 0 / worker 0 keeps the plain name. With a shared cache every
+process loads the one file, but only cluster 0 / worker 0 writes it.
+"""
+import os
+import gzip
+import json
+import time
+import asyncio
+import logging
+import threading
+
+from core import metrics
+from core.cache import cache, CacheEntry
+
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', 'data/snapshot.json.gz')  # '' disables snapshots
+SNAPSHOT_INTERVAL = float(os.getenv('SNAPSHOT_INTERVAL', '60'))
+# Lifetime of restored entries whose TTL ran out while the bot was down
+SNAPSHOT_STALE_TTL = 30.0
+# Expired keys are kept for degraded serving until they are this old
+SNAPSHOT_MAX_AGE = 7 * 24 * 3600
+CLUSTER_ID = int(os.getenv('CLUSTER_ID', '0') or 0)
+
+SNAPSHOT_PREFIXES = ('objectives:', 'colonies:', 'buckets:', 'tick:', 'coords:', 'cmdr:system:', 'board:', 'ticksummary:')
+
+_lock = threading.Lock()
+_entries: dict[str, dict] = {}  # key -> {"k", "v", "t", "e"} from the last snapshot written or loaded
+
+
+def _worker_index() -> int:
+    # Set by interactions_server.py in each worker process, after this module is imported
+    return int(os.getenv('INTERACTIONS_WORKER', '0') or 0)
+
+
+def is_writer() -> bool:
+    """Whether this process writes the snapshot: always with a process-local cache, else only the first process."""
+    return not cache.shared or (CLUSTER_ID == 0 and _worker_index() == 0)
+
+
+def process_path(path: str = SNAPSHOT_PATH) -> str:
+    """This process's snapshot file: path, suffixed with the cluster or worker when the cache is process-local."""
+    suffix = ''
+    if not cache.shared:
+        if CLUSTER_ID:
+            suffix += f"-c{CLUSTER_ID}"
+        if _worker_index():
+            suffix += f"-w{_worker_index()}"
+    if not path or not suffix:
+        return path
+    directory, name = os.path.split(path)
+    stem, dot, extensions = name.partition('.')
+    return os.path.join(directory, f"{stem}{suffix}{dot}{extensions}")
+
+
+def fallback(key: str) -> CacheEntry | None:
+    """The last snapshotted value for key, however old."""
+    with _lock:
+        item = _entries.get(key)
+    return CacheEntry(value=item["v"], stored_at=item["t"]) if item else None
+
+
+def load(path: str = SNAPSHOT_PATH) -> int:
+    """Restore a snapshot into the cache; returns the number of entries restored."""
+    if not path or not os.path.exists(path):
+        return 0
+    started = time.perf_counter()
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.error("Snapshot: could not read %s: %s", path, e)
+        return 0
+
+    now = time.time()
+    restored = 0
+    for item in snapshot.get("entries", []):
+        ttl = item["e"] - now
+        if cache.restore(item["k"], item["v"], item["t"], ttl if ttl > 0 else SNAPSHOT_STALE_TTL):
+            restored += 1
+    with _lock:
+        _entries.update({item["k"]: item for item in snapshot.get("entries", [])})
+
+    age = now - snapshot.get("written_at", now)
+    metrics.set_gauge('snapshot_restored_entries', restored)
+    logging.info("Snapshot: restored %s entries from %s (%.0fs old) in %.3fs", restored, path, age, time.perf_counter() - started)
+    return restored
+
+
+def write(path: str = SNAPSHOT_PATH) -> int:
+    """Write the current hot cache to path; returns the number of entries written."""
+    entries = cache.dump(SNAPSHOT_PREFIXES)
+    cutoff = time.time() - SNAPSHOT_MAX_AGE
+    with _lock:
+        # Keep older copies of keys that have since expired, for degraded serving
+        _entries.update({item["k"]: item for item in entries})
+        for key in [k for k, item in _entries.items() if item["t"] < cutoff]:
+            del _entries[key]
+        everything = list(_entries.values())
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump({"written_at": time.time(), "entries": everything}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    metrics.set_gauge('snapshot_entries', len(everything))
+    return len(everything)
+
+
+async def run_periodic(path: str = SNAPSHOT_PATH, interval: float = SNAPSHOT_INTERVAL) -> None:
+    """Write this process's snapshot every interval seconds; run as a task for the life of the bot."""
+    path = process_path(path)
+    if not path or not is_writer():
+        return
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(write, path)
+        except Exception as e:
+            metrics.inc('snapshot_failures_total')
+            logging.error("Snapshot: write to %s failed: %s", path, e)
+
+
+def install(path: str = SNAPSHOT_PATH) -> None:
+    """Load this process's snapshot and register it as the cache's degraded-mode fallback."""
+    path = process_path(path)
+    if not path:
+        return
+    load(path)
+    cache.fallback = fallback
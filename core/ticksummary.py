@@ -0,0 +1,156 @@
+"""Automatic last-tick summaries.
+
+``run()`` polls galtick.json (through the cached ``fetch_galaxy_tick``).
+When lastGalaxyTick moves it asks the backend for the last-tick summary,
+once per tick across every bot process.
+
+- A lease (the cache's cross-process lock) is held while a summary runs, so
+  two processes never post at the same time. With the SQLite backend the
+  lock lives in the shared cache file.
+- Lease and state only span processes with a shared CACHE_URL. On
+  ``memory://`` the scheduler runs in cluster 0 alone (``should_run``), and
+  only if nothing else is running the bot.
+- The tick that was handled is recorded in the cache under the lease, so a
+  process that takes the lease later sees the tick is done and skips it.
+- A failed trigger is retried with exponential backoff, up to
+  MAX_ATTEMPTS times.
+- Every attempt is appended to a short run history (``history()``).
+
+The first tick seen on a fresh cache is only recorded. Deploying the bot
+does not post a summary for a tick that is already hours old.
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+
+import requests
+
+from core import metrics
+from core.api import fetch_galaxy_tick, trigger_tick_summary
+from core.cache import cache
+
+AUTO_TICK_SUMMARY = os.getenv('AUTO_TICK_SUMMARY', '1') != '0'
+CLUSTER_ID = int(os.getenv('CLUSTER_ID', '0') or 0)
+# Give the backend's event ingestion time to see the tick before summarising it
+TICK_SUMMARY_DELAY = float(os.getenv('TICK_SUMMARY_DELAY', '300'))
+POLL_INTERVAL = 60.0
+
+STATE_KEY = 'ticksummary:state'
+HISTORY_KEY = 'ticksummary:history'
+LEASE_KEY = 'ticksummary:lease'
+STATE_TTL = 30 * 24 * 3600
+# Longer than the trigger's 30 s request timeout
+LEASE_TTL = 90.0
+HISTORY_SIZE = 20
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 60.0
+BACKOFF_MAX = 30 * 60.0
+
+
+def backoff(attempts: int) -> float:
+    """Seconds to wait after the given number of failed attempts."""
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+
+
+def history() -> list[dict]:
+    """Recent runs, newest first: {"tick", "at", "outcome", "attempt", "detail"}."""
+    return cache.get(HISTORY_KEY, [])
+
+
+def should_run() -> bool:
+    """Whether this process may run the scheduler and still post each summary once.
+
+    With a shared cache every process can: the lease and state are shared.
+    With a process-local cache only gateway cluster 0 runs it.
+    """
+    if cache.shared:
+        return True
+    if CLUSTER_ID != 0:
+        logging.info("Tick summaries: left to cluster 0 (the cache is not shared)")
+        return False
+    logging.warning("Tick summaries: the cache is not shared, so summaries are posted once only if this is "
+                    "the bot's only process; set a shared CACHE_URL to run more")
+    return True
+
+
+class TickSummaryScheduler:
+    def _record(self, tick: str, outcome: str, attempt: int, detail: str = '') -> None:
+        runs = [{"tick": tick, "at": time.time(), "outcome": outcome, "attempt": attempt, "detail": detail}]
+        cache.set(HISTORY_KEY, (runs + history())[:HISTORY_SIZE], STATE_TTL)
+        metrics.inc('tick_summaries_total', outcome=outcome)
+
+    def check(self, now: float | None = None) -> str | None:
+        """Post the summary for a new tick if it is due; returns the outcome, or None if nothing ran."""
+        now = time.time() if now is None else now
+        tick = fetch_galaxy_tick().get("lastGalaxyTick")
+        if not tick:
+            return None
+        state = cache.get(STATE_KEY)
+        if state is not None and state["tick"] == tick and state["done"]:
+            return None
+
+        if not cache.try_lock(LEASE_KEY, LEASE_TTL):
+            return None  # another process holds the lease
+        try:
+            # Re-read under the lease: the previous holder may have just finished this tick
+            state = cache.get(STATE_KEY)
+            if state is None:
+                cache.set(STATE_KEY, {"tick": tick, "done": True, "attempts": 0, "retry_at": 0}, STATE_TTL)
+                logging.info("Tick summaries: starting from tick %s", tick)
+                return None
+            if state["tick"] != tick:
+                state = {"tick": tick, "done": False, "attempts": 0, "retry_at": self._tick_time(tick) + TICK_SUMMARY_DELAY}
+                cache.set(STATE_KEY, state, STATE_TTL)
+            if state["done"] or now < state["retry_at"]:
+                return None
+
+            state = {**state, "attempts": state["attempts"] + 1}  # the cached dict itself stays untouched
+            try:
+                response = trigger_tick_summary('lt')
+                ok = response.status_code == 200
+                detail = '' if ok else f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                ok, detail = False, str(e)
+
+            if ok:
+                state["done"] = True
+                outcome = 'ok'
+                logging.info("Tick summaries: posted the summary for tick %s", tick)
+            elif state["attempts"] >= MAX_ATTEMPTS:
+                state["done"] = True
+                outcome = 'failed'
+                logging.error("Tick summaries: giving up on tick %s after %d attempts: %s", tick, state["attempts"], detail)
+            else:
+                state["retry_at"] = now + backoff(state["attempts"])
+                outcome = 'retry'
+                logging.warning("Tick summaries: attempt %d for tick %s failed (%s), retrying in %.0f s",
+                                state["attempts"], tick, detail, state["retry_at"] - now)
+            cache.set(STATE_KEY, state, STATE_TTL)
+            self._record(tick, outcome, state["attempts"], detail)
+            return outcome
+        finally:
+            cache.unlock(LEASE_KEY)
+
+    @staticmethod
+    def _tick_time(tick: str) -> float:
+        try:
+            return datetime.fromisoformat(tick.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return time.time()
+
+    async def run(self) -> None:
+        """Check for a new tick every POLL_INTERVAL seconds; run as a task for the life of the bot."""
+        while True:
+            try:
+                await asyncio.to_thread(self.check)
+            except requests.RequestException as e:
+                logging.warning("Tick summaries: could not read the galaxy tick: %s", e)
+            except Exception:
+                logging.exception("Tick summaries: check failed")
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+tick_summaries = TickSummaryScheduler()
@@ -0,0 +1,45 @@
+"""Command tree shared by the gateway bot and the interactions server."""
+import time
+import logging
+
+import discord
+from discord import app_commands
+
+from core import admission, metrics
+from core.logs import bind_interaction, log_context
+
+log = logging.getLogger('sinistra.commands')
+
+
+class SinistraTree(app_commands.CommandTree):
+    """Binds each slash command's logging context and applies admission control before it runs."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        context = bind_interaction(interaction)
+        context["started"] = time.perf_counter()
+        command = context["command"]
+        if command is None or interaction.type is discord.InteractionType.autocomplete:
+            return True
+        decision = admission.check(command, interaction.user.id, interaction.guild_id)
+        if decision.admitted:
+            return True
+        if command in admission.CACHE_SERVABLE:
+            # Run it anyway, from cache only; see core.admission
+            admission.throttled.set(decision)
+            log.info("Command %s over %s budget, serving from cache", command, decision.scope)
+            return True
+        log.info("Command %s rejected: over %s budget", command, decision.scope)
+        await interaction.response.send_message(admission.slow_down_message(decision), ephemeral=True)
+        return False
+
+
+async def log_command_completion(interaction: discord.Interaction, command: app_commands.Command) -> None:
+    """on_app_command_completion listener: one structured line per finished command."""
+    context = log_context.get() or {}
+    started = context.get("started")
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1) if started else None
+    metrics.inc('commands_total', command=command.qualified_name)
+    log.info(
+        "Command %s finished", command.qualified_name,
+        extra={"elapsed_ms": elapsed_ms, "upstream_ms": context.get("upstream_ms") or {}},
+    )
@@ -0,0 +1,88 @@
+"""Startup prefetch of the data behind the busiest commands.
+
+``warm_up()`` runs in the background right after startup and fills the cache:
+
+1. Active objectives (objective period and current tick), the priority
+   colonies index (which also resolves colony coordinates) and the galaxy tick.
+2. /buckets for every system with a BGS-bin objective, and coordinates for
+   every objective system.
+
+Steps within a stage run concurrently. A failed step is logged but does not
+stop the others. ``is_ready()`` reports whether warm-up has finished, so
+readiness checks can hold traffic until the cache is warm.
+"""
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Callable
+
+from core import metrics
+from core.api import (
+    get_objective_index,
+    get_colony_index,
+    get_bucket_entries,
+    fetch_galaxy_tick,
+    fetch_system_coords,
+)
+from core.helpers import BGS_BIN_TYPES
+
+_ready = threading.Event()
+_status: dict[str, str] = {}  # step name -> 'pending' | 'ok' | 'failed'
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def status() -> dict[str, str]:
+    return dict(_status)
+
+
+async def _run_step(name: str, func: Callable, *args) -> Any:
+    _status[name] = 'pending'
+    started = time.perf_counter()
+    try:
+        result = await asyncio.to_thread(func, *args)
+    except Exception as e:
+        _status[name] = 'failed'
+        metrics.inc('warmup_steps_total', result='failed')
+        logging.warning("Warm-up: %s failed: %s", name, e)
+        return None
+    _status[name] = 'ok'
+    metrics.inc('warmup_steps_total', result='ok')
+    logging.info("Warm-up: %s ready in %.2fs", name, time.perf_counter() - started)
+    return result
+
+
+async def warm_up() -> None:
+    """Prefetch hot data into the cache and mark the process ready, even if some steps fail."""
+    started = time.perf_counter()
+    metrics.set_gauge('warmup_ready', 0)
+    logging.info("Warm-up: starting")
+    try:
+        index, *_ = await asyncio.gather(
+            _run_step("objectives", get_objective_index),
+            _run_step("objectives (current tick)", get_objective_index, 'ct'),
+            _run_step("colonies", get_colony_index),
+            _run_step("galaxy tick", fetch_galaxy_tick),
+        )
+
+        steps = []
+        if index is not None:
+            bin_systems = sorted({o.system for o in index.objectives if o.type in BGS_BIN_TYPES and o.system})
+            steps += [_run_step(f"buckets {system}", get_bucket_entries, system, 'ct') for system in bin_systems]
+            systems = sorted({o.system for o in index.objectives if o.system})
+            if systems:
+                steps.append(_run_step(f"coordinates ({len(systems)} systems)", fetch_system_coords, systems))
+        await asyncio.gather(*steps)
+    finally:
+        elapsed = time.perf_counter() - started
+        failed = [name for name, state in _status.items() if state == 'failed']
+        metrics.set_gauge('warmup_seconds', round(elapsed, 3))
+        metrics.set_gauge('warmup_ready', 1)
+        _ready.set()
+        if failed:
+            logging.warning("Warm-up: finished in %.2fs with %s failed step(s): %s", elapsed, len(failed), ', '.join(failed))
+        else:
+            logging.info("Warm-up: finished in %.2fs (%s steps)", elapsed, len(_status))
@@ -1,3 +1,21 @@
 #!/bin/bash
 echo "Starting Sinistra Goals Discord Bot..."
-python bot.py
\ No newline at end of file
+
+# Stateless HTTP interactions endpoint instead of a gateway connection
+if [ "$BOT_RUNTIME" = "http" ]; then
+    exec python interactions_server.py
+fi
+
+# Cluster-per-process: with CLUSTER_COUNT > 1 and no CLUSTER_ID given, start
+# one bot process per cluster; each one runs its share of SHARD_COUNT shards.
+if [ "${CLUSTER_COUNT:-1}" -gt 1 ] && [ -z "$CLUSTER_ID" ]; then
+    for ((i = 0; i < CLUSTER_COUNT; i++)); do
+        echo "Starting cluster $i/$CLUSTER_COUNT"
+        CLUSTER_ID=$i python bot.py &
+    done
+    # Exit (and let the orchestrator restart us) as soon as any cluster dies
+    wait -n
+    exit $?
+fi
+
+python bot.py
@@ -0,0 +1,315 @@
+"""Stateless HTTP interactions runtime.
+
+Instead of holding a gateway session, Discord POSTs every interaction to
+``/interactions`` (set it as the application's Interactions Endpoint URL).
+Requests are verified with the application's Ed25519 public key and then
+dispatched through the same command tree, cogs and views as bot.py.
+
+Any number of workers can run side by side: they share nothing, and with
+``--workers N`` they bind the same port with SO_REUSEPORT so the kernel
+balances connections between them. Only the first worker runs the
+background loops (board refresh, tick summaries); the others are started
+with BACKGROUND_TASKS=0. Boards then need a shared CACHE_URL, so that the
+first worker sees boards started through the others.
+
+    DISCORD_PUBLIC_KEY=... DISCORD_BOT_TOKEN=... python interactions_server.py --workers 4
+
+Officer-only commands check role names, which are only known from the
+gateway cache; run those through the gateway bot.
+"""
+import os
+import ssl
+import json
+import time
+import asyncio
+import logging
+import argparse
+import multiprocessing
+
+import aiohttp
+import discord
+from discord.ext import commands
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+from aiohttp import web
+from nacl.signing import VerifyKey
+from nacl.exceptions import BadSignatureError
+
+from cogs import enabled_extensions
+from core import metrics, snapshot
+from core.cache import cache
+from core.warmup import warm_up
+from core.health import LoopMonitor, report
+from core.logs import setup_logging
+from core.outbound import trace_config
+from core.tree import SinistraTree, log_command_completion
+
+DISCORD_PUBLIC_KEY = os.getenv('DISCORD_PUBLIC_KEY', '')
+DISCORD_API_BASE = os.getenv('DISCORD_API_BASE', '')  # override for local testing, e.g. http://127.0.0.1:8090/api/v10
+INTERACTIONS_HOST = os.getenv('INTERACTIONS_HOST', '0.0.0.0')
+INTERACTIONS_PORT = int(os.getenv('INTERACTIONS_PORT', '8080'))
+INTERACTIONS_WORKERS = int(os.getenv('INTERACTIONS_WORKERS', '1'))
+INTERACTIONS_TLS_CERT = os.getenv('INTERACTIONS_TLS_CERT', '')
+INTERACTIONS_TLS_KEY = os.getenv('INTERACTIONS_TLS_KEY', '')
+
+# Discord fails the interaction if the webhook isn't answered within 3 seconds
+INITIAL_RESPONSE_TIMEOUT = 2.5
+# Signed requests further than this from our clock are replays (or a badly skewed clock)
+SIGNATURE_MAX_SKEW = 5.0
+
+# Interaction and interaction-callback types
+PING = 1
+MESSAGE_COMPONENT = 3
+PONG = 1
+CHANNEL_MESSAGE = 4
+DEFERRED_CHANNEL_MESSAGE = 5
+DEFERRED_UPDATE_MESSAGE = 6
+
+
+def verify_signature(verify_key: VerifyKey, signature: str, timestamp: str, body: bytes, now: float | None = None) -> bool:
+    """Check Discord's X-Signature-Ed25519 over timestamp + raw body, and that the timestamp is current."""
+    now = time.time() if now is None else now
+    try:
+        if abs(now - int(timestamp)) > SIGNATURE_MAX_SKEW:
+            return False
+        verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+        return True
+    except (BadSignatureError, ValueError):
+        return False
+
+
+class InitialResponseAdapter(AsyncWebhookAdapter):
+    """Webhook adapter that turns the first interaction response into the HTTP reply.
+
+    Over the gateway, discord.py acknowledges an interaction by POSTing to the
+    callback endpoint. Here the acknowledgement must be the body of Discord's
+    webhook request instead, so the first create_interaction_response call
+    resolves ``future`` rather than going out over the network. A response
+    with files resolves it with the multipart parts (file contents read into
+    memory), which go back as a multipart/form-data reply. Followups, edits
+    and everything else use the normal adapter behaviour.
+
+    The adapter is installed through discord.py's ``async_context`` contextvar
+    just before dispatch, so only the handler task for this interaction sees it.
+    """
+
+    def __init__(self, application_id: int, future: asyncio.Future):
+        super().__init__()
+        self.application_id = application_id
+        self.future = future
+        self.timed_out = False
+
+    async def create_interaction_response(self, interaction_id, token, *, session, proxy=None, proxy_auth=None, params):
+        # With files, discord.py moves the payload into the payload_json part
+        payload = json.loads(params.multipart[0]["value"]) if params.files else (params.payload or {})
+        callback = {"interaction": {"id": str(interaction_id), "type": payload.get("type")}}
+
+        if not self.future.done():
+            if params.files:
+                # Read the files now: discord.py closes them as soon as this returns
+                self.future.set_result([
+                    {**part, "value": part["value"].read()} if "filename" in part else part
+                    for part in params.multipart
+                ])
+            else:
+                self.future.set_result(payload)
+            return callback
+
+        if self.timed_out:
+            # The server already answered with a deferral on the handler's behalf
+            if payload.get("type") == CHANNEL_MESSAGE:
+                multipart = None
+                if params.files:
+                    multipart = [{"name": "payload_json", "value": json.dumps(payload.get("data"))}, *params.multipart[1:]]
+                await self.edit_original_interaction_response(
+                    self.application_id,
+                    token,
+                    session=session,
+                    proxy=proxy,
+                    proxy_auth=proxy_auth,
+                    payload=None if params.files else payload.get("data"),
+                    multipart=multipart,
+                    files=params.files,
+                )
+            elif payload.get("type") not in (DEFERRED_CHANNEL_MESSAGE, DEFERRED_UPDATE_MESSAGE):
+                logging.warning("Dropping late interaction response of type %s", payload.get('type'))
+            return callback
+
+        return await super().create_interaction_response(
+            interaction_id, token, session=session, proxy=proxy, proxy_auth=proxy_auth, params=params
+        )
+
+
+class InteractionsBot(commands.Bot):
+    """Gateway-less bot: used only for its command tree, view store and HTTP client."""
+
+    async def setup_hook(self):
+        self.add_listener(log_command_completion, 'on_app_command_completion')
+
+        for extension in enabled_extensions():
+            try:
+                await self.load_extension(extension)
+            except Exception as e:
+                logging.error("Failed to load extension %s: %s", extension, e)
+
+
+async def handle_interaction(request: web.Request) -> web.Response:
+    bot: InteractionsBot = request.app['bot']
+    body = await request.read()
+
+    signature = request.headers.get('X-Signature-Ed25519', '')
+    timestamp = request.headers.get('X-Signature-Timestamp', '')
+    if not verify_signature(request.app['verify_key'], signature, timestamp, body):
+        metrics.inc('interactions_rejected_total')
+        return web.Response(status=401, text='invalid request signature')
+
+    data = json.loads(body)
+    interaction_type = data.get('type')
+    metrics.inc('interactions_total', type=interaction_type)
+    if interaction_type == PING:
+        return web.json_response({"type": PONG})
+
+    future = asyncio.get_running_loop().create_future()
+    adapter = InitialResponseAdapter(int(data['application_id']), future)
+    token = async_context.set(adapter)
+    try:
+        # Builds the Interaction and schedules the command/view/modal handler
+        # as a task, which copies the current context (and so the adapter).
+        bot._connection.parse_interaction_create(data)
+    finally:
+        async_context.reset(token)
+
+    try:
+        payload = await asyncio.wait_for(asyncio.shield(future), INITIAL_RESPONSE_TIMEOUT)
+    except asyncio.TimeoutError:
+        metrics.inc('interaction_ack_timeouts_total')
+        adapter.timed_out = True
+        payload = {"type": DEFERRED_UPDATE_MESSAGE if interaction_type == MESSAGE_COMPONENT else DEFERRED_CHANNEL_MESSAGE}
+        future.set_result(payload)
+    if isinstance(payload, list):
+        return multipart_response(payload)
+    return web.json_response(payload)
+
+
+def multipart_response(parts: list[dict]) -> web.Response:
+    """An initial response with files, as the multipart/form-data body Discord accepts in the HTTP reply."""
+    form = aiohttp.FormData(quote_fields=False)
+    for part in parts:
+        form.add_field(**part)
+    return web.Response(body=form())
+
+
+async def handle_healthz(request: web.Request) -> web.Response:
+    healthy, _, body = report(request.app['loop_monitor'])
+    return web.json_response(body, status=200 if healthy else 503)
+
+
+async def handle_readyz(request: web.Request) -> web.Response:
+    # Keep the load balancer away from this worker until its cache is warm
+    _, ready, body = report(request.app['loop_monitor'])
+    return web.json_response(body, status=200 if ready else 503)
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=metrics.render_text(), content_type='text/plain')
+
+
+def create_app(bot: InteractionsBot, public_key: str) -> web.Application:
+    app = web.Application()
+    app['bot'] = bot
+    app['verify_key'] = VerifyKey(bytes.fromhex(public_key))
+    app['loop_monitor'] = LoopMonitor()
+    app.router.add_post('/interactions', handle_interaction)
+    app.router.add_get('/healthz', handle_healthz)
+    app.router.add_get('/readyz', handle_readyz)
+    app.router.add_get('/metrics', handle_metrics)
+    return app
+
+
+def _ssl_context() -> ssl.SSLContext | None:
+    if not INTERACTIONS_TLS_CERT:
+        return None
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(INTERACTIONS_TLS_CERT, INTERACTIONS_TLS_KEY or None)
+    return context
+
+
+async def serve(host: str, port: int, sync: bool = False):
+    token = os.getenv('DISCORD_BOT_TOKEN')
+    if DISCORD_API_BASE:
+        discord.http.Route.BASE = DISCORD_API_BASE
+
+    snapshot.install()
+    bot = InteractionsBot(
+        command_prefix='!', intents=discord.Intents.none(), tree_cls=SinistraTree, http_trace=trace_config()
+    )
+    # login() only talks to the REST API (and runs setup_hook); no gateway session is opened
+    await bot.login(token)
+    if sync:
+        synced = await bot.tree.sync()
+        logging.info('✅ Synced %s slash command(s)', len(synced))
+        await bot.close()
+        return
+
+    warmup_task = asyncio.create_task(warm_up())
+    snapshot_task = asyncio.create_task(snapshot.run_periodic())
+    app = create_app(bot, DISCORD_PUBLIC_KEY)
+    monitor_task = asyncio.create_task(app['loop_monitor'].run())
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port, reuse_port=True, ssl_context=_ssl_context())
+    await site.start()
+    logging.info('🌐 Interactions worker %s listening on %s:%s', os.getpid(), host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        warmup_task.cancel()
+        snapshot_task.cancel()
+        monitor_task.cancel()
+        await runner.cleanup()
+        await bot.close()
+
+
+def run_worker(host: str, port: int, index: int = 0):
+    # Keeps each worker's snapshot file apart (core.snapshot.process_path)
+    os.environ['INTERACTIONS_WORKER'] = str(index)
+    if index > 0:
+        # Background loops run once, in worker 0; cogs read this when they load
+        os.environ['BACKGROUND_TASKS'] = '0'
+    setup_logging()
+    asyncio.run(serve(host, port))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve slash commands over the HTTP interactions endpoint")
+    parser.add_argument('--host', default=INTERACTIONS_HOST)
+    parser.add_argument('--port', type=int, default=INTERACTIONS_PORT)
+    parser.add_argument('--workers', type=int, default=INTERACTIONS_WORKERS)
+    parser.add_argument('--sync', action='store_true', help="sync the command tree with Discord and exit")
+    args = parser.parse_args()
+
+    if not os.getenv('DISCORD_BOT_TOKEN'):
+        print("❌ Error: DISCORD_BOT_TOKEN not found in environment!")
+        exit(1)
+    if args.sync:
+        setup_logging()
+        asyncio.run(serve(args.host, args.port, sync=True))
+        exit(0)
+    if not DISCORD_PUBLIC_KEY:
+        print("❌ Error: DISCORD_PUBLIC_KEY not found in environment!")
+        exit(1)
+
+    if args.workers <= 1:
+        run_worker(args.host, args.port)
+    else:
+        if not cache.shared:
+            # Logging is set up per worker (its writer thread would not survive the fork)
+            print(f"⚠️ {args.workers} workers on a memory:// cache: /board is refused outside worker 0; "
+                  "set a shared CACHE_URL")
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(args.host, args.port, index), daemon=True)
+            for index in range(args.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,109 @@
+"""Validate the local bucket engine (core/bgs.py) against the backend.
+
+    # 1. record live /buckets responses (appends one JSON line per response)
+    API_BASE=... API_KEY=... python scripts/check_buckets.py record Sol "LHS 3447" --period lt
+
+The recording goes to tests/fixtures/bucket_responses.jsonl by default;
+tests/test_bgs.py checks every entry in it, so commit it with the tables.
+
+    # 2. list every recorded entry the engine disagrees with (exit code 1 if any)
+    python scripts/check_buckets.py check
+
+    # 3. derive BUCKET_STEPS from the recording, to paste into core/bgs.py
+    python scripts/check_buckets.py fit
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import bgs
+from core.api import get_json
+from core.models import parse_bucket_entries
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RECORDING = os.path.join(ROOT, 'tests', 'fixtures', 'bucket_responses.jsonl')
+
+
+def read_recording(path: str) -> list[dict]:
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record(path: str, systems: list[str], period: str) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for system in systems:
+            payload = get_json('buckets', params={'period': period, 'system': system})
+            f.write(json.dumps({"system": system, "period": period, "at": time.time(), "payload": payload}) + "\n")
+            print(f"recorded {system} ({period}): {len(parse_bucket_entries(payload))} faction(s)")
+
+
+def check(path: str) -> int:
+    checked = failed = 0
+    for item in read_recording(path):
+        for entry in parse_bucket_entries(item["payload"]):
+            checked += 1
+            problems = bgs.check_entry(entry)
+            if problems:
+                failed += 1
+                print(f"✗ {entry.system} / {entry.faction} ({entry.period})")
+                for problem in problems:
+                    print(f"    {problem}")
+    print(f"{checked - failed}/{checked} entries match")
+    return 1 if failed else 0
+
+
+def fit_steps(items: list[dict]) -> tuple[dict[str, tuple[float, ...]], int]:
+    """Step tables derived from recorded responses, and how many (bucket, pts) levels they saw.
+
+    A bucket at n pts has at most step n left to go, so the largest remaining
+    seen there is the step. Levels never seen keep the current step.
+    """
+    observed: dict[str, dict[int, float]] = {key: {} for key in bgs.BUCKET_STEPS}
+    for item in items:
+        for entry in parse_bucket_entries(item["payload"]):
+            for key, bucket in entry.buckets.items():
+                if key in observed and bucket.pts < bgs.MAX_BUCKET_PTS:
+                    levels = observed[key]
+                    levels[bucket.pts] = max(levels.get(bucket.pts, 0), bucket.remaining)
+    steps = {
+        key: tuple(observed[key].get(n, step) for n, step in enumerate(current))
+        for key, current in bgs.BUCKET_STEPS.items()
+    }
+    return steps, sum(len(levels) for levels in observed.values())
+
+
+def fit(path: str) -> None:
+    steps, seen = fit_steps(read_recording(path))
+    print("BUCKET_STEPS: dict[str, tuple[float, ...]] = {")
+    for key, fitted in steps.items():
+        print(f"    {key!r}: ({', '.join(f'{s:_}' for s in fitted)}),")
+    print("}")
+    print(f"# from {seen} of {len(bgs.BUCKET_STEPS) * bgs.MAX_BUCKET_PTS} (bucket, pts) levels", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file', default=DEFAULT_RECORDING, help="recording to read or append to")
+    sub = parser.add_subparsers(dest='action', required=True)
+    rec = sub.add_parser('record', help="append live /buckets responses to the recording")
+    rec.add_argument('systems', nargs='+')
+    rec.add_argument('--period', default='ct', choices=('ct', 'lt'))
+    sub.add_parser('check', help="compare every recorded entry with the local engine")
+    sub.add_parser('fit', help="print step tables derived from the recording")
+    args = parser.parse_args()
+
+    if args.action == 'record':
+        record(args.file, args.systems, args.period)
+    elif args.action == 'check':
+        sys.exit(check(args.file))
+    else:
+        fit(args.file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Local fake Discord for exercising interactions_server.py.
+
+    # 1. fake Discord REST API: answers login and prints every other request
+    python scripts/fake_interaction.py sink --port 8090
+
+    # 2. interactions server pointed at the sink and trusting the fake key
+    DISCORD_API_BASE=http://127.0.0.1:8090/api/v10 DISCORD_BOT_TOKEN=fake \\
+    DISCORD_PUBLIC_KEY=$(python scripts/fake_interaction.py pubkey) \\
+    python interactions_server.py --port 8080
+
+    # 3. signed interactions
+    python scripts/fake_interaction.py ping
+    python scripts/fake_interaction.py send goals goal_type=fight
+    python scripts/fake_interaction.py send buckets system=Sol faction=... --bad-signature
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import requests
+from aiohttp import web
+from nacl.signing import SigningKey
+
+# Fixed default so the server and the sender agree without passing keys around
+FAKE_INTERACTION_SEED = os.getenv('FAKE_INTERACTION_SEED', '5a' * 32)
+APPLICATION_ID = "100000000000000001"
+GUILD_ID = "100000000000000002"
+CHANNEL_ID = "100000000000000003"
+USER_ID = "100000000000000004"
+
+
+def signing_key() -> SigningKey:
+    return SigningKey(bytes.fromhex(FAKE_INTERACTION_SEED))
+
+
+def snowflake() -> str:
+    return str((int(time.time() * 1000) - 1420070400000) << 22 | random.getrandbits(22))
+
+
+def command_payload(name: str, options: dict[str, str]) -> dict:
+    """A minimal guild APPLICATION_COMMAND interaction with string options."""
+    return {
+        "type": 2,
+        "id": snowflake(),
+        "application_id": APPLICATION_ID,
+        "token": f"fake-token-{snowflake()}",
+        "version": 1,
+        "guild_id": GUILD_ID,
+        "channel_id": CHANNEL_ID,
+        "channel": {
+            "id": CHANNEL_ID, "type": 0, "guild_id": GUILD_ID, "name": "fake", "position": 0,
+            "permission_overwrites": [], "nsfw": False, "parent_id": None, "flags": 0, "permissions": "0",
+        },
+        "member": {
+            "user": {"id": USER_ID, "username": "fakecmdr", "discriminator": "0", "avatar": None, "global_name": "Fake CMDR"},
+            "roles": [],
+            "joined_at": "2024-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+            "permissions": "0",
+        },
+        "data": {
+            "id": snowflake(),
+            "name": name,
+            "type": 1,
+            "options": [{"name": k, "type": 3, "value": v} for k, v in options.items()],
+        },
+        "app_permissions": "0",
+        "locale": "en-US",
+        "guild_locale": "en-US",
+        "entitlements": [],
+        "authorizing_integration_owners": {"0": GUILD_ID},
+        "context": 0,
+        "attachment_size_limit": 10 * 1024 * 1024,
+    }
+
+
+def ping_payload() -> dict:
+    return {"type": 1, "id": snowflake(), "application_id": APPLICATION_ID, "token": "fake", "version": 1}
+
+
+def signed_request(payload: dict, bad_signature: bool = False, timestamp: int | None = None) -> tuple[bytes, dict]:
+    """The body and headers Discord would send for payload, signed with the fake key (at timestamp, default now)."""
+    body = json.dumps(payload).encode()
+    timestamp = str(int(time.time()) if timestamp is None else timestamp)
+    signature = signing_key().sign(timestamp.encode() + body).signature.hex()
+    if bad_signature:
+        signature = signature[::-1]
+    return body, {
+        "Content-Type": "application/json",
+        "X-Signature-Ed25519": signature,
+        "X-Signature-Timestamp": timestamp,
+    }
+
+
+def post_signed(url: str, payload: dict, bad_signature: bool = False) -> requests.Response:
+    body, headers = signed_request(payload, bad_signature)
+    return requests.post(url, data=body, headers=headers, timeout=10)
+
+
+def discord_json(data) -> web.Response:
+    # discord.py only parses bodies whose content-type is exactly application/json
+    return web.Response(body=json.dumps(data).encode(), content_type="application/json")
+
+
+async def run_sink(port: int):
+    async def users_me(request):
+        return discord_json({"id": APPLICATION_ID, "username": "Sinistra", "discriminator": "0", "avatar": None, "bot": True})
+
+    async def application(request):
+        return discord_json({
+            "id": APPLICATION_ID, "name": "Sinistra", "description": "", "icon": None, "verify_key": "",
+            "bot_public": False, "bot_require_code_grant": False,
+            "owner": {"id": USER_ID, "username": "fakecmdr", "discriminator": "0", "avatar": None},
+        })
+
+    async def record(request):
+        body = await request.text()
+        print(f"{request.method} {request.path}\n{body}\n", flush=True)
+        if request.method == 'DELETE':
+            return web.Response(status=204)
+        return discord_json({
+            "id": snowflake(), "channel_id": CHANNEL_ID, "type": 0, "content": "", "embeds": [],
+            "attachments": [], "mentions": [], "mention_roles": [], "pinned": False, "mention_everyone": False,
+            "tts": False, "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None, "flags": 0,
+            "components": [], "author": {"id": APPLICATION_ID, "username": "Sinistra", "discriminator": "0", "avatar": None},
+        })
+
+    app = web.Application()
+    app.router.add_get('/api/v10/users/@me', users_me)
+    app.router.add_get('/api/v10/oauth2/applications/@me', application)
+    app.router.add_route('*', '/api/v10/{tail:.*}', record)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    print(f"Fake Discord API on http://127.0.0.1:{port}/api/v10", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8080/interactions')
+    sub = parser.add_subparsers(dest='action', required=True)
+    sub.add_parser('pubkey', help="print the public key to use as DISCORD_PUBLIC_KEY")
+    sub.add_parser('ping', help="send a signed PING")
+    send = sub.add_parser('send', help="send a signed slash command")
+    send.add_argument('command')
+    send.add_argument('options', nargs='*', help="name=value string options")
+    send.add_argument('--bad-signature', action='store_true')
+    sink = sub.add_parser('sink', help="run a fake Discord REST API that prints followups")
+    sink.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+
+    if args.action == 'pubkey':
+        print(signing_key().verify_key.encode().hex())
+    elif args.action == 'sink':
+        asyncio.run(run_sink(args.port))
+    else:
+        if args.action == 'ping':
+            payload = ping_payload()
+        else:
+            options = dict(opt.split('=', 1) for opt in args.options)
+            payload = command_payload(args.command, options)
+        started = time.perf_counter()
+        response = post_signed(args.url, payload, bad_signature=getattr(args, 'bad_signature', False))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"HTTP {response.status_code} in {elapsed_ms:.1f} ms: {response.text}")
+        sys.exit(0 if response.ok else 1)
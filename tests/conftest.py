@@ -0,0 +1,130 @@
+import time
+import fnmatch
+import threading
+import socketserver
+
+import pytest
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2].decode())
+            with server.lock:
+                server.commands.append(args)
+                try:
+                    reply = server.execute(args[0].upper(), args[1:])
+                except ValueError as e:
+                    self.wfile.write(f"-ERR {e}\r\n".encode())
+                    continue
+            self.wfile.write(_encode(reply))
+
+
+def _encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if value is True:
+        return b"+OK\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    data = str(value).encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """The handful of Redis commands RedisBackend uses, in memory, on a local port."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _RespHandler)
+        self.lock = threading.Lock()
+        self.commands: list[list[str]] = []
+        self.strings: dict[str, tuple[str, float | None]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def _live(self, key: str) -> str | None:
+        item = self.strings.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= time.time():
+            del self.strings[key]
+            return None
+        return item[0]
+
+    def execute(self, name: str, args: list[str]):
+        if name in ('AUTH', 'SELECT'):
+            return True
+        if name == 'GET':
+            return self._live(args[0])
+        if name == 'SET':
+            key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+            if 'NX' in options and self._live(key) is not None:
+                return None
+            expires_at = time.time() + int(args[2 + options.index('PX') + 1]) / 1000 if 'PX' in options else None
+            self.strings[key] = (value, expires_at)
+            return True
+        if name == 'PTTL':
+            if self._live(args[0]) is None:
+                return -2
+            expires_at = self.strings[args[0]][1]
+            return -1 if expires_at is None else int((expires_at - time.time()) * 1000)
+        if name == 'PEXPIRE':
+            if self._live(args[0]) is None:
+                return 0
+            self.strings[args[0]] = (self.strings[args[0]][0], time.time() + int(args[1]) / 1000)
+            return 1
+        if name == 'DEL':
+            return sum(self.strings.pop(key, None) is not None or self.zsets.pop(key, None) is not None for key in args)
+        if name == 'INCR':
+            value = int(self._live(args[0]) or 0) + 1
+            self.strings[args[0]] = (str(value), None)
+            return value
+        if name == 'SCAN':
+            pattern = args[args.index('MATCH') + 1].replace('\\*', '[*]').replace('\\?', '[?]')
+            return ['0', [key for key in list(self.strings) if fnmatch.fnmatchcase(key, pattern) and self._live(key) is not None]]
+        if name == 'ZADD':
+            self.zsets.setdefault(args[0], {})[args[2]] = float(args[1])
+            return 1
+        if name == 'ZRANGEBYSCORE':
+            low, high = args[1], args[2]
+            exclusive = low.startswith('(')
+            low = float(low.lstrip('('))
+            high = float('inf') if high == '+inf' else float(high)
+            members = sorted(self.zsets.get(args[0], {}).items(), key=lambda item: item[1])
+            return [m for m, score in members if (score > low if exclusive else score >= low) and score <= high]
+        if name == 'ZREMRANGEBYRANK':
+            members = sorted(self.zsets.get(args[0], {}).items(), key=lambda item: item[1])
+            start, stop = int(args[1]), int(args[2])
+            stop = len(members) + stop if stop < 0 else stop
+            removed = members[start:stop + 1] if stop >= start else []
+            for member, _ in removed:
+                del self.zsets[args[0]][member]
+            return len(removed)
+        raise ValueError(f"unknown command '{name}'")
+
+
+@pytest.fixture
+def resp_server():
+    """A Redis protocol stand-in running in this process; see RespServer for what it understands."""
+    server = RespServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
@@ -0,0 +1,60 @@
+"""The local bucket engine (core/bgs.py) against recorded backend /buckets responses."""
+import os
+
+import pytest
+
+from core import bgs
+from core.models import parse_bucket_entries
+from scripts.check_buckets import DEFAULT_RECORDING, fit_steps, read_recording
+
+
+def _recorded_entries():
+    if not os.path.exists(DEFAULT_RECORDING):
+        return []
+    return [
+        pytest.param(entry, id=f"{entry.system}/{entry.faction}/{entry.period}")
+        for item in read_recording(DEFAULT_RECORDING)
+        for entry in parse_bucket_entries(item["payload"])
+    ]
+
+
+RECORDED = _recorded_entries()
+
+
+@pytest.mark.skipif(not RECORDED, reason="no recording; run scripts/check_buckets.py record against the backend")
+@pytest.mark.parametrize("entry", RECORDED)
+def test_engine_matches_recorded_response(entry):
+    assert bgs.check_entry(entry) == []
+
+
+def _as_api(entry) -> dict:
+    return {
+        "system": entry.system,
+        "faction": entry.faction,
+        "period": entry.period,
+        "buckets": {key: {"pts": b.pts, "remaining": b.remaining} for key, b in entry.buckets.items()},
+        "cappedPts": entry.capped_pts,
+        "pctCap": entry.pct_cap,
+        "netPts": entry.net_pts,
+        "totalPositivePts": entry.total_positive_pts,
+        "totalNegativePts": entry.total_negative_pts,
+    }
+
+
+def test_fit_recovers_the_steps_it_was_given():
+    # Entries sitting one unit into every level, as the engine itself scores them
+    entries = []
+    for pts in range(bgs.MAX_BUCKET_PTS):
+        totals = {key: bgs._THRESHOLDS[key][pts] + 1e-9 for key in bgs.BUCKET_STEPS}
+        entries.append(_as_api(bgs.build_entry("Sol", f"Faction {pts}", totals)))
+    steps, seen = fit_steps([{"payload": entries}])
+    assert seen == len(bgs.BUCKET_STEPS) * bgs.MAX_BUCKET_PTS
+    for key, fitted in steps.items():
+        assert fitted == pytest.approx(bgs.BUCKET_STEPS[key])
+
+
+def test_check_entry_reports_a_mismatch():
+    entry = bgs.build_entry("Sol", "Faction", {"trade": 600_000})
+    assert bgs.check_entry(entry) == []
+    entry.net_pts += 1
+    assert bgs.check_entry(entry) == [f"net_pts: backend {entry.net_pts}, local {entry.net_pts - 1}"]
@@ -0,0 +1,84 @@
+"""RedisBackend and Cache against the in-process RESP server from conftest.py."""
+import time
+
+from core import cache as cache_module
+from core.cache import STALE_KEEP, Cache, RedisBackend
+
+
+def _cache(server) -> Cache:
+    return Cache(RedisBackend('127.0.0.1', server.port, db=1, password='secret'))
+
+
+def test_set_get_and_stale_read(resp_server):
+    cache = _cache(resp_server)
+    cache.set('api:a', {"n": 1}, ttl=60)
+    assert cache.get('api:a') == {"n": 1}
+    assert resp_server.commands[:2] == [['AUTH', 'secret'], ['SELECT', '1']]
+
+    # TTL ran out a minute ago, but the key is still within STALE_KEEP
+    value, expires_at = resp_server.strings['sinistra:api:a']
+    resp_server.strings['sinistra:api:a'] = (value, time.time() + STALE_KEEP - 60)
+    assert cache.get('api:a') is None
+    assert cache.get_stale_entry('api:a').value == {"n": 1}
+
+    assert cache.touch('api:a', ttl=60)
+    assert cache.get('api:a') == {"n": 1}
+    assert not cache.touch('api:missing', ttl=60)
+    assert [entry["k"] for entry in cache.dump(('api:',))] == ['api:a']
+
+
+def test_lock_is_exclusive(resp_server):
+    first, second = _cache(resp_server), _cache(resp_server)
+    assert first.try_lock('api:a')
+    assert not second.try_lock('api:a')
+    first.unlock('api:a')
+    assert second.try_lock('api:a')
+
+
+def test_invalidation_reaches_other_processes_once(resp_server):
+    sender, receiver = _cache(resp_server), _cache(resp_server)
+    received = []
+    receiver.subscribe(received.append)
+    sender.set('api:a', 1, ttl=60)
+
+    sender.invalidate('api:')
+    receiver.poll_invalidations(force=True)
+    receiver.poll_invalidations(force=True)
+    assert [message["prefix"] for message in received] == ['api:']
+    assert receiver.get('api:a') is None
+
+    sender.invalidate('bgs:')
+    receiver.poll_invalidations(force=True)
+    assert [message["prefix"] for message in received] == ['api:', 'bgs:']
+    # Each poll asks only for what came after the last message it saw
+    read = [c for c in resp_server.commands if c[0] == 'ZRANGEBYSCORE'][-1]
+    assert read == ['ZRANGEBYSCORE', 'sinistra:invalidations:log', f"({received[0]['id']}", '+inf']
+
+
+def test_invalidation_log_is_capped(resp_server, monkeypatch):
+    monkeypatch.setattr(cache_module, 'INVALIDATION_LOG_SIZE', 3)
+    cache = _cache(resp_server)
+    for n in range(5):
+        cache.invalidate(f"p{n}:")
+    assert [m["prefix"] for m in cache.backend.read_messages(0)] == ['p2:', 'p3:', 'p4:']
+
+
+def test_reconnects_after_the_connection_drops(resp_server):
+    cache = _cache(resp_server)
+    cache.set('api:a', 1, ttl=60)
+    old_sock = cache.backend._sock
+    # The server side goes away, as on a Redis restart
+    old_sock.shutdown(2)
+    assert cache.get('api:a') == 1
+    assert cache.backend._sock is not old_sock
+    assert old_sock.fileno() == -1
+
+
+def test_fetch_after_deadline_leaves_the_other_lock_alone(resp_server, monkeypatch):
+    monkeypatch.setattr(cache_module, 'FETCH_LOCK_TTL', 0.3)
+    other, cache = _cache(resp_server), _cache(resp_server)
+    assert other.try_lock('api:a', ttl=60)
+
+    assert cache.get_or_fetch('api:a', 60, lambda: 'fetched') == 'fetched'
+    assert ['DEL', 'sinistra:lock:api:a'] not in resp_server.commands
+    assert not cache.try_lock('api:a')
@@ -0,0 +1,111 @@
+"""/interactions over HTTP, signed with the fake key from scripts/fake_interaction.py."""
+import io
+import json
+import time
+import asyncio
+
+import discord
+from aiohttp import MultipartReader
+from aiohttp.test_utils import TestClient, TestServer
+from discord.webhook.async_ import async_context, interaction_message_response_params
+
+import interactions_server
+from interactions_server import CHANNEL_MESSAGE, DEFERRED_CHANNEL_MESSAGE, INITIAL_RESPONSE_TIMEOUT, PONG, create_app
+from scripts.fake_interaction import command_payload, ping_payload, signed_request, signing_key
+
+
+class _SilentState:
+    """Stands in for the bot's connection state: the handler never answers."""
+
+    def __init__(self):
+        self.dispatched = []
+
+    def parse_interaction_create(self, data):
+        self.dispatched.append(data)
+
+
+class _FileState(_SilentState):
+    """Answers every interaction with a message and one file, the way InteractionResponse.send_message does."""
+
+    def parse_interaction_create(self, data):
+        super().parse_interaction_create(data)
+        adapter = async_context.get()
+
+        async def respond():
+            file = discord.File(io.BytesIO(b"col1,col2\n1,2\n"), filename="report.csv")
+            params = interaction_message_response_params(type=CHANNEL_MESSAGE, content="Here you go", file=file)
+            with params:
+                await adapter.create_interaction_response(int(data["id"]), data["token"], session=None, params=params)
+
+        asyncio.get_running_loop().create_task(respond())
+
+
+class _Bot:
+    def __init__(self, state=None):
+        self._connection = state or _SilentState()
+
+
+def _post(payload: dict, bad_signature: bool = False, bot: _Bot | None = None, timestamp: int | None = None):
+    """POST payload to a fresh app; returns (status, json or text, seconds taken)."""
+    async def run():
+        app = create_app(bot or _Bot(), signing_key().verify_key.encode().hex())
+        async with TestClient(TestServer(app)) as client:
+            body, headers = signed_request(payload, bad_signature, timestamp)
+            started = time.perf_counter()
+            response = await client.post('/interactions', data=body, headers=headers)
+            elapsed = time.perf_counter() - started
+            if response.content_type == 'application/json':
+                return response.status, await response.json(), elapsed
+            if response.content_type == 'multipart/form-data':
+                parts = {}
+                reader = MultipartReader.from_response(response)
+                while (part := await reader.next()) is not None:
+                    parts[part.name] = (part.filename, await part.read())
+                return response.status, parts, elapsed
+            return response.status, await response.text(), elapsed
+
+    return asyncio.run(run())
+
+
+def test_bad_signature_is_rejected():
+    bot = _Bot()
+    status, _, _ = _post(command_payload('goals', {}), bad_signature=True, bot=bot)
+    assert status == 401
+    assert bot._connection.dispatched == []
+
+
+def test_replayed_request_is_rejected():
+    bot = _Bot()
+    # Correctly signed, but captured a minute ago
+    status, _, _ = _post(command_payload('goals', {}), bot=bot, timestamp=int(time.time()) - 60)
+    assert status == 401
+    assert bot._connection.dispatched == []
+
+
+def test_ping_gets_pong():
+    status, body, _ = _post(ping_payload())
+    assert status == 200
+    assert body == {"type": PONG}
+
+
+def test_slow_handler_is_deferred_before_discords_deadline():
+    bot = _Bot()
+    status, body, elapsed = _post(command_payload('goals', {}), bot=bot)
+    assert status == 200
+    assert body == {"type": DEFERRED_CHANNEL_MESSAGE}
+    assert len(bot._connection.dispatched) == 1
+    # Discord gives up on the interaction after 3 seconds
+    assert INITIAL_RESPONSE_TIMEOUT <= elapsed < 3.0
+    assert interactions_server.INITIAL_RESPONSE_TIMEOUT == 2.5
+
+
+def test_response_with_files_is_the_multipart_reply():
+    status, parts, elapsed = _post(command_payload('goals', {}), bot=_Bot(_FileState()))
+    assert status == 200
+    # Answered once, in the HTTP reply: no deferral after the timeout
+    assert elapsed < INITIAL_RESPONSE_TIMEOUT
+    _, payload_json = parts["payload_json"]
+    payload = json.loads(payload_json)
+    assert payload["type"] == CHANNEL_MESSAGE
+    assert payload["data"]["content"] == "Here you go"
+    assert parts["files[0]"] == ("report.csv", b"col1,col2\n1,2\n")